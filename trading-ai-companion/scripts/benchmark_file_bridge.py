@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark File Bridge - Round-trip Latency of the File-based MT5 Bridge
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.bridge_manager import MT5BridgeManager
+from src.modules.mt5_connector.file_watcher import create_file_watcher
+
+def start_responder(bridge_path: str, files_seen: list = None):
+    """Stand-in for the MT5 EA: answer every request file or journal as soon as it lands"""
+    def on_file(name: str):
+        if files_seen is not None and not name.startswith('.'):
+            files_seen.append(name)
+        try:
+            with open(os.path.join(bridge_path, name), 'r') as f:
+                if name.startswith('request_') and name.endswith('.json'):
+                    request = json.load(f)
+                elif name.startswith('requests_') and name.endswith('.jsonl'):
+                    requests = [json.loads(line) for line in f]
+                else:
+                    return
+        except (OSError, json.JSONDecodeError):
+            return
+        
+        if name.startswith('request_'):
+            response = {'id': request['id'], 'success': True, 'command': request['command']}
+            with open(os.path.join(bridge_path, f"response_{request['id']}.json"), 'w') as f:
+                json.dump(response, f)
+        else:
+            batch_id = name[len('requests_'):-len('.jsonl')]
+            with open(os.path.join(bridge_path, f"responses_{batch_id}.jsonl"), 'w') as f:
+                for request in requests:
+                    f.write(json.dumps({'id': request['id'], 'success': True, 'command': request['command']}) + '\n')
+    
+    watcher = create_file_watcher(bridge_path, on_file, poll_interval=0.001)
+    watcher.start()
+    return watcher
+
+def run_benchmark(label: str, use_inotify: bool, poll_interval: float, requests: int):
+    with tempfile.TemporaryDirectory() as bridge_path:
+        responder = start_responder(bridge_path)
+        bridge = MT5BridgeManager(bridge_path, use_inotify=use_inotify, poll_interval=poll_interval)
+        
+        latencies = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            response = bridge.send_request('ping', timeout=5)
+            latencies.append((time.perf_counter() - start) * 1000)
+            if not response.get('success'):
+                print(f"  request failed: {response}")
+        
+        bridge.stop_bridge()
+        responder.stop()
+    
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<28} watcher={bridge.watcher.name:<8} "
+          f"median={statistics.median(latencies):7.2f} ms  p95={p95:7.2f} ms  max={latencies[-1]:7.2f} ms")
+
+def run_bulk_benchmark(label: str, batch_mode: bool, queries: int, rounds: int = 5):
+    """Time ``queries`` concurrent requests and count the files they create"""
+    with tempfile.TemporaryDirectory() as bridge_path:
+        files_seen = []
+        responder = start_responder(bridge_path, files_seen)
+        bridge = MT5BridgeManager(bridge_path, batch_mode=batch_mode, flush_interval=0.005)
+        
+        timings = []
+        for _ in range(rounds):
+            start = time.perf_counter()
+            results = bridge.send_requests([('get_symbol_info', {'symbol': f'SYM{i}'}) for i in range(queries)], timeout=10)
+            timings.append((time.perf_counter() - start) * 1000)
+            failed = [r for r in results if not r.get('success')]
+            if failed:
+                print(f"  {len(failed)} requests failed: {failed[0]}")
+        
+        bridge.stop_bridge()
+        responder.stop()
+    
+    print(f"{label:<28} {queries} queries  median={statistics.median(timings):7.2f} ms  "
+          f"files written per bulk query={len(files_seen) / rounds:.0f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure file bridge round-trip latency")
+    parser.add_argument('--requests', type=int, default=50, help="round trips per mode")
+    parser.add_argument('--bulk', type=int, default=50, help="queries per bulk round")
+    args = parser.parse_args()
+    
+    print("File Bridge Round-trip Latency")
+    print("=" * 40)
+    run_benchmark("polling (100 ms, legacy)", False, 0.1, args.requests)
+    run_benchmark("polling (10 ms)", False, 0.01, args.requests)
+    run_benchmark("inotify", True, 0.1, args.requests)
+    
+    print()
+    print("Bulk Queries")
+    print("=" * 40)
+    run_bulk_benchmark("one file per request", False, args.bulk)
+    run_bulk_benchmark("batch journal", True, args.bulk)
+
+if __name__ == "__main__":
+    main()
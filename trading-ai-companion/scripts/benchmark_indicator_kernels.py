@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmark Indicator Kernels - Numba vs NumPy Backends on Long Bar Series
+"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.data_processor import indicator_kernels
+from src.modules.data_processor.indicator_engine import IndicatorEngine, atr, ema
+
+def time_call(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare indicator kernel backends")
+    parser.add_argument('--bars', type=int, default=1_000_000, help="bars per series")
+    parser.add_argument('--repeat', type=int, default=3, help="runs per measurement (best is kept)")
+    args = parser.parse_args()
+    
+    rng = np.random.default_rng(0)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, args.bars))
+    spread = np.abs(rng.normal(0, 1e-4, args.bars))
+    high, low = close + spread, close - spread
+    
+    cases = [
+        ('ema(12)', lambda: ema(close, 12)),
+        ('rsi(14)', lambda: IndicatorEngine(close).rsi(14)),
+        ('macd(12,26,9)', lambda: IndicatorEngine(close).macd()),
+        ('atr(14)', lambda: atr(high, low, close, 14)),
+        ('parabolic_sar', lambda: IndicatorEngine(close, high, low).parabolic_sar())
+    ]
+    backends = ['numpy'] + (['numba'] if indicator_kernels.NUMBA_AVAILABLE else [])
+    
+    timings = {}
+    for backend in backends:
+        indicator_kernels.set_backend(backend)
+        for name, fn in cases:
+            fn()  # warm-up (JIT compilation for numba)
+            timings[(backend, name)] = time_call(fn, args.repeat)
+    indicator_kernels.set_backend('auto')
+    
+    print("Indicator Kernel Benchmark")
+    print("=" * 52)
+    print(f"bars={args.bars}  numba={'yes' if indicator_kernels.NUMBA_AVAILABLE else 'not installed'}")
+    print(f"{'indicator':<16}" + ''.join(f"{backend + ' ms':>12}" for backend in backends)
+          + (f"{'speedup':>12}" if len(backends) > 1 else ''))
+    for name, _ in cases:
+        row = f"{name:<16}" + ''.join(f"{timings[(backend, name)]:12.1f}" for backend in backends)
+        if len(backends) > 1:
+            row += f"{timings[('numpy', name)] / timings[('numba', name)]:11.1f}x"
+        print(row)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmark Shared Memory Bridge - Request Latency over mmap Ring Buffers
+"""
+
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.shm_bridge import MT5SharedMemoryBridge
+from src.tests.mock_shm_peer import run_peer
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure shared memory bridge request latency")
+    parser.add_argument('--requests', type=int, default=10000, help="round trips to time")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as bridge_path:
+        # The stand-in peer runs in its own process, as MT5 would
+        ready = multiprocessing.Event()
+        stop = multiprocessing.Event()
+        peer = multiprocessing.Process(target=run_peer, args=(bridge_path, 10, ready, stop), daemon=True)
+        peer.start()
+        ready.wait(10)
+        
+        client = MT5SharedMemoryBridge(bridge_path)
+        client.connect(timeout=5)
+        
+        for _ in range(100):  # warm-up
+            client.send_request('ping', timeout=5)
+        
+        latencies = []
+        for i in range(args.requests):
+            start = time.perf_counter()
+            response = client.send_request('get_symbol_info', {'symbol': 'EURUSD'}, timeout=5)
+            latencies.append((time.perf_counter() - start) * 1e6)
+            if not response.get('success'):
+                print(f"  request failed: {response}")
+                break
+        
+        client.close()
+        stop.set()
+        peer.join(timeout=5)
+    
+    latencies.sort()
+    print("Shared Memory Bridge Round-trip Latency")
+    print("=" * 40)
+    print(f"requests={len(latencies)}  codec={client.codec.name}")
+    print(f"median={statistics.median(latencies):8.1f} us")
+    print(f"p99   ={latencies[int(len(latencies) * 0.99) - 1]:8.1f} us")
+    print(f"max   ={latencies[-1]:8.1f} us")
+
+if __name__ == "__main__":
+    main()
@@ -35,7 +35,7 @@ class TradingAIApp:
         """Initialize MT5 connection"""
         try:
             mt5_config = self.config.get('mt5', {})
-            self.mt5_manager = MT5Manager(mt5_config)
+            self.mt5_manager = MT5Manager(mt5_config, self.config.get('data', {}))
             
             success = self.mt5_manager.initialize()
             if success:
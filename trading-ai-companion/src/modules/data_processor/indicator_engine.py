@@ -0,0 +1,346 @@
+"""
+Indicator Engine - Vectorized Full-series Indicators over NumPy Arrays
+"""
+
+import numpy as np
+from typing import Callable, Dict, Hashable, Union, List
+from src.modules.data_processor.indicator_kernels import linear_recurrence, parabolic_sar
+
+PriceArray = Union[List[float], np.ndarray]
+
+# Columns of the matrix returned by IndicatorEngine.scan
+SCAN_COLUMNS = ('rsi', 'macd', 'macd_signal', 'macd_histogram', 'bb_upper', 'bb_middle', 'bb_lower', 'atr')
+
+# Window positions reduced per chunk, bounding the temporary (rows, chunk, period) block
+_WINDOW_CHUNK = 65536
+
+def ema(values: PriceArray, span: float = None, alpha: float = None, adjust: bool = True) -> np.ndarray:
+    """Exponential moving average matching ``pandas.Series.ewm(...).mean()``
+
+    With ``adjust`` each value is the weighted mean of all prior values with
+    weights ``(1 - alpha) ** age``; without it the usual recursive form
+    seeded with the first value is used.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    n = values.shape[-1]
+    if not n:
+        return values.copy()
+
+    if not adjust:
+        return linear_recurrence(alpha * values, decay, initial=values[..., 0])
+
+    numerator = linear_recurrence(values, decay)
+    if decay == 0:
+        return numerator
+    # The weight total converges to 1 / alpha once decay ** n underflows
+    denominator = np.full(n, 1.0 / alpha)
+    head = int(min(n, np.ceil(np.log(1e-18) / np.log(decay)))) if decay < 1 else n
+    denominator[:head] = (1.0 - decay ** np.arange(1, head + 1, dtype=np.float64)) / alpha
+    return numerator / denominator
+
+def wilder_average(values: PriceArray, period: int) -> np.ndarray:
+    """Wilder's smoothing: a simple mean of the first ``period`` values, then
+    ``avg = (prev * (period - 1) + value) / period``. The first
+    ``period - 1`` entries are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return result
+    seed = values[..., :period].mean(axis=-1)
+    result[..., period - 1] = seed
+    result[..., period:] = linear_recurrence(values[..., period:] / period, 1.0 - 1.0 / period, initial=seed)
+    return result
+
+def true_range(high: PriceArray, low: PriceArray, close: PriceArray) -> np.ndarray:
+    """True range of each bar; NaN for the first bar, which has no previous close"""
+    high, low, close = (np.asarray(values, dtype=np.float64) for values in (high, low, close))
+    result = np.full(close.shape, np.nan)
+    high, low, previous = high[..., 1:], low[..., 1:], close[..., :-1]
+    result[..., 1:] = np.maximum(high - low, np.maximum(np.abs(high - previous), np.abs(low - previous)))
+    return result
+
+def atr(high: PriceArray, low: PriceArray, close: PriceArray, period: int = 14) -> np.ndarray:
+    """Average True Range with Wilder smoothing, first defined at bar ``period``"""
+    ranges = true_range(high, low, close)
+    result = np.full(ranges.shape, np.nan)
+    result[..., 1:] = wilder_average(ranges[..., 1:], period)
+    return result
+
+def _rolling(values: np.ndarray, period: int, reduce: Callable[[np.ndarray], np.ndarray]) -> np.ndarray:
+    """Apply ``reduce`` to every full window along the last axis; leading entries are NaN"""
+    result = np.full(values.shape, np.nan)
+    if period < 1 or values.shape[-1] < period:
+        return result
+    windows = np.lib.stride_tricks.sliding_window_view(values, period, axis=-1)
+    out = result[..., period - 1:]
+    chunk = max(1, _WINDOW_CHUNK // max(1, int(np.prod(values.shape[:-1]))))
+    for start in range(0, windows.shape[-2], chunk):
+        out[..., start:start + chunk] = reduce(windows[..., start:start + chunk, :])
+    return result
+
+def sma(values: PriceArray, period: int) -> np.ndarray:
+    """Simple moving average; the first ``period - 1`` entries are NaN"""
+    return _rolling(np.asarray(values, dtype=np.float64), period, lambda w: w.mean(axis=-1))
+
+def rolling_std(values: PriceArray, period: int, ddof: int = 1) -> np.ndarray:
+    """Rolling standard deviation (sample by default, as pandas)"""
+    return _rolling(np.asarray(values, dtype=np.float64), period, lambda w: w.std(axis=-1, ddof=ddof))
+
+def rsi_from_averages(avg_gain: np.ndarray, avg_loss: np.ndarray) -> np.ndarray:
+    """RSI from smoothed gains and losses; 100 where there were no losses"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, np.where(np.isnan(avg_gain), np.nan, 100.0), rsi)
+
+def rolling_max(values: PriceArray, period: int) -> np.ndarray:
+    """Highest value of each window; the first ``period - 1`` entries are NaN"""
+    return _rolling(np.asarray(values, dtype=np.float64), period, lambda w: w.max(axis=-1))
+
+def rolling_min(values: PriceArray, period: int) -> np.ndarray:
+    """Lowest value of each window; the first ``period - 1`` entries are NaN"""
+    return _rolling(np.asarray(values, dtype=np.float64), period, lambda w: w.min(axis=-1))
+
+def _midpoint(high: np.ndarray, low: np.ndarray, period: int) -> np.ndarray:
+    return (rolling_max(high, period) + rolling_min(low, period)) / 2.0
+
+def _shift(values: np.ndarray, periods: int) -> np.ndarray:
+    """Move values ``periods`` bars later (earlier when negative), filling with NaN"""
+    result = np.full(values.shape, np.nan)
+    periods = max(-values.shape[-1], min(periods, values.shape[-1]))
+    if periods >= 0:
+        result[..., periods:] = values[..., :values.shape[-1] - periods]
+    else:
+        result[..., :periods] = values[..., -periods:]
+    return result
+
+def _wilder_sum(values: np.ndarray, period: int) -> np.ndarray:
+    """Running Wilder sum, as ta-lib smooths directional movement and true range
+
+    Seeded with the plain sum of the first ``period - 1`` values; every
+    later value gives ``sum - sum / period + value``. The first entry is at
+    index ``period - 1``, earlier ones are NaN.
+    """
+    result = np.full(values.shape, np.nan)
+    if values.shape[-1] < period:
+        return result
+    seed = values[..., :period - 1].sum(axis=-1)
+    result[..., period - 1:] = linear_recurrence(values[..., period - 1:], 1.0 - 1.0 / period, initial=seed)
+    return result
+
+def adx(high: PriceArray, low: PriceArray, close: PriceArray, period: int = 14) -> Dict[str, np.ndarray]:
+    """Average Directional Index with the +DI/-DI lines, computed as ta-lib does
+
+    Directional movement and true range are smoothed with ta-lib's seeded
+    Wilder sums, so the DI lines (from bar ``period``) and ADX (from bar
+    ``2 * period - 1``, seeded with the mean DX) match ta-lib's output. DI
+    is 0 where the true range sum is 0 and DX is 0 where both DI are 0.
+    """
+    high, low, close = (np.asarray(values, dtype=np.float64) for values in (high, low, close))
+    up = np.diff(high, axis=-1)
+    down = -np.diff(low, axis=-1)
+    plus_dm = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm = np.where((down > up) & (down > 0), down, 0.0)
+
+    ranges = _wilder_sum(true_range(high, low, close)[..., 1:], period)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = np.where(ranges == 0, 0.0, 100.0 * _wilder_sum(plus_dm, period) / ranges)
+        minus_di = np.where(ranges == 0, 0.0, 100.0 * _wilder_sum(minus_dm, period) / ranges)
+        total = plus_di + minus_di
+        dx = np.where(total == 0, 0.0, 100.0 * np.abs(plus_di - minus_di) / total)
+
+    result = {name: np.full(close.shape, np.nan) for name in ('adx', 'plus_di', 'minus_di')}
+    result['plus_di'][..., 1:] = plus_di
+    result['minus_di'][..., 1:] = minus_di
+    result['adx'][..., period:] = wilder_average(dx[..., period - 1:], period)
+    return result
+
+def stochastic(high: PriceArray, low: PriceArray, close: PriceArray, k_period: int = 5,
+               slow_k_period: int = 3, d_period: int = 3) -> Dict[str, np.ndarray]:
+    """Slow stochastic oscillator (%K smoothed by an SMA, %D the SMA of %K), ta-lib STOCH defaults"""
+    close = np.asarray(close, dtype=np.float64)
+    lowest = rolling_min(low, k_period)
+    spread = rolling_max(high, k_period) - lowest
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fast_k = np.where(spread == 0, 0.0, 100.0 * (close - lowest) / spread)
+    k = sma(fast_k, slow_k_period)
+    return {'k': k, 'd': sma(k, d_period)}
+
+def cci(high: PriceArray, low: PriceArray, close: PriceArray, period: int = 14) -> np.ndarray:
+    """Commodity Channel Index over the typical price; 0 where the mean deviation is 0"""
+    typical = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)
+               + np.asarray(close, dtype=np.float64)) / 3.0
+    mean = sma(typical, period)
+    deviation = _rolling(typical, period, lambda w: np.abs(w - w.mean(axis=-1, keepdims=True)).mean(axis=-1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(deviation == 0, 0.0, (typical - mean) / (0.015 * deviation))
+
+def vwap(high: PriceArray, low: PriceArray, close: PriceArray, volume: PriceArray,
+         timestamps: PriceArray = None, session_seconds: int = 86400) -> np.ndarray:
+    """Volume Weighted Average Price of the typical price
+
+    With ``timestamps`` the average restarts at every session boundary
+    (UTC days by default); otherwise it runs over the whole series.
+    """
+    typical = (np.asarray(high, dtype=np.float64) + np.asarray(low, dtype=np.float64)
+               + np.asarray(close, dtype=np.float64)) / 3.0
+    volume = np.asarray(volume, dtype=np.float64)
+    n = typical.shape[-1]
+    zero = np.zeros(typical.shape[:-1] + (1,))
+    price_volume = np.concatenate([zero, np.cumsum(typical * volume, axis=-1)], axis=-1)
+    total_volume = np.concatenate([zero, np.cumsum(volume, axis=-1)], axis=-1)
+
+    session_start = np.zeros(n, dtype=np.int64)
+    if timestamps is not None and n:
+        sessions = np.asarray(timestamps, dtype=np.float64) // session_seconds
+        starts = np.flatnonzero(np.r_[True, sessions[1:] != sessions[:-1]])
+        session_start = starts[np.searchsorted(starts, np.arange(n), side='right') - 1]
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return ((price_volume[..., 1:] - price_volume[..., session_start])
+                / (total_volume[..., 1:] - total_volume[..., session_start]))
+
+def ichimoku(high: PriceArray, low: PriceArray, close: PriceArray, tenkan_period: int = 9,
+             kijun_period: int = 26, senkou_b_period: int = 52, displacement: int = 26) -> Dict[str, np.ndarray]:
+    """Ichimoku Kinko Hyo lines, aligned with the bars they are plotted at
+
+    The senkou spans are computed ``displacement`` bars earlier and plotted
+    ahead, so bar ``i`` holds the cloud projected onto it (the part of the
+    cloud beyond the last bar is dropped). The chikou span is the close
+    plotted ``displacement`` bars back, NaN for the most recent bars.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    tenkan = _midpoint(high, low, tenkan_period)
+    kijun = _midpoint(high, low, kijun_period)
+    return {
+        'tenkan': tenkan,
+        'kijun': kijun,
+        'senkou_a': _shift((tenkan + kijun) / 2.0, displacement),
+        'senkou_b': _shift(_midpoint(high, low, senkou_b_period), displacement),
+        'chikou': _shift(np.asarray(close, dtype=np.float64), -displacement)
+    }
+
+def keltner_channels(high: PriceArray, low: PriceArray, close: PriceArray, ema_period: int = 20,
+                     atr_period: int = 10, multiplier: float = 2.0) -> Dict[str, np.ndarray]:
+    """Keltner Channels: a recursive EMA of the close with ATR-wide bands"""
+    middle = ema(close, ema_period, adjust=False)
+    width = multiplier * atr(high, low, close, atr_period)
+    return {'upper': middle + width, 'middle': middle, 'lower': middle - width}
+
+def obv(close: PriceArray, volume: PriceArray) -> np.ndarray:
+    """On Balance Volume, starting from the first bar's volume as ta-lib does"""
+    close = np.asarray(close, dtype=np.float64)
+    volume = np.asarray(volume, dtype=np.float64)
+    if not close.shape[-1]:
+        return close.copy()
+    signed = np.sign(np.diff(close, axis=-1)) * volume[..., 1:]
+    return np.concatenate([volume[..., :1], volume[..., :1] + np.cumsum(signed, axis=-1)], axis=-1)
+
+class IndicatorEngine:
+    """Whole-series indicators for one price array, sharing intermediate results.
+    
+    Every series is computed once per parameter set and memoized, so e.g.
+    MACD and an EMA crossover on the same prices reuse the same EMAs, and
+    Bollinger Bands reuse the SMA. Returned arrays are aligned with the
+    prices (NaN until enough data) and read-only since they are shared.
+    
+    Prices may also be a 2D (symbols x bars) array of equally long, aligned
+    rows; every indicator is then computed for all rows at once along the
+    last axis. ``high`` and ``low`` of the same shape are needed for ATR.
+    """
+    
+    def __init__(self, prices: PriceArray, high: PriceArray = None, low: PriceArray = None):
+        self.prices = np.asarray(prices, dtype=np.float64)
+        self.high = None if high is None else np.asarray(high, dtype=np.float64)
+        self.low = None if low is None else np.asarray(low, dtype=np.float64)
+        self._cache: Dict[Hashable, np.ndarray] = {}
+    
+    def __len__(self) -> int:
+        return self.prices.shape[-1]
+    
+    def _memo(self, key: Hashable, compute: Callable[[], np.ndarray]) -> np.ndarray:
+        result = self._cache.get(key)
+        if result is None:
+            result = compute()
+            result.flags.writeable = False
+            self._cache[key] = result
+        return result
+    
+    def sma(self, period: int) -> np.ndarray:
+        return self._memo(('sma', period), lambda: sma(self.prices, period))
+    
+    def rolling_std(self, period: int) -> np.ndarray:
+        return self._memo(('std', period), lambda: rolling_std(self.prices, period))
+    
+    def ema(self, span: int) -> np.ndarray:
+        return self._memo(('ema', span), lambda: ema(self.prices, span))
+    
+    def _changes(self) -> np.ndarray:
+        """Gains and losses (as positive numbers) of each bar, stacked"""
+        def compute():
+            deltas = np.diff(self.prices, axis=-1)
+            return np.stack([np.maximum(deltas, 0.0), np.maximum(-deltas, 0.0)])
+        return self._memo(('changes',), compute)
+    
+    def rsi(self, period: int = 14, wilder: bool = True) -> np.ndarray:
+        """Relative Strength Index with Wilder smoothing, or without ``wilder``
+        plain means of the last ``period`` gains and losses
+        """
+        average = wilder_average if wilder else sma
+        def compute():
+            gains, losses = self._changes()
+            result = np.full(self.prices.shape, np.nan)
+            result[..., 1:] = rsi_from_averages(average(gains, period), average(losses, period))
+            return result
+        return self._memo(('rsi', period, wilder), compute)
+    
+    def macd(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, np.ndarray]:
+        def compute():
+            macd_line = self.ema(fast_period) - self.ema(slow_period)
+            signal_line = ema(macd_line, signal_period)
+            return np.stack([macd_line, signal_line, macd_line - signal_line])
+        rows = self._memo(('macd', fast_period, slow_period, signal_period), compute)
+        return {'macd': rows[0], 'signal': rows[1], 'histogram': rows[2]}
+    
+    def bollinger_bands(self, period: int = 20, std_dev: float = 2) -> Dict[str, np.ndarray]:
+        def compute():
+            middle = self.sma(period)
+            width = self.rolling_std(period) * std_dev
+            return np.stack([middle + width, middle, middle - width])
+        rows = self._memo(('bollinger', period, std_dev), compute)
+        return {'upper': rows[0], 'middle': rows[1], 'lower': rows[2]}
+    
+    def atr(self, period: int = 14) -> np.ndarray:
+        """Average True Range; needs ``high`` and ``low``"""
+        if self.high is None or self.low is None:
+            raise ValueError("ATR needs high and low prices")
+        return self._memo(('atr', period), lambda: atr(self.high, self.low, self.prices, period))
+    
+    def parabolic_sar(self, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+        """Parabolic SAR; needs ``high`` and ``low``"""
+        if self.high is None or self.low is None:
+            raise ValueError("Parabolic SAR needs high and low prices")
+        return self._memo(('sar', step, max_step), lambda: parabolic_sar(self.high, self.low, step, max_step))
+    
+    def scan(self, rsi_period: int = 14, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9,
+             bb_period: int = 20, bb_std_dev: float = 2, atr_period: int = 14) -> np.ndarray:
+        """Latest value of every indicator as a ``(symbols, len(SCAN_COLUMNS))`` matrix
+        
+        A 1D price array gives a single row. ATR is NaN without high/low.
+        """
+        rows = int(np.prod(self.prices.shape[:-1]))
+        if not len(self):
+            return np.full((rows, len(SCAN_COLUMNS)), np.nan)
+        macd = self.macd(fast_period, slow_period, signal_period)
+        # Only the last window matters for the bands, so skip the rolling series
+        bands = IndicatorEngine(self.prices[..., -bb_period:]).bollinger_bands(bb_period, bb_std_dev)
+        latest = [self.rsi(rsi_period), macd['macd'], macd['signal'], macd['histogram'],
+                  bands['upper'], bands['middle'], bands['lower']]
+        latest = [column[..., -1] for column in latest]
+        latest.append(self.atr(atr_period)[..., -1] if self.high is not None and self.low is not None
+                      else np.full(self.prices.shape[:-1], np.nan))
+        return np.stack(latest, axis=-1).reshape(rows, len(SCAN_COLUMNS))
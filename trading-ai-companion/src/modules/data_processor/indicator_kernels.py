@@ -0,0 +1,161 @@
+"""
+Indicator Kernels - Recursive Indicator Loops, JIT-compiled when Numba is Available
+"""
+
+import numpy as np
+from typing import Union
+
+try:
+    import numba
+    NUMBA_AVAILABLE = True
+except ImportError:
+    numba = None
+    NUMBA_AVAILABLE = False
+
+BACKENDS = ('numba', 'numpy')
+_backend = 'numba' if NUMBA_AVAILABLE else 'numpy'
+
+def get_backend() -> str:
+    return _backend
+
+def set_backend(name: str = 'auto') -> str:
+    """Select the kernel backend: 'numba', 'numpy' or 'auto' (numba when installed)"""
+    global _backend
+    if name == 'auto':
+        name = 'numba' if NUMBA_AVAILABLE else 'numpy'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown kernel backend '{name}', expected one of {BACKENDS}")
+    if name == 'numba' and not NUMBA_AVAILABLE:
+        raise ValueError("Numba backend requested but numba is not installed")
+    _backend = name
+    return _backend
+
+def _linear_recurrence_numpy(inputs: np.ndarray, decay: float, initial: np.ndarray) -> np.ndarray:
+    """Blocked closed form of the recurrence, vectorized over all rows
+    
+    The series is cut into blocks short enough that ``decay ** -block``
+    stays small (at most 2**8), so within a block the recursion is a
+    rescaled cumulative sum. The carry into block ``j`` is a sum over
+    earlier block totals weighted by powers of ``decay ** block``; those
+    weights fall below double precision after a handful of blocks, so only
+    that many shifted sums are needed.
+    """
+    lead, n = inputs.shape[:-1], inputs.shape[-1]
+    block = int(min(n, max(1, np.floor(np.log(256.0) / -np.log(decay)))))
+    blocks = -(-n // block)
+    padded = np.zeros(lead + (blocks * block,), dtype=np.float64)
+    padded[..., :n] = inputs
+    padded = padded.reshape(lead + (blocks, block))
+    
+    powers = decay ** np.arange(1, block + 1, dtype=np.float64)
+    local = np.cumsum(padded / powers * decay, axis=-1) * powers / decay
+    
+    # Value carried into each block from everything before it
+    block_decay = powers[-1]
+    totals = local[..., -1]
+    carry = np.zeros(lead + (blocks,), dtype=np.float64)
+    carry[..., 0] = initial
+    weight = 1.0
+    for lag in range(1, blocks):
+        carry[..., lag:] += weight * totals[..., :blocks - lag]
+        weight *= block_decay
+        if weight < 1e-17:
+            break
+    if np.any(initial):
+        carry[..., 1:] += initial[..., None] * block_decay ** np.arange(1, blocks, dtype=np.float64)
+    
+    return (local + carry[..., None] * powers).reshape(lead + (blocks * block,))[..., :n]
+
+def _linear_recurrence_loop(inputs, decay, initial, out):
+    """Plain recurrence over the rows of 2D ``inputs`` (compiled by Numba)"""
+    rows, n = inputs.shape
+    for r in range(rows):
+        y = initial[r]
+        for t in range(n):
+            y = decay * y + inputs[r, t]
+            out[r, t] = y
+
+def _parabolic_sar_loop(high, low, step, max_step, out):
+    """Wilder's Parabolic SAR for one series; ``out[0]`` is left untouched
+    
+    The trend starts long unless the second bar's downward move beats its
+    upward move. Each bar's SAR comes from the previous bar's state; when
+    price crosses it the trend reverses and the SAR restarts at the
+    extreme point of the finished trend, kept outside the last two bars.
+    """
+    n = len(high)
+    if n < 2:
+        return
+    long = not (low[0] - low[1] > high[1] - high[0] and low[0] - low[1] > 0)
+    sar = low[0] if long else high[0]
+    extreme = high[0] if long else low[0]
+    factor = step
+    for i in range(1, n):
+        if long and low[i] < sar:
+            long = False
+            sar = max(extreme, high[i], high[i - 1])
+            extreme = low[i]
+            factor = step
+        elif not long and high[i] > sar:
+            long = True
+            sar = min(extreme, low[i], low[i - 1])
+            extreme = high[i]
+            factor = step
+        out[i] = sar
+        
+        if long:
+            if high[i] > extreme:
+                extreme = high[i]
+                factor = min(factor + step, max_step)
+            sar = min(sar + factor * (extreme - sar), low[i], low[i - 1])
+        else:
+            if low[i] < extreme:
+                extreme = low[i]
+                factor = min(factor + step, max_step)
+            sar = max(sar + factor * (extreme - sar), high[i], high[i - 1])
+
+if NUMBA_AVAILABLE:
+    _linear_recurrence_jit = numba.njit(cache=True, nogil=True)(_linear_recurrence_loop)
+    _parabolic_sar_jit = numba.njit(cache=True, nogil=True)(_parabolic_sar_loop)
+
+def linear_recurrence(inputs: np.ndarray, decay: float, initial: Union[float, np.ndarray] = 0.0) -> np.ndarray:
+    """Solve ``y[t] = decay * y[t-1] + inputs[t]`` with ``y[-1] = initial``
+    
+    Runs along the last axis, so every row of a 2D input is solved at once
+    (``initial`` may then hold one value per row). EMAs, Wilder averages
+    and everything built on them go through this kernel.
+    """
+    inputs = np.asarray(inputs, dtype=np.float64)
+    lead, n = inputs.shape[:-1], inputs.shape[-1]
+    if n == 0 or decay == 0:
+        return inputs.copy()
+    initial = np.broadcast_to(np.asarray(initial, dtype=np.float64), lead)
+    
+    if _backend == 'numba':
+        rows = np.ascontiguousarray(inputs.reshape(-1, n))
+        out = np.empty_like(rows)
+        _linear_recurrence_jit(rows, float(decay), np.ascontiguousarray(initial.reshape(-1)), out)
+        return out.reshape(inputs.shape)
+    return _linear_recurrence_numpy(inputs, decay, initial)
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+    """Parabolic SAR along the last axis; the first bar is NaN
+    
+    The state machine has no closed form, so without Numba each row runs
+    as a Python loop over plain floats.
+    """
+    high = np.asarray(high, dtype=np.float64)
+    low = np.asarray(low, dtype=np.float64)
+    result = np.full(high.shape, np.nan)
+    rows_high = high.reshape(-1, high.shape[-1])
+    rows_low = low.reshape(-1, low.shape[-1])
+    rows_out = result.reshape(-1, result.shape[-1])
+    for r in range(rows_high.shape[0]):
+        if _backend == 'numba':
+            _parabolic_sar_jit(np.ascontiguousarray(rows_high[r]), np.ascontiguousarray(rows_low[r]),
+                               float(step), float(max_step), rows_out[r])
+        else:
+            out = rows_out[r].tolist()
+            _parabolic_sar_loop(rows_high[r].tolist(), rows_low[r].tolist(), step, max_step, out)
+            rows_out[r] = out
+    return result
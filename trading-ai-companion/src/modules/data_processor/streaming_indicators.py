@@ -0,0 +1,275 @@
+"""
+Streaming Indicators - Constant-time Incremental Indicator State
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Tuple
+
+NAN = float('nan')
+
+class StreamingIndicator:
+    """Indicator state advanced one value at a time.
+    
+    ``update`` commits a closed bar and returns the new indicator value;
+    ``peek`` returns the value a bar would produce without committing it,
+    so the still forming bar can be evaluated on every tick. Values are
+    NaN until enough bars have been seen, exactly like the batch series in
+    ``indicator_engine``. ``snapshot``/``restore`` round-trip the full state
+    through plain dicts and lists.
+    """
+    
+    _params: Tuple[str, ...] = ()
+    _state: Tuple[str, ...] = ()
+    
+    def update(self, value: float) -> Any:
+        raise NotImplementedError
+    
+    def peek(self, value: float) -> Any:
+        raise NotImplementedError
+    
+    def snapshot(self) -> Dict[str, Any]:
+        return {'params': {name: getattr(self, name) for name in self._params},
+                'state': self._dump_state()}
+    
+    @classmethod
+    def restore(cls, snapshot: Dict[str, Any]) -> 'StreamingIndicator':
+        indicator = cls(**snapshot['params'])
+        indicator._load_state(snapshot['state'])
+        return indicator
+    
+    def _dump_state(self) -> Dict[str, Any]:
+        state = {}
+        for name in self._state:
+            value = getattr(self, name)
+            if isinstance(value, StreamingIndicator):
+                value = value._dump_state()
+            elif isinstance(value, deque):
+                value = list(value)
+            state[name] = value
+        return state
+    
+    def _load_state(self, state: Dict[str, Any]):
+        for name in self._state:
+            current = getattr(self, name)
+            if isinstance(current, StreamingIndicator):
+                current._load_state(state[name])
+            elif isinstance(current, deque):
+                setattr(self, name, deque(state[name], maxlen=current.maxlen))
+            else:
+                setattr(self, name, state[name])
+
+class StreamingEMA(StreamingIndicator):
+    """EMA matching ``indicator_engine.ema`` (and pandas ``ewm``)"""
+    
+    _params = ('alpha', 'adjust')
+    _state = ('numerator', 'denominator', 'value')
+    
+    def __init__(self, span: float = None, alpha: float = None, adjust: bool = True):
+        self.alpha = alpha if alpha is not None else 2.0 / (span + 1.0)
+        self.adjust = adjust
+        self.decay = 1.0 - self.alpha
+        self.numerator = 0.0
+        self.denominator = 0.0
+        self.value = NAN
+    
+    def _step(self, value: float) -> Tuple[float, float, float]:
+        if self.adjust:
+            numerator = self.decay * self.numerator + value
+            denominator = self.decay * self.denominator + 1.0
+            return numerator, denominator, numerator / denominator
+        if math.isnan(self.value):
+            return 0.0, 0.0, value
+        return 0.0, 0.0, self.decay * self.value + self.alpha * value
+    
+    def update(self, value: float) -> float:
+        self.numerator, self.denominator, self.value = self._step(value)
+        return self.value
+    
+    def peek(self, value: float) -> float:
+        return self._step(value)[2]
+
+class WilderAverage(StreamingIndicator):
+    """Wilder smoothing matching ``indicator_engine.wilder_average``"""
+    
+    _params = ('period',)
+    _state = ('count', 'total', 'value')
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.count = 0
+        self.total = 0.0
+        self.value = NAN
+    
+    def _step(self, value: float) -> Tuple[float, float]:
+        if self.count + 1 < self.period:
+            return self.total + value, NAN
+        if self.count + 1 == self.period:
+            return 0.0, (self.total + value) / self.period
+        return 0.0, (1.0 - 1.0 / self.period) * self.value + value / self.period
+    
+    def update(self, value: float) -> float:
+        self.total, self.value = self._step(value)
+        self.count += 1
+        return self.value
+    
+    def peek(self, value: float) -> float:
+        return self._step(value)[1]
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI matching ``IndicatorEngine.rsi``"""
+    
+    _params = ('period',)
+    _state = ('previous', 'gains', 'losses')
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous = None
+        self.gains = WilderAverage(period)
+        self.losses = WilderAverage(period)
+    
+    @staticmethod
+    def _rsi(avg_gain: float, avg_loss: float) -> float:
+        if math.isnan(avg_gain):
+            return NAN
+        if avg_loss == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    
+    def update(self, price: float) -> float:
+        previous, self.previous = self.previous, price
+        if previous is None:
+            return NAN
+        delta = price - previous
+        return self._rsi(self.gains.update(max(delta, 0.0)), self.losses.update(max(-delta, 0.0)))
+    
+    def peek(self, price: float) -> float:
+        if self.previous is None:
+            return NAN
+        delta = price - self.previous
+        return self._rsi(self.gains.peek(max(delta, 0.0)), self.losses.peek(max(-delta, 0.0)))
+
+class StreamingMACD(StreamingIndicator):
+    """MACD, signal and histogram matching ``IndicatorEngine.macd``"""
+    
+    _params = ('fast_period', 'slow_period', 'signal_period')
+    _state = ('fast', 'slow', 'signal')
+    
+    def __init__(self, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9):
+        self.fast_period = fast_period
+        self.slow_period = slow_period
+        self.signal_period = signal_period
+        self.fast = StreamingEMA(fast_period)
+        self.slow = StreamingEMA(slow_period)
+        self.signal = StreamingEMA(signal_period)
+    
+    def update(self, price: float) -> Dict[str, float]:
+        macd = self.fast.update(price) - self.slow.update(price)
+        signal = self.signal.update(macd)
+        return {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+    
+    def peek(self, price: float) -> Dict[str, float]:
+        macd = self.fast.peek(price) - self.slow.peek(price)
+        signal = self.signal.peek(macd)
+        return {'macd': macd, 'signal': signal, 'histogram': macd - signal}
+
+class RollingStats(StreamingIndicator):
+    """Mean and variance over the last ``period`` values with Welford updates
+    
+    Once the window is full each update replaces the oldest value in O(1).
+    The sums are recomputed from the window every ``64 * period`` updates
+    (amortized O(1)) so rounding drift cannot build up on long streams.
+    """
+    
+    _params = ('period',)
+    _state = ('window', 'mean', 'm2', 'updates')
+    
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque(maxlen=period)
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.updates = 0
+    
+    def _step(self, value: float) -> Tuple[float, float]:
+        n = len(self.window)
+        if n < self.period:
+            delta = value - self.mean
+            mean = self.mean + delta / (n + 1)
+            return mean, self.m2 + delta * (value - mean)
+        oldest = self.window[0]
+        mean = self.mean + (value - oldest) / n
+        return mean, max(0.0, self.m2 + (value - oldest) * (value - mean + oldest - self.mean))
+    
+    def _resync(self):
+        n = len(self.window)
+        self.mean = math.fsum(self.window) / n
+        self.m2 = math.fsum((value - self.mean) ** 2 for value in self.window)
+    
+    def update(self, value: float) -> Tuple[float, float]:
+        """Add a value; returns ``(mean, std)`` once the window is full"""
+        self.mean, self.m2 = self._step(value)
+        self.window.append(value)
+        self.updates += 1
+        if self.updates % (64 * self.period) == 0:
+            self._resync()
+        return self._stats(self.mean, self.m2, len(self.window))
+    
+    def peek(self, value: float) -> Tuple[float, float]:
+        return self._stats(*self._step(value), min(len(self.window) + 1, self.period))
+    
+    def _stats(self, mean: float, m2: float, n: int) -> Tuple[float, float]:
+        if n < self.period:
+            return NAN, NAN
+        return mean, math.sqrt(m2 / (n - 1)) if n > 1 else NAN
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Bollinger Bands matching ``IndicatorEngine.bollinger_bands``"""
+    
+    _params = ('period', 'std_dev')
+    _state = ('stats',)
+    
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.period = period
+        self.std_dev = std_dev
+        self.stats = RollingStats(period)
+    
+    def _bands(self, mean: float, std: float) -> Dict[str, float]:
+        width = std * self.std_dev
+        return {'upper': mean + width, 'middle': mean, 'lower': mean - width}
+    
+    def update(self, price: float) -> Dict[str, float]:
+        return self._bands(*self.stats.update(price))
+    
+    def peek(self, price: float) -> Dict[str, float]:
+        return self._bands(*self.stats.peek(price))
+
+class StreamingATR(StreamingIndicator):
+    """Average True Range with Wilder smoothing matching ``indicator_engine.atr``
+    
+    ``update`` and ``peek`` take ``(high, low, close)`` of a bar.
+    """
+    
+    _params = ('period',)
+    _state = ('previous_close', 'average')
+    
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.previous_close = None
+        self.average = WilderAverage(period)
+    
+    def _true_range(self, high: float, low: float) -> float:
+        return max(high - low, abs(high - self.previous_close), abs(low - self.previous_close))
+    
+    def update(self, high: float, low: float, close: float) -> float:
+        if self.previous_close is None:
+            self.previous_close = close
+            return NAN
+        value = self.average.update(self._true_range(high, low))
+        self.previous_close = close
+        return value
+    
+    def peek(self, high: float, low: float, close: float) -> float:
+        if self.previous_close is None:
+            return NAN
+        return self.average.peek(self._true_range(high, low))
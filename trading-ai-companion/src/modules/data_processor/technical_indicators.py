@@ -2,71 +2,180 @@
 Technical Indicators Calculator
 """
 
-import pandas as pd
 import numpy as np
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Union
+from src.modules.data_processor import indicator_engine
+from src.modules.data_processor.indicator_engine import IndicatorEngine, SCAN_COLUMNS
+
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    talib = None
+    TALIB_AVAILABLE = False
+
+# Prices may be plain lists or NumPy arrays (e.g. BarSeries.close views)
+PriceArray = Union[List[float], np.ndarray]
 
 class TechnicalIndicators:
+    # Column order of scan_market results
+    SCAN_COLUMNS = SCAN_COLUMNS
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        # ta-lib's C routines serve single series when installed; the NumPy engine covers the rest
+        self.backend = 'talib' if TALIB_AVAILABLE else 'numpy'
+    
+    def _talib_inputs(self, *arrays: PriceArray) -> Optional[List[np.ndarray]]:
+        """Arrays as ta-lib expects them, or None when the NumPy engine should be used"""
+        if self.backend != 'talib':
+            return None
+        arrays = [np.ascontiguousarray(values, dtype=np.float64) for values in arrays]
+        if any(values.ndim != 1 for values in arrays):
+            return None
+        return arrays
+    
+    def engine(self, prices: PriceArray) -> IndicatorEngine:
+        """Vectorized engine computing full indicator series over ``prices``
+        
+        Use one engine for several indicators on the same prices so shared
+        intermediates (EMAs, rolling means) are computed once.
+        """
+        return IndicatorEngine(prices)
     
-    def calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Calculate Relative Strength Index"""
+    def calculate_rsi(self, prices: PriceArray, period: int = 14, wilder: bool = False) -> float:
+        """Calculate Relative Strength Index
+        
+        Averages the last ``period`` gains and losses (fewer on short
+        inputs); ``wilder`` uses Wilder smoothing over the whole series.
+        """
         try:
-            deltas = np.diff(prices)
-            gains = deltas.copy()
-            losses = deltas.copy()
-            gains[gains < 0] = 0
-            losses[losses > 0] = 0
-            
-            avg_gain = np.mean(gains[-period:])
-            avg_loss = abs(np.mean(losses[-period:]))
-            
-            if avg_loss == 0:
-                return 100
-            
-            rs = avg_gain / avg_loss
-            rsi = 100 - (100 / (1 + rs))
-            return rsi
+            prices = np.asarray(prices, dtype=np.float64)
+            if not wilder:
+                # Only the last window contributes to the last value
+                period = min(period, len(prices) - 1)
+                prices = prices[-(period + 1):]
+            if period < 1:
+                return 50.0
+            rsi = self.engine(prices).rsi(period, wilder)
+            if not len(rsi) or np.isnan(rsi[-1]):
+                return 50.0
+            return float(rsi[-1])
         except Exception as e:
             self.logger.error(f"Error calculating RSI: {e}")
             return 50.0
     
-    def calculate_macd(self, prices: List[float], fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, float]:
+    def calculate_macd(self, prices: PriceArray, fast_period: int = 12, slow_period: int = 26, signal_period: int = 9) -> Dict[str, float]:
         """Calculate MACD indicator"""
         try:
-            prices_series = pd.Series(prices)
-            ema_fast = prices_series.ewm(span=fast_period).mean()
-            ema_slow = prices_series.ewm(span=slow_period).mean()
-            macd_line = ema_fast - ema_slow
-            signal_line = macd_line.ewm(span=signal_period).mean()
-            histogram = macd_line - signal_line
-            
-            return {
-                'macd': float(macd_line.iloc[-1]),
-                'signal': float(signal_line.iloc[-1]),
-                'histogram': float(histogram.iloc[-1])
-            }
+            series = self.engine(prices).macd(fast_period, slow_period, signal_period)
+            return {name: float(values[-1]) for name, values in series.items()}
         except Exception as e:
             self.logger.error(f"Error calculating MACD: {e}")
             return {'macd': 0, 'signal': 0, 'histogram': 0}
     
-    def calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: int = 2) -> Dict[str, float]:
+    def calculate_bollinger_bands(self, prices: PriceArray, period: int = 20, std_dev: int = 2) -> Dict[str, float]:
         """Calculate Bollinger Bands"""
         try:
-            prices_series = pd.Series(prices)
-            sma = prices_series.rolling(window=period).mean()
-            std = prices_series.rolling(window=period).std()
-            
-            upper_band = sma + (std * std_dev)
-            lower_band = sma - (std * std_dev)
-            
-            return {
-                'upper': float(upper_band.iloc[-1]),
-                'middle': float(sma.iloc[-1]),
-                'lower': float(lower_band.iloc[-1])
-            }
+            # Only the last window contributes to the last value
+            series = self.engine(np.asarray(prices, dtype=np.float64)[-period:]).bollinger_bands(period, std_dev)
+            return {name: float(values[-1]) for name, values in series.items()}
         except Exception as e:
             self.logger.error(f"Error calculating Bollinger Bands: {e}")
             return {'upper': 0, 'middle': 0, 'lower': 0}
+    
+    def calculate_rsi_series(self, prices: PriceArray, period: int = 14, wilder: bool = False) -> np.ndarray:
+        """RSI for every bar, NaN until ``period`` changes are available"""
+        return self.engine(prices).rsi(period, wilder)
+    
+    def calculate_macd_series(self, prices: PriceArray, fast_period: int = 12, slow_period: int = 26,
+                              signal_period: int = 9) -> Dict[str, np.ndarray]:
+        """MACD, signal and histogram lines for every bar"""
+        return self.engine(prices).macd(fast_period, slow_period, signal_period)
+    
+    def calculate_bollinger_bands_series(self, prices: PriceArray, period: int = 20,
+                                         std_dev: int = 2) -> Dict[str, np.ndarray]:
+        """Upper, middle and lower bands for every bar, NaN until a full window"""
+        return self.engine(prices).bollinger_bands(period, std_dev)
+    
+    def calculate_atr_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                             period: int = 14) -> np.ndarray:
+        """Average True Range for every bar, first defined at bar ``period``"""
+        inputs = self._talib_inputs(high, low, close)
+        if inputs:
+            return talib.ATR(*inputs, timeperiod=period)
+        return indicator_engine.atr(high, low, close, period)
+    
+    def calculate_adx_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                             period: int = 14) -> Dict[str, np.ndarray]:
+        """ADX with the +DI and -DI lines for every bar"""
+        inputs = self._talib_inputs(high, low, close)
+        if inputs:
+            return {'adx': talib.ADX(*inputs, timeperiod=period),
+                    'plus_di': talib.PLUS_DI(*inputs, timeperiod=period),
+                    'minus_di': talib.MINUS_DI(*inputs, timeperiod=period)}
+        return indicator_engine.adx(high, low, close, period)
+    
+    def calculate_stochastic_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                                    k_period: int = 5, slow_k_period: int = 3,
+                                    d_period: int = 3) -> Dict[str, np.ndarray]:
+        """Slow stochastic %K and %D for every bar"""
+        inputs = self._talib_inputs(high, low, close)
+        if inputs:
+            k, d = talib.STOCH(*inputs, fastk_period=k_period, slowk_period=slow_k_period, slowk_matype=0,
+                               slowd_period=d_period, slowd_matype=0)
+            return {'k': k, 'd': d}
+        return indicator_engine.stochastic(high, low, close, k_period, slow_k_period, d_period)
+    
+    def calculate_cci_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                             period: int = 14) -> np.ndarray:
+        """Commodity Channel Index for every bar"""
+        inputs = self._talib_inputs(high, low, close)
+        if inputs:
+            return talib.CCI(*inputs, timeperiod=period)
+        return indicator_engine.cci(high, low, close, period)
+    
+    def calculate_vwap_series(self, high: PriceArray, low: PriceArray, close: PriceArray, volume: PriceArray,
+                              timestamps: PriceArray = None, session_seconds: int = 86400) -> np.ndarray:
+        """Session VWAP for every bar (ta-lib has no VWAP, so always NumPy)"""
+        return indicator_engine.vwap(high, low, close, volume, timestamps, session_seconds)
+    
+    def calculate_ichimoku_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                                  tenkan_period: int = 9, kijun_period: int = 26, senkou_b_period: int = 52,
+                                  displacement: int = 26) -> Dict[str, np.ndarray]:
+        """Ichimoku lines aligned with the bars they are plotted at (always NumPy)"""
+        return indicator_engine.ichimoku(high, low, close, tenkan_period, kijun_period, senkou_b_period,
+                                         displacement)
+    
+    def calculate_keltner_channels_series(self, high: PriceArray, low: PriceArray, close: PriceArray,
+                                          ema_period: int = 20, atr_period: int = 10,
+                                          multiplier: float = 2.0) -> Dict[str, np.ndarray]:
+        """Keltner Channels for every bar (always NumPy)"""
+        return indicator_engine.keltner_channels(high, low, close, ema_period, atr_period, multiplier)
+    
+    def calculate_obv_series(self, close: PriceArray, volume: PriceArray) -> np.ndarray:
+        """On Balance Volume for every bar"""
+        inputs = self._talib_inputs(close, volume)
+        if inputs:
+            return talib.OBV(*inputs)
+        return indicator_engine.obv(close, volume)
+    
+    def scan_market(self, close: np.ndarray, high: np.ndarray = None, low: np.ndarray = None,
+                    **params) -> np.ndarray:
+        """Latest RSI, MACD, Bollinger Bands and ATR for many symbols in one pass
+        
+        Takes 2D (symbols x bars) arrays of aligned, equally long rows and
+        returns a ``(symbols, len(SCAN_COLUMNS))`` matrix. ``params`` are the
+        indicator periods accepted by ``IndicatorEngine.scan``.
+        """
+        return IndicatorEngine(close, high, low).scan(**params)
+    
+    def scan_timeframes(self, bars: Dict[str, np.ndarray], **params) -> Dict[str, np.ndarray]:
+        """Scan every timeframe of a market
+        
+        ``bars`` maps each timeframe to a ``(6, symbols, bars)`` OHLCV block
+        as built by ``BarSeries.stack``; the symbols must be in the same order.
+        """
+        return {timeframe: self.scan_market(block[4], block[2], block[3], **params)
+                for timeframe, block in bars.items()}
@@ -6,18 +6,42 @@ import requests
 import logging
 import json
 import time
-from typing import Dict, Any, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Union
 from urllib3.util.retry import Retry
 from requests.adapters import HTTPAdapter
+from src.modules.mt5_connector.bar_cache import BarCache
+from src.modules.mt5_connector.bar_series import BarSeries
+from src.modules.mt5_connector.ttl_cache import TTLCache
 
 class MT5APIError(Exception):
     """Custom exception for MT5 API client errors."""
-    pass
+    
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+def endpoint_missing(response: Dict[str, Any]) -> bool:
+    """Whether a 200 reply is the EA's answer for a route it does not have"""
+    return response.get('error') == 'Endpoint not found'
+
+def bulk_summary(key: str, results: List[Dict[str, Any]], start_time: float) -> Dict[str, Any]:
+    """Build the response for a bulk close/cancel operation"""
+    failed = [r['ticket'] for r in results if r['result'].get('success') is False or 'error' in r['result']]
+    return {
+        'success': not failed,
+        key: results,
+        'failed_tickets': failed,
+        'latency_ms': (time.perf_counter() - start_time) * 1000
+    }
 
 class MT5APIClient:
-    def __init__(self, base_url: str = "http://localhost:8082", timeout: int = 30):
+    def __init__(self, base_url: str = "http://localhost:8082", timeout: int = 30,
+                 max_workers: int = 8, bar_cache_size: int = 1000, cache_ttls: Dict[str, float] = None,
+                 cache_size: int = 256):
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
+        self.max_workers = max_workers
         self.logger = logging.getLogger(__name__)
         
         # Setup session with retry strategy
@@ -27,13 +51,25 @@ class MT5APIClient:
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        # Pool must hold one connection per concurrent worker
+        adapter = HTTPAdapter(max_retries=retry_strategy,
+                              pool_maxsize=max(10, max_workers))
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
         
         # Authentication
         self.api_key = None
         self.authenticated = False
+        
+        # Batch/bulk endpoint support, detected on first use
+        self.batch_supported = None
+        self.bulk_trade_supported = None
+        
+        # Local OHLC cache for incremental bar fetching
+        self.bar_cache = BarCache(capacity=bar_cache_size)
+        
+        # Account, symbol info and symbol list reads are served from memory for a short TTL
+        self.cache = TTLCache(capacity=cache_size, ttls=cache_ttls)
     
     def set_api_key(self, api_key: str):
         """Set API key for authentication"""
@@ -58,6 +94,11 @@ class MT5APIClient:
             
             return response.json()
 
+        except requests.HTTPError as e:
+            self.logger.error(f"API request failed {method} {url}: {e}")
+            raise MT5APIError(f"API request failed: {str(e)}",
+                              status_code=e.response.status_code if e.response is not None else None) from e
+
         except ValueError as e:  # covers JSON decode errors
 
             self.logger.error(f"Invalid JSON response from {url}: {e}\nRaw: {response.text}")
@@ -66,6 +107,10 @@ class MT5APIClient:
         except Exception as e:
             self.logger.error(f"API request failed {method} {url}: {e}")
             raise MT5APIError(f"API request failed: {str(e)}") from e
+    
+    def request(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Call an endpoint directly; unlike the helpers below, failures raise MT5APIError"""
+        return self._make_request(method, endpoint, **kwargs)
 
     
     def get_server_status(self) -> Dict[str, Any]:
@@ -76,10 +121,13 @@ class MT5APIClient:
             self.logger.error(f"Failed to get server status: {e}")
             return {'status': 'disconnected', 'error': str(e)}
     
-    def get_account_info(self) -> Dict[str, Any]:
-        """Get account information"""
+    def get_account_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get account information, cached for the ``account`` TTL unless ``refresh``"""
         try:
-            return self._make_request('GET', '/api/v1/account')
+            if refresh:
+                self.cache.invalidate('account')
+            return dict(self.cache.get_or_load('account', None,
+                                               lambda: self._make_request('GET', '/api/v1/account')))
         except Exception as e:
             self.logger.error(f"Failed to get account info: {e}")
             return {}
@@ -102,33 +150,177 @@ class MT5APIClient:
             self.logger.error(f"Failed to get account equity: {e}")
             return 0.0
     
-    def get_market_data(self, symbol: str, timeframe: str = "M1", count: int = 100) -> Dict[str, Any]:
-        """Get market data for a symbol"""
+    def get_market_data(self, symbol: str, timeframe: str = "M1", count: int = 100,
+                        since: float = None) -> Dict[str, Any]:
+        """Get market data for a symbol
+        
+        When ``since`` is given only bars with a timestamp at or after it
+        are returned (at most ``count``).
+        """
         try:
             params = {
                 'symbol': symbol.upper(),
                 'timeframe': timeframe.upper(),
                 'count': count
             }
+            if since is not None:
+                params['since'] = since
             return self._make_request('GET', '/api/v1/market/data', params=params)
         except Exception as e:
             self.logger.error(f"Failed to get market data for {symbol}: {e}")
             return {}
     
-    def get_symbol_info(self, symbol: str) -> Dict[str, Any]:
-        """Get symbol information"""
+    def get_market_data_cached(self, symbol: str, timeframe: str = "M1", count: int = 100) -> Dict[str, Any]:
+        """Get market data, downloading only bars newer than the local cache
+        
+        The first call fetches the full window; later calls request bars
+        since the last cached timestamp (re-fetching the forming bar) and
+        merge them into the cache.
+        """
+        symbol = symbol.upper()
+        timeframe = timeframe.upper()
+        last_timestamp = self.bar_cache.last_timestamp(symbol, timeframe)
+        
+        if last_timestamp is None or self.bar_cache.size(symbol, timeframe) < count:
+            response = self.get_market_data(symbol, timeframe, count)
+            if 'bars' not in response:
+                return response
+            self.bar_cache.replace(symbol, timeframe, response['bars'], min_capacity=count)
+            fetched = len(response['bars'])
+        else:
+            response = self.get_market_data(symbol, timeframe, count, since=last_timestamp)
+            if 'bars' not in response:
+                return response
+            bars = response['bars']
+            if len(bars) >= count:
+                # Gap larger than the window - start over from this response
+                self.bar_cache.replace(symbol, timeframe, bars, min_capacity=count)
+            else:
+                self.bar_cache.merge(symbol, timeframe, bars, min_capacity=count)
+            fetched = len(bars)
+        
+        return {
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'bars': self.bar_cache.get_bars(symbol, timeframe, count),
+            'fetched': fetched
+        }
+    
+    def get_bar_series(self, symbol: str, timeframe: str = "M1", count: int = 100,
+                       cached: bool = False) -> BarSeries:
+        """Get market data as a columnar BarSeries
+        
+        Requests the columnar response format so bars go straight into
+        NumPy arrays; servers that only send a bar list are handled too.
+        With ``cached`` the incremental bar cache is used instead.
+        """
+        if cached:
+            response = self.get_market_data_cached(symbol, timeframe, count)
+        else:
+            try:
+                params = {
+                    'symbol': symbol.upper(),
+                    'timeframe': timeframe.upper(),
+                    'count': count,
+                    'format': 'columnar'
+                }
+                response = self._make_request('GET', '/api/v1/market/data', params=params)
+            except Exception as e:
+                self.logger.error(f"Failed to get bar series for {symbol}: {e}")
+                response = {}
+        
+        series = BarSeries.from_response(response)
+        series.symbol = series.symbol or symbol.upper()
+        series.timeframe = series.timeframe or timeframe.upper()
+        return series
+    
+    def get_market_data_many(self, symbols: Sequence[str], timeframes: Union[str, Sequence[str]] = "M1",
+                             count: int = 100) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get market data for several symbols/timeframes in one round trip
+        
+        Returns a nested mapping ``{symbol: {timeframe: market_data}}``. Falls
+        back to concurrent single-symbol requests when the server has no
+        batch route.
+        """
+        if isinstance(timeframes, str):
+            timeframes = [timeframes]
+        symbols = [s.upper() for s in symbols]
+        timeframes = [tf.upper() for tf in timeframes]
+        if not symbols or not timeframes:
+            return {}
+        
+        if self.batch_supported is not False:
+            try:
+                params = {
+                    'symbols': ','.join(symbols),
+                    'timeframes': ','.join(timeframes),
+                    'count': count
+                }
+                response = self._make_request('GET', '/api/v1/market/data/batch', params=params)
+                if 'series' in response:
+                    self.batch_supported = True
+                    return self._group_series(response['series'])
+                # Servers without the route answer with an error payload
+                if endpoint_missing(response):
+                    self.batch_supported = False
+                    self.logger.info("Batch market data not supported by server, using concurrent requests")
+                else:
+                    self.logger.warning(f"Batch market data failed, using concurrent requests: "
+                                        f"{response.get('error', response)}")
+            except MT5APIError as e:
+                if e.status_code != 404:
+                    self.logger.error(f"Failed to get batch market data: {e}")
+                    return {}
+                self.batch_supported = False
+                self.logger.info("Batch market data not supported by server, using concurrent requests")
+        
+        pairs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        results = self._fan_out(lambda pair: self.get_market_data(pair[0], pair[1], count), pairs)
+        
+        grouped = {}
+        for (symbol, timeframe), data in zip(pairs, results):
+            grouped.setdefault(symbol, {})[timeframe] = data
+        return grouped
+    
+    def _group_series(self, series: List[Dict[str, Any]]) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Group a flat batch response into ``{symbol: {timeframe: data}}``"""
+        grouped = {}
+        for item in series:
+            symbol = str(item.get('symbol', '')).upper()
+            timeframe = str(item.get('timeframe', '')).upper()
+            grouped.setdefault(symbol, {})[timeframe] = item
+        return grouped
+    
+    def _fan_out(self, func, items: List[Any]) -> List[Any]:
+        """Run ``func`` over ``items`` on a bounded worker pool, preserving order"""
+        if not items:
+            return []
+        if len(items) == 1:
+            return [func(items[0])]
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(items))) as executor:
+            return list(executor.map(func, items))
+    
+    def get_symbol_info(self, symbol: str, refresh: bool = False) -> Dict[str, Any]:
+        """Get symbol information, cached for the ``symbol_info`` TTL unless ``refresh``"""
         try:
             params = {'symbol': symbol.upper()}
-            return self._make_request('GET', '/api/v1/market/symbol', params=params)
+            if refresh:
+                self.cache.invalidate('symbol_info', params['symbol'])
+            return dict(self.cache.get_or_load('symbol_info', params['symbol'],
+                                               lambda: self._make_request('GET', '/api/v1/market/symbol',
+                                                                          params=params)))
         except Exception as e:
             self.logger.error(f"Failed to get symbol info for {symbol}: {e}")
             return {}
     
-    def get_available_symbols(self) -> List[str]:
-        """Get list of available symbols"""
+    def get_available_symbols(self, refresh: bool = False) -> List[str]:
+        """Get list of available symbols, cached for the ``symbols`` TTL unless ``refresh``"""
         try:
-            response = self._make_request('GET', '/api/v1/market/symbols')
-            return response.get('symbols', [])
+            if refresh:
+                self.cache.invalidate('symbols')
+            return list(self.cache.get_or_load(
+                'symbols', None, lambda: self._make_request('GET', '/api/v1/market/symbols').get('symbols', [])))
         except Exception as e:
             self.logger.error(f"Failed to get available symbols: {e}")
             return []
@@ -159,6 +351,9 @@ class MT5APIClient:
         except Exception as e:
             self.logger.error(f"Failed to place order for {symbol}: {e}")
             return {'error': str(e), 'success': False}
+        finally:
+            # Balance, equity and margin change with every trade
+            self.cache.invalidate('account')
     
     def place_market_order(self, symbol: str, order_type: str, volume: float, 
                           sl: float = None, tp: float = None, comment: str = "") -> Dict[str, Any]:
@@ -201,23 +396,54 @@ class MT5APIClient:
         except Exception as e:
             self.logger.error(f"Failed to close position {ticket}: {e}")
             return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
     
     def close_all_positions(self) -> Dict[str, Any]:
-        """Close all open positions"""
+        """Close all open positions
+        
+        Uses the bulk close endpoint when available, otherwise closes the
+        positions concurrently on the worker pool.
+        """
+        start_time = time.perf_counter()
         try:
-            positions = self.get_positions()
-            results = []
-            
-            for position in positions:
-                ticket = position.get('ticket')
-                if ticket:
-                    result = self.close_position(ticket)
-                    results.append({'ticket': ticket, 'result': result})
-            
-            return {'success': True, 'closed_positions': results}
+            tickets = [p.get('ticket') for p in self.get_positions() if p.get('ticket')]
+            results = self._bulk_ticket_action('/api/v1/trade/positions/close', tickets, self.close_position)
+            return bulk_summary('closed_positions', results, start_time)
         except Exception as e:
             self.logger.error(f"Failed to close all positions: {e}")
             return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
+    
+    def _bulk_ticket_action(self, endpoint: str, tickets: List[int], single_func) -> List[Dict[str, Any]]:
+        """Apply a per-ticket action through a bulk endpoint or concurrent fallback
+        
+        Only a missing route falls back to per-ticket requests; any other
+        unexpected reply raises, as the bulk call may already have acted.
+        """
+        if not tickets:
+            return []
+        
+        if self.bulk_trade_supported is not False:
+            try:
+                response = self._make_request('POST', endpoint, json={'tickets': tickets})
+                if 'results' in response:
+                    self.bulk_trade_supported = True
+                    by_ticket = {r.get('ticket'): r for r in response['results']}
+                    return [{'ticket': t, 'result': by_ticket.get(t, {'error': 'No result returned', 'success': False})}
+                            for t in tickets]
+                if not endpoint_missing(response):
+                    raise MT5APIError(f"Unexpected bulk response: {response.get('error', response)}")
+                self.bulk_trade_supported = False
+            except MT5APIError as e:
+                if e.status_code != 404:
+                    raise
+                self.bulk_trade_supported = False
+            self.logger.info("Bulk trade endpoints not supported by server, using concurrent requests")
+        
+        results = self._fan_out(single_func, tickets)
+        return [{'ticket': t, 'result': r} for t, r in zip(tickets, results)]
     
     def get_orders(self) -> List[Dict[str, Any]]:
         """Get all pending orders"""
@@ -236,23 +462,25 @@ class MT5APIClient:
         except Exception as e:
             self.logger.error(f"Failed to cancel order {ticket}: {e}")
             return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
     
     def cancel_all_orders(self) -> Dict[str, Any]:
-        """Cancel all pending orders"""
+        """Cancel all pending orders
+        
+        Uses the bulk cancel endpoint when available, otherwise cancels the
+        orders concurrently on the worker pool.
+        """
+        start_time = time.perf_counter()
         try:
-            orders = self.get_orders()
-            results = []
-            
-            for order in orders:
-                ticket = order.get('ticket')
-                if ticket:
-                    result = self.cancel_order(ticket)
-                    results.append({'ticket': ticket, 'result': result})
-            
-            return {'success': True, 'cancelled_orders': results}
+            tickets = [o.get('ticket') for o in self.get_orders() if o.get('ticket')]
+            results = self._bulk_ticket_action('/api/v1/trade/orders/cancel', tickets, self.cancel_order)
+            return bulk_summary('cancelled_orders', results, start_time)
         except Exception as e:
             self.logger.error(f"Failed to cancel all orders: {e}")
             return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
     
     def get_history_deals(self, date_from: str = None, date_to: str = None, 
                          position_id: int = None) -> List[Dict[str, Any]]:
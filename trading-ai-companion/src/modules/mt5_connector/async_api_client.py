@@ -0,0 +1,424 @@
+"""
+MT5 REST API Client - asyncio Implementation with Connection Pooling
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, Any, List, Optional, Sequence, Union
+
+import aiohttp
+
+from src.modules.mt5_connector.api_client import MT5APIError, bulk_summary, endpoint_missing
+from src.modules.mt5_connector.ttl_cache import TTLCache
+
+class AsyncMT5APIClient:
+    """Coroutine counterpart of MT5APIClient.
+    
+    All requests share one keep-alive connection pool and at most
+    ``max_in_flight`` requests are outstanding at any time, so a single
+    event loop can poll account, positions and many symbols concurrently.
+    """
+    
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
+    # Only idempotent requests are retried; a repeated order POST would place a second order
+    RETRY_METHODS = ('GET', 'HEAD')
+    
+    def __init__(self, base_url: str = "http://localhost:8082", timeout: int = 30,
+                 max_in_flight: int = 16, pool_size: int = 16, keepalive_timeout: float = 30.0,
+                 max_retries: int = 3, backoff_factor: float = 1.0, cache_ttls: Dict[str, float] = None,
+                 cache_size: int = 256):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.pool_size = pool_size
+        self.keepalive_timeout = keepalive_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.logger = logging.getLogger(__name__)
+        
+        self.session = None
+        self._semaphore = None
+        self.headers = {}
+        
+        # Authentication
+        self.api_key = None
+        self.authenticated = False
+        
+        # Batch endpoint support, detected on first use
+        self.batch_supported = None
+        
+        # Account, symbol info and symbol list reads are served from memory for a short TTL
+        self.cache = TTLCache(capacity=cache_size, ttls=cache_ttls)
+    
+    async def __aenter__(self):
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def set_api_key(self, api_key: str):
+        """Set API key for authentication"""
+        self.api_key = api_key
+        self.headers['Authorization'] = f'Bearer {api_key}'
+        if self.session:
+            self.session.headers.update(self.headers)
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Create the pooled session lazily inside the running event loop"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(limit=self.pool_size,
+                                             keepalive_timeout=self.keepalive_timeout)
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self.session
+    
+    async def close(self):
+        """Close the connection pool"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Any:
+        """Make HTTP request with retries and error handling"""
+        url = f"{self.base_url}{endpoint}"
+        session = await self._get_session()
+        
+        if 'timeout' in kwargs:
+            kwargs['timeout'] = aiohttp.ClientTimeout(total=kwargs['timeout'])
+        
+        retryable = method.upper() in self.RETRY_METHODS
+        for attempt in range(self.max_retries + 1):
+            try:
+                retry = False
+                async with self._semaphore:
+                    async with session.request(method, url, **kwargs) as response:
+                        if retryable and response.status in self.RETRY_STATUSES and attempt < self.max_retries:
+                            retry = True
+                        else:
+                            response.raise_for_status()
+                            content = await response.read()
+                
+                if retry:
+                    # Back off after releasing the response and the in-flight slot
+                    await asyncio.sleep(self.backoff_factor * (2 ** attempt))
+                    continue
+                
+                # Handle empty responses
+                if not content:
+                    return {}
+                
+                return self._decode(content, url)
+            
+            except aiohttp.ClientResponseError as e:
+                self.logger.error(f"API request failed {method} {url}: {e}")
+                raise MT5APIError(f"API request failed: {str(e)}", status_code=e.status) from e
+            
+            except MT5APIError:
+                raise
+            
+            except Exception as e:
+                self.logger.error(f"API request failed {method} {url}: {e}")
+                raise MT5APIError(f"API request failed: {str(e)}") from e
+    
+    def _decode(self, content: bytes, url: str) -> Any:
+        """Decode a JSON response body"""
+        try:
+            return json.loads(content)
+        except ValueError as e:  # covers JSON decode errors
+            self.logger.error(f"Invalid JSON response from {url}: {e}\nRaw: {content[:500]!r}")
+            raise MT5APIError(f"Invalid API response: {str(e)}") from e
+    
+    async def get_server_status(self) -> Dict[str, Any]:
+        """Get MT5 server status"""
+        try:
+            return await self._make_request('GET', '/api/v1/status')
+        except Exception as e:
+            self.logger.error(f"Failed to get server status: {e}")
+            return {'status': 'disconnected', 'error': str(e)}
+    
+    async def _load_cached(self, namespace: str, key, refresh: bool, loader):
+        """Read-through cache lookup; ``loader`` is a coroutine function"""
+        value = None if refresh else self.cache.get(namespace, key)
+        if value is None:
+            value = await loader()
+            if value:
+                self.cache.set(namespace, key, value)
+        return value
+    
+    async def get_account_info(self, refresh: bool = False) -> Dict[str, Any]:
+        """Get account information, cached for the ``account`` TTL unless ``refresh``"""
+        try:
+            return dict(await self._load_cached('account', None, refresh,
+                                                lambda: self._make_request('GET', '/api/v1/account')))
+        except Exception as e:
+            self.logger.error(f"Failed to get account info: {e}")
+            return {}
+    
+    async def get_account_balance(self) -> float:
+        """Get account balance"""
+        try:
+            account_info = await self.get_account_info()
+            return float(account_info.get('balance', 0))
+        except Exception as e:
+            self.logger.error(f"Failed to get account balance: {e}")
+            return 0.0
+    
+    async def get_account_equity(self) -> float:
+        """Get account equity"""
+        try:
+            account_info = await self.get_account_info()
+            return float(account_info.get('equity', 0))
+        except Exception as e:
+            self.logger.error(f"Failed to get account equity: {e}")
+            return 0.0
+    
+    async def get_market_data(self, symbol: str, timeframe: str = "M1", count: int = 100) -> Dict[str, Any]:
+        """Get market data for a symbol"""
+        try:
+            params = {
+                'symbol': symbol.upper(),
+                'timeframe': timeframe.upper(),
+                'count': count
+            }
+            return await self._make_request('GET', '/api/v1/market/data', params=params)
+        except Exception as e:
+            self.logger.error(f"Failed to get market data for {symbol}: {e}")
+            return {}
+    
+    async def get_market_data_many(self, symbols: Sequence[str], timeframes: Union[str, Sequence[str]] = "M1",
+                                   count: int = 100) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Get market data for several symbols/timeframes
+        
+        Uses the batch route when available, otherwise gathers the
+        single-symbol requests concurrently.
+        """
+        if isinstance(timeframes, str):
+            timeframes = [timeframes]
+        symbols = [s.upper() for s in symbols]
+        timeframes = [tf.upper() for tf in timeframes]
+        if not symbols or not timeframes:
+            return {}
+        
+        if self.batch_supported is not False:
+            try:
+                params = {
+                    'symbols': ','.join(symbols),
+                    'timeframes': ','.join(timeframes),
+                    'count': count
+                }
+                response = await self._make_request('GET', '/api/v1/market/data/batch', params=params)
+                if 'series' in response:
+                    self.batch_supported = True
+                    grouped = {}
+                    for item in response['series']:
+                        grouped.setdefault(str(item.get('symbol', '')).upper(), {})[
+                            str(item.get('timeframe', '')).upper()] = item
+                    return grouped
+                if endpoint_missing(response):
+                    self.batch_supported = False
+                else:
+                    self.logger.warning(f"Batch market data failed, using concurrent requests: "
+                                        f"{response.get('error', response)}")
+            except MT5APIError as e:
+                if e.status_code == 404:
+                    self.batch_supported = False
+                else:
+                    self.logger.error(f"Failed to get batch market data: {e}")
+                    return {}
+        
+        pairs = [(symbol, timeframe) for symbol in symbols for timeframe in timeframes]
+        results = await asyncio.gather(*(self.get_market_data(s, tf, count) for s, tf in pairs))
+        
+        grouped = {}
+        for (symbol, timeframe), data in zip(pairs, results):
+            grouped.setdefault(symbol, {})[timeframe] = data
+        return grouped
+    
+    async def get_symbol_info(self, symbol: str, refresh: bool = False) -> Dict[str, Any]:
+        """Get symbol information, cached for the ``symbol_info`` TTL unless ``refresh``"""
+        try:
+            params = {'symbol': symbol.upper()}
+            return dict(await self._load_cached(
+                'symbol_info', params['symbol'], refresh,
+                lambda: self._make_request('GET', '/api/v1/market/symbol', params=params)))
+        except Exception as e:
+            self.logger.error(f"Failed to get symbol info for {symbol}: {e}")
+            return {}
+    
+    async def get_available_symbols(self, refresh: bool = False) -> List[str]:
+        """Get list of available symbols, cached for the ``symbols`` TTL unless ``refresh``"""
+        async def load():
+            response = await self._make_request('GET', '/api/v1/market/symbols')
+            return response.get('symbols', [])
+        
+        try:
+            return list(await self._load_cached('symbols', None, refresh, load))
+        except Exception as e:
+            self.logger.error(f"Failed to get available symbols: {e}")
+            return []
+    
+    async def place_order(self, symbol: str, order_type: str, volume: float, price: float = None,
+                          sl: float = None, tp: float = None, comment: str = "",
+                          deviation: int = 10) -> Dict[str, Any]:
+        """Place a trading order"""
+        try:
+            order_data = {
+                'symbol': symbol.upper(),
+                'type': order_type.upper(),  # "BUY" or "SELL"
+                'volume': float(volume),
+                'deviation': int(deviation),
+                'comment': str(comment)
+            }
+            
+            # Add optional parameters if provided
+            if price is not None:
+                order_data['price'] = float(price)
+            if sl is not None:
+                order_data['sl'] = float(sl)
+            if tp is not None:
+                order_data['tp'] = float(tp)
+            
+            return await self._make_request('POST', '/api/v1/trade/order', json=order_data)
+        except Exception as e:
+            self.logger.error(f"Failed to place order for {symbol}: {e}")
+            return {'error': str(e), 'success': False}
+        finally:
+            # Balance, equity and margin change with every trade
+            self.cache.invalidate('account')
+    
+    async def place_market_order(self, symbol: str, order_type: str, volume: float,
+                                 sl: float = None, tp: float = None, comment: str = "") -> Dict[str, Any]:
+        """Place a market order"""
+        return await self.place_order(symbol, order_type, volume, sl=sl, tp=tp, comment=comment)
+    
+    async def place_limit_order(self, symbol: str, order_type: str, volume: float, price: float,
+                                sl: float = None, tp: float = None, comment: str = "") -> Dict[str, Any]:
+        """Place a limit order"""
+        return await self.place_order(symbol, order_type, volume, price=price, sl=sl, tp=tp, comment=comment)
+    
+    async def place_stop_order(self, symbol: str, order_type: str, volume: float, price: float,
+                               sl: float = None, tp: float = None, comment: str = "") -> Dict[str, Any]:
+        """Place a stop order"""
+        return await self.place_order(symbol, order_type, volume, price=price, sl=sl, tp=tp, comment=comment)
+    
+    async def get_positions(self) -> List[Dict[str, Any]]:
+        """Get all open positions"""
+        try:
+            response = await self._make_request('GET', '/api/v1/trade/positions')
+            return response.get('positions', [])
+        except Exception as e:
+            self.logger.error(f"Failed to get positions: {e}")
+            return []
+    
+    async def get_position_by_ticket(self, ticket: int) -> Dict[str, Any]:
+        """Get specific position by ticket number"""
+        try:
+            return await self._make_request('GET', f'/api/v1/trade/position/{ticket}')
+        except Exception as e:
+            self.logger.error(f"Failed to get position {ticket}: {e}")
+            return {}
+    
+    async def close_position(self, ticket: int) -> Dict[str, Any]:
+        """Close a specific position"""
+        try:
+            return await self._make_request('DELETE', f'/api/v1/trade/position/{ticket}')
+        except Exception as e:
+            self.logger.error(f"Failed to close position {ticket}: {e}")
+            return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
+    
+    async def close_all_positions(self) -> Dict[str, Any]:
+        """Close all open positions concurrently"""
+        start_time = time.perf_counter()
+        try:
+            tickets = [p.get('ticket') for p in await self.get_positions() if p.get('ticket')]
+            results = await asyncio.gather(*(self.close_position(t) for t in tickets))
+            return bulk_summary('closed_positions', [{'ticket': t, 'result': r} for t, r in zip(tickets, results)],
+                                start_time)
+        except Exception as e:
+            self.logger.error(f"Failed to close all positions: {e}")
+            return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
+    
+    async def get_orders(self) -> List[Dict[str, Any]]:
+        """Get all pending orders"""
+        try:
+            response = await self._make_request('GET', '/api/v1/trade/orders')
+            return response.get('orders', [])
+        except Exception as e:
+            self.logger.error(f"Failed to get orders: {e}")
+            return []
+    
+    async def cancel_order(self, ticket: int) -> Dict[str, Any]:
+        """Cancel a pending order"""
+        try:
+            return await self._make_request('DELETE', f'/api/v1/trade/order/{ticket}')
+        except Exception as e:
+            self.logger.error(f"Failed to cancel order {ticket}: {e}")
+            return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
+    
+    async def cancel_all_orders(self) -> Dict[str, Any]:
+        """Cancel all pending orders concurrently"""
+        start_time = time.perf_counter()
+        try:
+            tickets = [o.get('ticket') for o in await self.get_orders() if o.get('ticket')]
+            results = await asyncio.gather(*(self.cancel_order(t) for t in tickets))
+            return bulk_summary('cancelled_orders', [{'ticket': t, 'result': r} for t, r in zip(tickets, results)],
+                                start_time)
+        except Exception as e:
+            self.logger.error(f"Failed to cancel all orders: {e}")
+            return {'error': str(e), 'success': False}
+        finally:
+            self.cache.invalidate('account')
+    
+    async def get_history_deals(self, date_from: str = None, date_to: str = None,
+                                position_id: int = None) -> List[Dict[str, Any]]:
+        """Get history of deals"""
+        try:
+            params = {}
+            if date_from:
+                params['date_from'] = date_from
+            if date_to:
+                params['date_to'] = date_to
+            if position_id:
+                params['position_id'] = position_id
+            
+            response = await self._make_request('GET', '/api/v1/history/deals', params=params)
+            return response.get('deals', [])
+        except Exception as e:
+            self.logger.error(f"Failed to get history deals: {e}")
+            return []
+    
+    async def get_history_orders(self, date_from: str = None, date_to: str = None) -> List[Dict[str, Any]]:
+        """Get history of orders"""
+        try:
+            params = {}
+            if date_from:
+                params['date_from'] = date_from
+            if date_to:
+                params['date_to'] = date_to
+            
+            response = await self._make_request('GET', '/api/v1/history/orders', params=params)
+            return response.get('orders', [])
+        except Exception as e:
+            self.logger.error(f"Failed to get history orders: {e}")
+            return []
+    
+    async def ping(self) -> bool:
+        """Ping the API to check connectivity"""
+        try:
+            response = await self._make_request('GET', '/api/v1/ping')
+            return response.get('status') == 'ok'
+        except Exception:
+            return False
@@ -0,0 +1,161 @@
+"""
+MT5 Socket Client - asyncio Unix Socket Client with Pipelined Requests
+"""
+
+import asyncio
+import logging
+import itertools
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from src.modules.mt5_connector.message_codecs import JSONCodec
+from src.modules.mt5_connector.socket_framing import HEADER, MAX_FRAME_SIZE, FrameError
+from src.modules.mt5_connector.transports import transport_failure
+
+class AsyncMT5SocketClient:
+    """Coroutine client for the MT5 Unix socket bridge.
+    
+    Every request carries an ``id`` that the bridge echoes back, so any
+    number of requests can be outstanding on one connection and each
+    resolves as soon as its response arrives, whatever the order.
+    """
+    
+    def __init__(self, socket_path: str = "/tmp/tradingai_mt5_bridge.sock", timeout: float = 30.0,
+                 max_in_flight: int = 256):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.max_in_flight = max_in_flight
+        self.logger = logging.getLogger(__name__)
+        self.codec = JSONCodec()
+        
+        self.reader = None
+        self.writer = None
+        self.is_connected = False
+        self._request_ids = itertools.count(1)
+        self._pending: 'OrderedDict[str, asyncio.Future]' = OrderedDict()
+        self._read_task = None
+        self._semaphore = None
+    
+    async def __aenter__(self):
+        await self.connect()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    async def connect(self):
+        """Open the connection and start dispatching responses"""
+        if self.is_connected:
+            return
+        self.reader, self.writer = await asyncio.open_unix_connection(self.socket_path)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        self._read_task = asyncio.ensure_future(self._read_loop())
+        self.is_connected = True
+        self.logger.info(f"Connected to MT5 Unix socket: {self.socket_path}")
+    
+    async def close(self):
+        """Close the connection, failing any outstanding requests"""
+        self.is_connected = False
+        if self._read_task:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._read_task = None
+        if self.writer:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except Exception:
+                pass
+            self.writer = None
+        self._fail_pending(ConnectionError("MT5 socket client closed"))
+    
+    def _fail_pending(self, error: Exception):
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(error)
+    
+    async def _read_loop(self):
+        """Resolve pending futures from incoming frames"""
+        try:
+            while True:
+                header = await self.reader.readexactly(HEADER.size)
+                length, = HEADER.unpack(header)
+                if length > MAX_FRAME_SIZE:
+                    raise FrameError(f"Frame of {length} bytes exceeds limit of {MAX_FRAME_SIZE}")
+                response = self.codec.decode(await self.reader.readexactly(length))
+                
+                request_id = response.get('id') if isinstance(response, dict) else None
+                if request_id is not None:
+                    future = self._pending.pop(str(request_id), None)
+                elif self._pending:
+                    # Peers that do not echo ids answer in order
+                    future = self._pending.popitem(last=False)[1]
+                else:
+                    future = None
+                
+                if future is None:
+                    self.logger.debug(f"Discarding response for unknown or expired request {request_id}")
+                elif not future.done():
+                    future.set_result(response)
+        except asyncio.CancelledError:
+            raise
+        except (asyncio.IncompleteReadError, ConnectionError) as e:
+            self.logger.warning(f"MT5 socket connection lost: {e}")
+        except Exception as e:
+            self.logger.error(f"MT5 socket read error: {e}")
+        finally:
+            self.is_connected = False
+            self._fail_pending(ConnectionError("MT5 socket connection lost"))
+    
+    async def send_message(self, message: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a message and wait up to ``timeout`` seconds for its response"""
+        timeout = self.timeout if timeout is None else timeout
+        request_id = None
+        try:
+            if not self.is_connected:
+                await self.connect()
+            
+            async with self._semaphore:
+                request_id = str(next(self._request_ids))
+                message = dict(message, id=request_id)
+                payload = self.codec.encode(message)
+                
+                future = asyncio.get_running_loop().create_future()
+                self._pending[request_id] = future
+                self.writer.write(HEADER.pack(len(payload)) + payload)
+                await self.writer.drain()
+                
+                return await asyncio.wait_for(future, timeout)
+        
+        except asyncio.TimeoutError:
+            self._pending.pop(request_id, None)
+            return transport_failure('Request timeout')
+        except Exception as e:
+            if request_id is not None:
+                self._pending.pop(request_id, None)
+            self.logger.error(f"Error sending message: {e}")
+            return transport_failure(str(e))
+    
+    async def send_request(self, command: str, data: Dict[str, Any] = None,
+                           timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a bridge command and wait for its response"""
+        return await self.send_message({
+            'command': command,
+            'data': data or {},
+            'timestamp': datetime.now().isoformat()
+        }, timeout)
+    
+    async def send_requests(self, requests: Sequence[Tuple[str, Dict[str, Any]]],
+                            timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Issue many commands at once; responses are returned in request order"""
+        return await asyncio.gather(*(self.send_request(command, data, timeout) for command, data in requests))
+    
+    def get_in_flight_count(self) -> int:
+        """Number of requests awaiting a response"""
+        return len(self._pending)
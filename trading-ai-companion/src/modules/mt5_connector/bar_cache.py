@@ -0,0 +1,82 @@
+"""
+MT5 Bar Cache - Per-symbol/timeframe OHLC Ring Buffers
+"""
+
+import logging
+import threading
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+
+class BarCache:
+    def __init__(self, capacity: int = 1000):
+        self.logger = logging.getLogger(__name__)
+        self.capacity = capacity
+        self._buffers: Dict[Tuple[str, str], deque] = {}
+        self._lock = threading.Lock()
+    
+    def _key(self, symbol: str, timeframe: str) -> Tuple[str, str]:
+        return symbol.upper(), timeframe.upper()
+    
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[float]:
+        """Get timestamp of the newest cached bar"""
+        with self._lock:
+            buffer = self._buffers.get(self._key(symbol, timeframe))
+            if not buffer:
+                return None
+            return buffer[-1].get('timestamp')
+    
+    def size(self, symbol: str, timeframe: str) -> int:
+        """Get number of cached bars"""
+        with self._lock:
+            return len(self._buffers.get(self._key(symbol, timeframe), ()))
+    
+    def get_bars(self, symbol: str, timeframe: str, count: int = None) -> List[Dict[str, Any]]:
+        """Get the newest ``count`` cached bars, oldest first"""
+        with self._lock:
+            buffer = self._buffers.get(self._key(symbol, timeframe))
+            if not buffer:
+                return []
+            bars = list(buffer)
+        return bars[-count:] if count else bars
+    
+    def replace(self, symbol: str, timeframe: str, bars: List[Dict[str, Any]], min_capacity: int = 0):
+        """Replace the cached window for a symbol/timeframe"""
+        capacity = max(self.capacity, min_capacity)
+        with self._lock:
+            self._buffers[self._key(symbol, timeframe)] = deque(bars, maxlen=capacity)
+    
+    def merge(self, symbol: str, timeframe: str, bars: List[Dict[str, Any]], min_capacity: int = 0) -> int:
+        """Merge newer bars into the ring buffer
+        
+        Cached bars at or after the first incoming timestamp are replaced,
+        so a re-sent (still forming) last bar is updated in place.
+        Returns the number of bars added or updated.
+        """
+        if not bars:
+            return 0
+        
+        key = self._key(symbol, timeframe)
+        capacity = max(self.capacity, min_capacity)
+        with self._lock:
+            buffer = self._buffers.get(key)
+            if buffer is None or buffer.maxlen < capacity:
+                buffer = deque(buffer or (), maxlen=capacity)
+                self._buffers[key] = buffer
+            
+            first_timestamp = bars[0].get('timestamp')
+            while buffer and buffer[-1].get('timestamp') >= first_timestamp:
+                buffer.pop()
+            buffer.extend(bars)
+        
+        return len(bars)
+    
+    def clear(self, symbol: str = None, timeframe: str = None):
+        """Drop cached bars for one symbol/timeframe or everything"""
+        with self._lock:
+            if symbol is None:
+                self._buffers.clear()
+            elif timeframe is None:
+                for key in [k for k in self._buffers if k[0] == symbol.upper()]:
+                    del self._buffers[key]
+            else:
+                self._buffers.pop(self._key(symbol, timeframe), None)
@@ -0,0 +1,120 @@
+"""
+MT5 Bar Series - Columnar NumPy Representation of OHLCV Bars
+"""
+
+import numpy as np
+from typing import Dict, Any, List, Sequence
+
+class BarSeries:
+    """OHLCV bars stored as one contiguous (6, n) float64 block.
+    
+    Each field is a row of the block, so ``close``, ``high`` etc. are
+    contiguous read-only views that indicator code can use without copying.
+    """
+    
+    FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+    
+    def __init__(self, data: np.ndarray = None, symbol: str = "", timeframe: str = ""):
+        if data is None:
+            data = np.empty((len(self.FIELDS), 0), dtype=np.float64)
+        if data.ndim != 2 or data.shape[0] != len(self.FIELDS):
+            raise ValueError(f"Bar data must have shape ({len(self.FIELDS)}, n), got {data.shape}")
+        self.data = data
+        self.symbol = symbol
+        self.timeframe = timeframe
+    
+    @classmethod
+    def from_bars(cls, bars: List[Dict[str, Any]], symbol: str = "", timeframe: str = "") -> 'BarSeries':
+        """Build from the bridge's list-of-dicts bar format in a single pass"""
+        n = len(bars)
+        flat = np.fromiter((bar.get(field, 0.0) for bar in bars for field in cls.FIELDS),
+                           dtype=np.float64, count=n * len(cls.FIELDS))
+        data = np.ascontiguousarray(flat.reshape(n, len(cls.FIELDS)).T)
+        return cls(data, symbol, timeframe)
+    
+    @classmethod
+    def from_columns(cls, columns: Dict[str, Sequence[float]], symbol: str = "", timeframe: str = "") -> 'BarSeries':
+        """Build from columnar data (one sequence per field)"""
+        n = len(columns.get('timestamp', ()))
+        data = np.zeros((len(cls.FIELDS), n), dtype=np.float64)
+        for i, field in enumerate(cls.FIELDS):
+            if field in columns:
+                data[i] = columns[field]
+        return cls(data, symbol, timeframe)
+    
+    @classmethod
+    def from_response(cls, response: Dict[str, Any]) -> 'BarSeries':
+        """Build from a market data response in either columnar or bar format"""
+        symbol = response.get('symbol', '')
+        timeframe = response.get('timeframe', '')
+        if 'columns' in response:
+            return cls.from_columns(response['columns'], symbol, timeframe)
+        return cls.from_bars(response.get('bars', []), symbol, timeframe)
+    
+    @classmethod
+    def stack(cls, series: Sequence['BarSeries'], count: int = None) -> np.ndarray:
+        """The last ``count`` bars of several series as one ``(6, len(series), count)`` block
+        
+        ``count`` defaults to the shortest series. Rows keep the order of
+        ``series``, so e.g. ``block[4]`` is a symbols x bars close matrix.
+        """
+        if count is None:
+            count = min((len(s) for s in series), default=0)
+        short = [s.symbol for s in series if len(s) < count]
+        if short:
+            raise ValueError(f"Fewer than {count} bars for {', '.join(short)}")
+        block = np.empty((len(cls.FIELDS), len(series), count), dtype=np.float64)
+        for i, s in enumerate(series):
+            block[:, i] = s.data[:, len(s) - count:]
+        return block
+    
+    def _field(self, index: int) -> np.ndarray:
+        view = self.data[index]
+        view.flags.writeable = False
+        return view
+    
+    @property
+    def timestamp(self) -> np.ndarray:
+        return self._field(0)
+    
+    @property
+    def open(self) -> np.ndarray:
+        return self._field(1)
+    
+    @property
+    def high(self) -> np.ndarray:
+        return self._field(2)
+    
+    @property
+    def low(self) -> np.ndarray:
+        return self._field(3)
+    
+    @property
+    def close(self) -> np.ndarray:
+        return self._field(4)
+    
+    @property
+    def volume(self) -> np.ndarray:
+        return self._field(5)
+    
+    def __len__(self) -> int:
+        return self.data.shape[1]
+    
+    def __getitem__(self, index) -> 'BarSeries':
+        """Slice bars; slices are views on the same block"""
+        if isinstance(index, (int, np.integer)):
+            index = int(index)
+            index = slice(index, index + 1 if index != -1 else None)
+        return BarSeries(self.data[:, index], self.symbol, self.timeframe)
+    
+    def concat(self, other: 'BarSeries') -> 'BarSeries':
+        """Return a new series with ``other`` appended"""
+        return BarSeries(np.concatenate([self.data, other.data], axis=1), self.symbol, self.timeframe)
+    
+    def to_bars(self) -> List[Dict[str, Any]]:
+        """Convert back to the list-of-dicts bar format"""
+        return [dict(zip(self.FIELDS, row)) for row in self.data.T.tolist()]
+    
+    def to_columns(self) -> Dict[str, List[float]]:
+        """Convert to columnar lists (JSON friendly)"""
+        return {field: self.data[i].tolist() for i, field in enumerate(self.FIELDS)}
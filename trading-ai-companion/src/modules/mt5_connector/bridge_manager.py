@@ -8,22 +8,42 @@ import time
 import logging
 import threading
 import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 
+from src.modules.mt5_connector.file_watcher import create_file_watcher
+from src.modules.mt5_connector.transports import transport_failure
+
 class MT5BridgeManager:
-    def __init__(self, bridge_path: str = None):
+    def __init__(self, bridge_path: str = None, use_inotify: bool = True, poll_interval: float = 0.1,
+                 batch_mode: bool = False, flush_interval: float = 0.01):
         self.logger = logging.getLogger(__name__)
         self.bridge_path = bridge_path or self._get_default_bridge_path()
-        self.request_queue = []
-        self.response_cache = {}
+        # In-flight requests by id (submission order) and responses awaiting dispatch
+        self.request_queue: 'OrderedDict[str, Future]' = OrderedDict()
+        self.response_cache: Dict[str, Dict[str, Any]] = {}
         self.is_running = False
         self.bridge_thread = None
         
         # Create bridge directory
         Path(self.bridge_path).mkdir(parents=True, exist_ok=True)
-        self.logger.info(f"MT5 Bridge initialized at: {self.bridge_path}")
+        
+        # A single watcher thread reads response files and resolves their futures
+        self._pending_lock = threading.Lock()
+        self._activity = threading.Event()
+        self.watcher = create_file_watcher(self.bridge_path, self._on_file_event,
+                                           use_inotify=use_inotify, poll_interval=poll_interval)
+        
+        # Batch mode: requests are journaled together once per flush interval
+        self.batch_mode = batch_mode
+        self.flush_interval = flush_interval
+        self._outbox: List[Tuple[Future, str]] = []
+        self._flush_at: Optional[float] = None
+        self._batches: Dict[str, set] = {}
+        self.logger.info(f"MT5 Bridge initialized at: {self.bridge_path} ({self.watcher.name} watcher)")
     
     def _get_default_bridge_path(self) -> str:
         """Get default bridge path based on OS"""
@@ -43,6 +63,8 @@ class MT5BridgeManager:
             return
         
         self.is_running = True
+        if not self.watcher.is_running:
+            self.watcher.start()
         self.bridge_thread = threading.Thread(target=self._bridge_worker, daemon=True)
         self.bridge_thread.start()
         self.logger.info("MT5 Bridge communication started")
@@ -50,88 +72,324 @@ class MT5BridgeManager:
     def stop_bridge(self):
         """Stop the bridge communication"""
         self.is_running = False
+        self._activity.set()
         if self.bridge_thread:
             self.bridge_thread.join(timeout=5)
+            self.bridge_thread = None
+        self.watcher.stop()
+        
+        # Fail anything still in flight
+        with self._pending_lock:
+            pending = list(self.request_queue.values())
+            self.request_queue.clear()
+            self.response_cache.clear()
+            self._outbox.clear()
+            self._flush_at = None
+        for future in pending:
+            self._discard(future)
+            if not future.done():
+                future.set_exception(ConnectionError("MT5 bridge stopped"))
         self.logger.info("MT5 Bridge communication stopped")
     
     def _bridge_worker(self):
         """Background worker for bridge communication"""
         while self.is_running:
             try:
-                # Process pending requests
-                self._process_requests()
+                # Write out the batch journal once its flush interval elapses
+                flush_at = self._flush_at
+                if flush_at is not None and time.monotonic() >= flush_at:
+                    self.flush()
+                    flush_at = None
                 
-                # Check for responses from MT5
-                self._check_responses()
+                # Expire requests past their deadline
+                next_deadline = self._process_requests()
                 
-                time.sleep(0.1)  # 100ms delay
+                # Sleep until the next deadline, flush or submission; on a quiet
+                # wake-up sweep for responses the watcher may have missed
+                wakeups = [t for t in (next_deadline, flush_at) if t is not None]
+                wait = min([1.0] + [max(0.0, t - time.monotonic()) for t in wakeups])
+                if not self._activity.wait(timeout=wait):
+                    self._check_responses()
+                self._activity.clear()
                 
             except Exception as e:
                 self.logger.error(f"Bridge worker error: {e}")
                 time.sleep(1)
     
-    def _process_requests(self):
-        """Process pending requests"""
-        # This would be implemented based on the specific bridge mechanism
-        pass
+    def _request_file(self, request_id: str) -> str:
+        return os.path.join(self.bridge_path, f"request_{request_id}.json")
+    
+    def _response_file(self, request_id: str) -> str:
+        return os.path.join(self.bridge_path, f"response_{request_id}.json")
+    
+    def _request_journal(self, batch_id: str) -> str:
+        return os.path.join(self.bridge_path, f"requests_{batch_id}.jsonl")
+    
+    def _response_journal(self, batch_id: str) -> str:
+        return os.path.join(self.bridge_path, f"responses_{batch_id}.jsonl")
+    
+    def _remove_files(self, *paths: str):
+        for path in paths:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+    
+    def _discard(self, future: Future):
+        """Remove the files of a finished request"""
+        if future.batch_id is None:
+            self._remove_files(self._request_file(future.request_id), self._response_file(future.request_id))
+            return
+        
+        # Journals are removed once every request in the batch is done
+        with self._pending_lock:
+            batch = self._batches.get(future.batch_id)
+            if batch is None:
+                return
+            batch.discard(future.request_id)
+            if batch:
+                return
+            del self._batches[future.batch_id]
+        self._remove_files(self._request_journal(future.batch_id), self._response_journal(future.batch_id))
+    
+    def _on_file_event(self, filename: str):
+        """Collect a freshly written response file or journal and dispatch it"""
+        if filename.startswith('response_') and filename.endswith('.json'):
+            collected = self._collect_response(filename[len('response_'):-len('.json')])
+        elif filename.startswith('responses_') and filename.endswith('.jsonl'):
+            collected = self._collect_journal(filename[len('responses_'):-len('.jsonl')])
+        else:
+            return
+        if collected:
+            self._dispatch_responses()
+    
+    def _collect_response(self, request_id: str, attempts: int = 3) -> bool:
+        """Read a response file into ``response_cache``"""
+        with self._pending_lock:
+            if request_id not in self.request_queue:
+                return False
+        
+        response_file = self._response_file(request_id)
+        for attempt in range(attempts):
+            try:
+                with open(response_file, 'r') as f:
+                    response = json.load(f)
+                break
+            except FileNotFoundError:
+                return False
+            except (OSError, json.JSONDecodeError):
+                # A polling watcher may report the file before it is complete
+                time.sleep(0.01)
+        else:
+            return False
+        
+        self._remove_files(self._request_file(request_id), response_file)
+        with self._pending_lock:
+            self.response_cache[request_id] = response
+        return True
+    
+    def _collect_journal(self, batch_id: str, attempts: int = 3) -> bool:
+        """Read a response journal (one JSON response per line) into ``response_cache``"""
+        with self._pending_lock:
+            if batch_id not in self._batches:
+                return False
+        
+        journal = self._response_journal(batch_id)
+        for attempt in range(attempts):
+            try:
+                with open(journal, 'r') as f:
+                    responses = [json.loads(line) for line in f if line.strip()]
+                break
+            except FileNotFoundError:
+                return False
+            except (OSError, json.JSONDecodeError):
+                time.sleep(0.01)
+        else:
+            return False
+        
+        with self._pending_lock:
+            self._batches.pop(batch_id, None)
+            for response in responses:
+                request_id = str(response.get('id'))
+                if request_id in self.request_queue:
+                    self.response_cache[request_id] = response
+        self._remove_files(self._request_journal(batch_id), journal)
+        return True
+    
+    def _dispatch_responses(self):
+        """Resolve pending futures from ``response_cache`` by request id"""
+        resolved = []
+        with self._pending_lock:
+            for request_id in list(self.response_cache):
+                future = self.request_queue.pop(request_id, None)
+                response = self.response_cache.pop(request_id)
+                if future is not None:
+                    resolved.append((future, response))
+        
+        for future, response in resolved:
+            if not future.done():
+                future.set_result(response)
+    
+    def _process_requests(self) -> Optional[float]:
+        """Time out expired requests; returns the next pending deadline"""
+        now = time.monotonic()
+        expired = []
+        next_deadline = None
+        with self._pending_lock:
+            for request_id, future in list(self.request_queue.items()):
+                if future.deadline <= now:
+                    expired.append(self.request_queue.pop(request_id))
+                elif next_deadline is None or future.deadline < next_deadline:
+                    next_deadline = future.deadline
+        
+        for future in expired:
+            self._discard(future)
+            if not future.done():
+                future.set_exception(TimeoutError("Request timeout"))
+        return next_deadline
     
     def _check_responses(self):
-        """Check for responses from MT5"""
-        # This would be implemented based on the specific bridge mechanism
-        pass
+        """Pick up response files for in-flight requests the watcher did not report"""
+        with self._pending_lock:
+            request_ids = list(self.request_queue)
+        
+        collected = False
+        if self.batch_mode:
+            for filename in os.listdir(self.bridge_path):
+                if filename.startswith('responses_') and filename.endswith('.jsonl'):
+                    collected = self._collect_journal(filename[len('responses_'):-len('.jsonl')]) or collected
+        for request_id in request_ids:
+            if os.path.exists(self._response_file(request_id)):
+                collected = self._collect_response(request_id) or collected
+        if collected:
+            self._dispatch_responses()
+    
+    def submit_request(self, command: str, data: Dict[str, Any] = None, timeout: float = 30) -> Future:
+        """Write a request without waiting; the returned future resolves to the response
+        
+        The future fails with ``TimeoutError`` if no response arrives within
+        ``timeout`` seconds.
+        """
+        self.start_bridge()
+        
+        request_id = str(uuid.uuid4())
+        request_data = {
+            'id': request_id,
+            'command': command,
+            'data': data or {},
+            'timestamp': datetime.now().isoformat()
+        }
+        
+        # Register before writing so a fast response cannot be missed
+        future = Future()
+        future.request_id = request_id
+        future.batch_id = None
+        future.deadline = time.monotonic() + timeout
+        line = json.dumps(request_data, separators=(',', ':'))
+        with self._pending_lock:
+            self.request_queue[request_id] = future
+            if self.batch_mode:
+                self._outbox.append((future, line))
+                if self._flush_at is None:
+                    self._flush_at = time.monotonic() + self.flush_interval
+        self._activity.set()
+        if self.batch_mode:
+            return future
+        
+        try:
+            with open(self._request_file(request_id), 'w') as f:
+                f.write(line)
+        except Exception:
+            with self._pending_lock:
+                self.request_queue.pop(request_id, None)
+            raise
+        return future
+    
+    def flush(self):
+        """Write queued batch-mode requests as a single journal file"""
+        with self._pending_lock:
+            entries, self._outbox = self._outbox, []
+            self._flush_at = None
+            if not entries:
+                return
+            batch_id = uuid.uuid4().hex
+            for future, _ in entries:
+                future.batch_id = batch_id
+            self._batches[batch_id] = {future.request_id for future, _ in entries}
+        
+        # Write under a temporary name and rename so MT5 never sees a partial journal
+        journal = self._request_journal(batch_id)
+        temp_file = os.path.join(self.bridge_path, f".requests_{batch_id}.tmp")
+        try:
+            with open(temp_file, 'w') as f:
+                f.write('\n'.join(line for _, line in entries) + '\n')
+            os.replace(temp_file, journal)
+        except Exception as e:
+            self.logger.error(f"Error writing request journal: {e}")
+            self._remove_files(temp_file)
+            with self._pending_lock:
+                self._batches.pop(batch_id, None)
+                for future, _ in entries:
+                    self.request_queue.pop(future.request_id, None)
+            for future, _ in entries:
+                if not future.done():
+                    future.set_exception(e)
+    
+    def get_in_flight_count(self) -> int:
+        """Number of requests awaiting a response"""
+        with self._pending_lock:
+            return len(self.request_queue)
     
     def send_request(self, command: str, data: Dict[str, Any] = None, timeout: int = 30) -> Dict[str, Any]:
         """Send request to MT5 and wait for response"""
         try:
-            request_id = str(uuid.uuid4())
-            request_data = {
-                'id': request_id,
-                'command': command,
-                'data': data or {},
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Write request to file
-            request_file = os.path.join(self.bridge_path, f"request_{request_id}.json")
-            with open(request_file, 'w') as f:
-                json.dump(request_data, f, indent=2)
-            
-            # Wait for response
-            start_time = time.time()
-            while time.time() - start_time < timeout:
-                response_file = os.path.join(self.bridge_path, f"response_{request_id}.json")
-                if os.path.exists(response_file):
-                    with open(response_file, 'r') as f:
-                        response = json.load(f)
-                    
-                    # Clean up files
-                    try:
-                        os.remove(request_file)
-                        os.remove(response_file)
-                    except:
-                        pass
-                    
-                    return response
-                
-                time.sleep(0.1)
-            
-            # Timeout - clean up request file
+            future = self.submit_request(command, data, timeout)
             try:
-                os.remove(request_file)
-            except:
-                pass
-            
-            return {'error': 'Request timeout', 'success': False}
+                # The worker expires the request; the margin only guards a stalled worker
+                return future.result(timeout=timeout + 1)
+            except (TimeoutError, FutureTimeoutError):
+                with self._pending_lock:
+                    self.request_queue.pop(future.request_id, None)
+                self._discard(future)
+                return transport_failure('Request timeout')
             
         except Exception as e:
             self.logger.error(f"Error sending request: {e}")
-            return {'error': str(e), 'success': False}
+            return transport_failure(str(e))
+    
+    def send_requests(self, requests: List[Tuple[str, Dict[str, Any]]], timeout: int = 30) -> List[Dict[str, Any]]:
+        """Send many requests at once and wait for all responses (in request order)
+        
+        In batch mode they travel in a single request journal.
+        """
+        try:
+            futures = [self.submit_request(command, data, timeout) for command, data in requests]
+        except Exception as e:
+            self.logger.error(f"Error sending requests: {e}")
+            return [transport_failure(str(e)) for _ in requests]
+        self.flush()
+        
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=timeout + 1))
+            except (TimeoutError, FutureTimeoutError):
+                with self._pending_lock:
+                    self.request_queue.pop(future.request_id, None)
+                self._discard(future)
+                results.append(transport_failure('Request timeout'))
+            except Exception as e:
+                results.append(transport_failure(str(e)))
+        return results
     
     def get_bridge_status(self) -> Dict[str, Any]:
         """Get bridge status"""
         return {
             'bridge_path': self.bridge_path,
             'is_running': self.is_running,
+            'watcher': self.watcher.name,
+            'batch_mode': self.batch_mode,
+            'pending_batches': len(self._batches),
             'pending_requests': len(self.request_queue),
             'cached_responses': len(self.response_cache)
         }
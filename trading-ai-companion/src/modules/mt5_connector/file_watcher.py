@@ -0,0 +1,176 @@
+"""
+MT5 File Watcher - inotify Directory Watching with Polling Fallback
+"""
+
+import os
+import ctypes
+import ctypes.util
+import select
+import struct
+import logging
+import platform
+import threading
+from typing import Callable
+
+# inotify event masks (linux/inotify.h)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0x00000800
+IN_CLOEXEC = 0x00080000
+
+_EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+# Called with the bare file name once a file in the directory is complete
+FileCallback = Callable[[str], None]
+
+def _load_libc():
+    """Load libc with inotify support, or None when unavailable"""
+    if platform.system() != "Linux":
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        # Attribute lookup raises AttributeError if libc lacks inotify
+        libc.inotify_init1
+        libc.inotify_add_watch
+        return libc
+    except (OSError, AttributeError):
+        return None
+
+class InotifyWatcher:
+    """Wake on IN_CLOSE_WRITE / IN_MOVED_TO events instead of polling"""
+    name = 'inotify'
+    
+    def __init__(self, path: str, callback: FileCallback):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.callback = callback
+        self.libc = _load_libc()
+        if self.libc is None:
+            raise OSError("inotify is not available on this system")
+        self.fd = None
+        self.is_running = False
+        self.thread = None
+        self._wake_r = None
+        self._wake_w = None
+    
+    def start(self):
+        """Start watching the directory"""
+        if self.is_running:
+            return
+        
+        fd = self.libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        wd = self.libc.inotify_add_watch(fd, os.fsencode(self.path), IN_CLOSE_WRITE | IN_MOVED_TO)
+        if wd < 0:
+            errno = ctypes.get_errno()
+            os.close(fd)
+            raise OSError(errno, f"inotify_add_watch failed for {self.path}")
+        
+        self.fd = fd
+        self._wake_r, self._wake_w = os.pipe()
+        self.is_running = True
+        self.thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop watching"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        os.write(self._wake_w, b'x')
+        if self.thread:
+            self.thread.join(timeout=1)
+        for fd in (self.fd, self._wake_r, self._wake_w):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+        self.fd = None
+    
+    def _watch_loop(self):
+        """Read inotify events and report completed files"""
+        while self.is_running:
+            try:
+                readable, _, _ = select.select([self.fd, self._wake_r], [], [])
+                if self.fd not in readable:
+                    continue
+                try:
+                    data = os.read(self.fd, 64 * 1024)
+                except BlockingIOError:
+                    continue
+                
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(data):
+                    _, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+                    offset += _EVENT_HEADER.size
+                    name = data[offset:offset + length].rstrip(b'\0').decode('utf-8', 'replace')
+                    offset += length
+                    if name and mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+                        self._notify(name)
+            except Exception as e:
+                if self.is_running:
+                    self.logger.error(f"inotify watcher error: {e}")
+    
+    def _notify(self, name: str):
+        try:
+            self.callback(name)
+        except Exception as e:
+            self.logger.error(f"File watcher callback error for {name}: {e}")
+
+class PollingWatcher:
+    """Fallback watcher that lists the directory every ``poll_interval`` seconds"""
+    name = 'polling'
+    
+    def __init__(self, path: str, callback: FileCallback, poll_interval: float = 0.1):
+        self.logger = logging.getLogger(__name__)
+        self.path = path
+        self.callback = callback
+        self.poll_interval = poll_interval
+        self.is_running = False
+        self.thread = None
+        self._stop_event = threading.Event()
+    
+    def start(self):
+        """Start watching the directory"""
+        if self.is_running:
+            return
+        self.is_running = True
+        self._stop_event.clear()
+        self.thread = threading.Thread(target=self._watch_loop, daemon=True)
+        self.thread.start()
+    
+    def stop(self):
+        """Stop watching"""
+        if not self.is_running:
+            return
+        self.is_running = False
+        self._stop_event.set()
+        if self.thread:
+            self.thread.join(timeout=1)
+    
+    def _watch_loop(self):
+        """Report file names that appeared since the previous scan"""
+        seen = set()
+        while self.is_running:
+            try:
+                current = set(os.listdir(self.path))
+                for name in current - seen:
+                    try:
+                        self.callback(name)
+                    except Exception as e:
+                        self.logger.error(f"File watcher callback error for {name}: {e}")
+                seen = current
+            except Exception as e:
+                self.logger.error(f"Polling watcher error: {e}")
+            self._stop_event.wait(self.poll_interval)
+
+def create_file_watcher(path: str, callback: FileCallback, use_inotify: bool = True,
+                        poll_interval: float = 0.1):
+    """Create an inotify watcher when available, otherwise a polling watcher"""
+    if use_inotify:
+        try:
+            return InotifyWatcher(path, callback)
+        except OSError as e:
+            logging.getLogger(__name__).info(f"inotify unavailable ({e}), falling back to polling")
+    return PollingWatcher(path, callback, poll_interval)
@@ -0,0 +1,226 @@
+"""
+MT5 History Store - Day-partitioned On-disk Bar Store with Memory-mapped Reads
+"""
+
+import os
+import time
+import shutil
+import logging
+import threading
+import numpy as np
+from datetime import datetime, timezone
+from typing import Dict, Any, Iterator, List, Optional, Tuple
+from src.modules.mt5_connector.bar_series import BarSeries
+
+DAY_SECONDS = 86400
+
+class HistoryStore:
+    """OHLCV bars persisted as one ``.npy`` file per symbol/timeframe/UTC day.
+    
+    Files live at ``root/SYMBOL/TIMEFRAME/YYYY-MM-DD.npy`` and hold the
+    BarSeries ``(6, n)`` float64 block sorted by timestamp, so a day is
+    memory-mapped straight back into a BarSeries without parsing or copying.
+    Days older than ``retention_days`` are deleted (0 keeps everything).
+    """
+    
+    SUFFIX = '.npy'
+    
+    def __init__(self, root: str, retention_days: int = 30, retention_check_interval: float = 3600):
+        self.logger = logging.getLogger(__name__)
+        self.root = root
+        self.retention_days = retention_days
+        self.retention_check_interval = retention_check_interval
+        self._last_retention_check = 0.0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+    
+    def _dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, symbol.upper(), timeframe.upper())
+    
+    @staticmethod
+    def _day_name(day: int) -> str:
+        return datetime.fromtimestamp(day * DAY_SECONDS, tz=timezone.utc).strftime('%Y-%m-%d')
+    
+    @staticmethod
+    def _parse_day(filename: str) -> Optional[int]:
+        try:
+            date = datetime.strptime(filename[:-len(HistoryStore.SUFFIX)], '%Y-%m-%d')
+        except ValueError:
+            return None
+        return int(date.replace(tzinfo=timezone.utc).timestamp()) // DAY_SECONDS
+    
+    def _days(self, symbol: str, timeframe: str) -> List[Tuple[int, str]]:
+        """Stored ``(day, path)`` partitions, oldest first"""
+        directory = self._dir(symbol, timeframe)
+        if not os.path.isdir(directory):
+            return []
+        days = []
+        for filename in os.listdir(directory):
+            day = self._parse_day(filename) if filename.endswith(self.SUFFIX) else None
+            if day is not None:
+                days.append((day, os.path.join(directory, filename)))
+        return sorted(days)
+    
+    def _load_day(self, day: int, path: str) -> np.ndarray:
+        # Past days are no longer written to and are memory-mapped; today's
+        # partition is read into memory so the writer can still replace it
+        # (an open mapping blocks the rename on Windows)
+        if day < int(time.time() // DAY_SECONDS):
+            return np.load(path, mmap_mode='r')
+        return np.load(path)
+    
+    def write(self, series: BarSeries) -> int:
+        """Merge bars into their day partitions; returns the number of bars written
+        
+        Bars replace stored bars with the same timestamp, so re-sending the
+        still forming last bar updates it in place. Each partition is
+        rewritten to a temporary file and renamed over the old one, so
+        readers never see a half-written day.
+        """
+        if not len(series):
+            return 0
+        if not series.symbol or not series.timeframe:
+            raise ValueError("Bar series needs a symbol and timeframe to be stored")
+        
+        directory = self._dir(series.symbol, series.timeframe)
+        days = (series.timestamp // DAY_SECONDS).astype(np.int64)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            for day in np.unique(days):
+                path = os.path.join(directory, self._day_name(int(day)) + self.SUFFIX)
+                data = series.data[:, days == day]
+                if os.path.exists(path):
+                    data = np.concatenate([np.load(path), data], axis=1)
+                # Keep the last occurrence of each timestamp, i.e. the incoming bar
+                _, reverse_index = np.unique(data[0, ::-1], return_index=True)
+                data = np.ascontiguousarray(data[:, data.shape[1] - 1 - reverse_index])
+                
+                tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'wb') as f:
+                    np.save(f, data)
+                os.replace(tmp_path, path)
+        
+        self._maybe_enforce_retention()
+        return len(series)
+    
+    def write_response(self, response: Dict[str, Any], symbol: str = "", timeframe: str = "") -> int:
+        """Store a market data response in either columnar or bar format"""
+        series = BarSeries.from_response(response)
+        series.symbol = series.symbol or symbol
+        series.timeframe = series.timeframe or timeframe
+        return self.write(series)
+    
+    def iter_days(self, symbol: str, timeframe: str, start: float = None,
+                  end: float = None) -> Iterator[BarSeries]:
+        """Yield the stored bars in ``[start, end]`` one day partition at a time
+        
+        Completed days are zero-copy views on their memory-mapped files, so
+        years of M1 bars can be scanned without loading them into memory.
+        """
+        first_day = None if start is None else int(start // DAY_SECONDS)
+        last_day = None if end is None else int(end // DAY_SECONDS)
+        for day, path in self._days(symbol, timeframe):
+            if (first_day is not None and day < first_day) or (last_day is not None and day > last_day):
+                continue
+            try:
+                data = self._load_day(day, path)
+            except (OSError, ValueError) as e:
+                self.logger.error(f"Skipping unreadable history file {path}: {e}")
+                continue
+            
+            timestamps = data[0]
+            lo = 0 if start is None else int(np.searchsorted(timestamps, start, side='left'))
+            hi = len(timestamps) if end is None else int(np.searchsorted(timestamps, end, side='right'))
+            if hi > lo:
+                yield BarSeries(data[:, lo:hi], symbol.upper(), timeframe.upper())
+    
+    def read(self, symbol: str, timeframe: str, start: float = None, end: float = None) -> BarSeries:
+        """Bars with ``start <= timestamp <= end`` as one BarSeries
+        
+        A range within a single completed day is returned as a memory-mapped
+        view; longer ranges are gathered into one in-memory block.
+        """
+        parts = list(self.iter_days(symbol, timeframe, start, end))
+        if len(parts) == 1:
+            return parts[0]
+        data = np.concatenate([part.data for part in parts], axis=1) if parts else None
+        return BarSeries(data, symbol.upper(), timeframe.upper())
+    
+    def read_latest(self, symbol: str, timeframe: str, count: int) -> BarSeries:
+        """The newest ``count`` stored bars"""
+        parts = []
+        remaining = count
+        for day, path in reversed(self._days(symbol, timeframe)):
+            if remaining <= 0:
+                break
+            data = self._load_day(day, path)
+            parts.append(data[:, -remaining:])
+            remaining -= data.shape[1]
+        data = np.concatenate(parts[::-1], axis=1) if parts else None
+        return BarSeries(data, symbol.upper(), timeframe.upper())
+    
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[float]:
+        """Timestamp of the newest stored bar"""
+        days = self._days(symbol, timeframe)
+        if not days:
+            return None
+        data = self._load_day(*days[-1])
+        return float(data[0, -1]) if data.shape[1] else None
+    
+    def enforce_retention(self, now: float = None) -> int:
+        """Delete day partitions older than the retention window; returns files removed"""
+        self._last_retention_check = time.monotonic()
+        if not self.retention_days:
+            return 0
+        
+        cutoff_day = int((now if now is not None else time.time()) // DAY_SECONDS) - self.retention_days
+        removed = 0
+        with self._lock:
+            for symbol in self.get_symbols():
+                for timeframe in self.get_timeframes(symbol):
+                    for day, path in self._days(symbol, timeframe):
+                        if day >= cutoff_day:
+                            break
+                        os.remove(path)
+                        removed += 1
+        if removed:
+            self.logger.info(f"Removed {removed} history files older than {self.retention_days} days")
+        return removed
+    
+    def _maybe_enforce_retention(self):
+        if time.monotonic() - self._last_retention_check >= self.retention_check_interval:
+            try:
+                self.enforce_retention()
+            except OSError as e:
+                self.logger.error(f"Error enforcing history retention: {e}")
+    
+    def get_symbols(self) -> List[str]:
+        return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+    
+    def get_timeframes(self, symbol: str) -> List[str]:
+        directory = os.path.join(self.root, symbol.upper())
+        if not os.path.isdir(directory):
+            return []
+        return sorted(name for name in os.listdir(directory) if os.path.isdir(os.path.join(directory, name)))
+    
+    def clear(self, symbol: str = None, timeframe: str = None):
+        """Delete stored bars for one symbol/timeframe, one symbol or everything"""
+        with self._lock:
+            if symbol is None:
+                targets = [os.path.join(self.root, name) for name in self.get_symbols()]
+            elif timeframe is None:
+                targets = [os.path.join(self.root, symbol.upper())]
+            else:
+                targets = [self._dir(symbol, timeframe)]
+            for target in targets:
+                shutil.rmtree(target, ignore_errors=True)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        files = 0
+        size = 0
+        for symbol in self.get_symbols():
+            for timeframe in self.get_timeframes(symbol):
+                for _, path in self._days(symbol, timeframe):
+                    files += 1
+                    size += os.path.getsize(path)
+        return {'root': self.root, 'files': files, 'bytes': size, 'retention_days': self.retention_days}
@@ -0,0 +1,151 @@
+"""
+MT5 Message Codecs - Wire Formats for Bridge Messages
+"""
+
+import json
+import struct
+from typing import Dict, Any, List
+
+try:
+    import msgpack
+except ImportError:  # optional dependency
+    msgpack = None
+
+class CodecError(Exception):
+    """Raised when a message cannot be encoded or decoded."""
+    pass
+
+class JSONCodec:
+    """Plain JSON, understood by every MT5 bridge peer"""
+    name = 'json'
+    binary = False
+    
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        return json.dumps(message, separators=(',', ':')).encode('utf-8')
+    
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return json.loads(payload)
+
+class MsgPackCodec:
+    """MessagePack binary encoding (requires the msgpack package)"""
+    name = 'msgpack'
+    binary = True
+    
+    def __init__(self):
+        if msgpack is None:
+            raise CodecError("msgpack is not installed")
+    
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        return msgpack.packb(message, use_bin_type=True)
+    
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        return msgpack.unpackb(payload, raw=False)
+
+class StructCodec:
+    """Fixed-layout encoding for tick and bar payloads.
+    
+    ``bars`` and ``ticks`` lists are packed as little-endian float64
+    records; the remaining fields travel as a small MessagePack (or JSON)
+    header. Frame layout::
+        
+        b'S' | uint32 header length | header | per array: uint32 count | records
+    """
+    name = 'struct'
+    binary = True
+    
+    TAG = b'S'
+    ARRAY_FIELDS = {
+        'bars': ('timestamp', 'open', 'high', 'low', 'close', 'volume'),
+        'ticks': ('time', 'bid', 'ask', 'last', 'volume'),
+    }
+    _UINT32 = struct.Struct('<I')
+    
+    def __init__(self):
+        self.header_codec = MsgPackCodec() if msgpack is not None else JSONCodec()
+        self._records = {key: struct.Struct('<' + 'd' * len(fields))
+                         for key, fields in self.ARRAY_FIELDS.items()}
+    
+    def encode(self, message: Dict[str, Any]) -> bytes:
+        header = dict(message)
+        arrays = [key for key in self.ARRAY_FIELDS if isinstance(header.get(key), list)]
+        for key in arrays:
+            header.pop(key)
+        header['__arrays__'] = arrays
+        
+        header_bytes = self.header_codec.encode(header)
+        parts = [self.TAG, self._UINT32.pack(len(header_bytes)), header_bytes]
+        for key in arrays:
+            fields = self.ARRAY_FIELDS[key]
+            record = self._records[key]
+            items = message[key]
+            try:
+                parts.append(self._UINT32.pack(len(items)))
+                parts.extend(record.pack(*(float(item.get(f, 0.0)) for f in fields)) for item in items)
+            except (TypeError, ValueError, AttributeError) as e:
+                raise CodecError(f"Cannot pack '{key}' records: {e}") from e
+        return b''.join(parts)
+    
+    def decode(self, payload: bytes) -> Dict[str, Any]:
+        view = memoryview(payload)
+        if view[:1] != self.TAG:
+            raise CodecError("Not a struct-encoded frame")
+        
+        header_length, = self._UINT32.unpack_from(view, 1)
+        offset = 1 + self._UINT32.size
+        message = self.header_codec.decode(bytes(view[offset:offset + header_length]))
+        offset += header_length
+        
+        for key in message.pop('__arrays__', []):
+            fields = self.ARRAY_FIELDS[key]
+            record = self._records[key]
+            count, = self._UINT32.unpack_from(view, offset)
+            offset += self._UINT32.size
+            end = offset + count * record.size
+            message[key] = [dict(zip(fields, values)) for values in record.iter_unpack(view[offset:end])]
+            offset = end
+        return message
+
+CODECS = {
+    JSONCodec.name: JSONCodec,
+    MsgPackCodec.name: MsgPackCodec,
+    StructCodec.name: StructCodec,
+}
+
+def register_codec(codec_class):
+    """Register an additional codec class by its ``name``"""
+    CODECS[codec_class.name] = codec_class
+    return codec_class
+
+def available_codecs() -> List[str]:
+    """Names of codecs usable in this environment"""
+    names = []
+    for name, codec_class in CODECS.items():
+        try:
+            codec_class()
+            names.append(name)
+        except CodecError:
+            continue
+    return names
+
+def get_codec(name: str):
+    """Instantiate a codec by name"""
+    if name not in CODECS:
+        raise CodecError(f"Unknown codec: {name}")
+    return CODECS[name]()
+
+def select_codec(offered: List[str], supported: List[str] = None) -> str:
+    """Pick the first offered codec that is also supported, defaulting to JSON"""
+    supported = supported if supported is not None else available_codecs()
+    for name in offered or []:
+        if name in supported:
+            return name
+    return JSONCodec.name
+
+def detect_codec(payload: bytes):
+    """Guess the codec of an incoming frame from its first byte"""
+    first = payload[:1]
+    if first in (b'{', b'['):
+        return get_codec(JSONCodec.name)
+    if first == StructCodec.TAG:
+        return get_codec(StructCodec.name)
+    return get_codec(MsgPackCodec.name)
@@ -3,90 +3,205 @@ MT5 Manager - Optimal Implementation with Multiple Communication Methods
 """
 
 import os
+import json
 import time
 import psutil
 import logging
 import platform
+import threading
 import subprocess
-from typing import Dict, Any, List, Optional
-from src.modules.mt5_connector.zmq_bridge import MT5ZMQBridge  # Best option
-from src.modules.mt5_connector.api_client import MT5APIClient  # Fallback
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+from src.modules.mt5_connector.zmq_bridge import MT5ZMQBridge
+from src.modules.mt5_connector.api_client import MT5APIClient, MT5APIError
+from src.modules.mt5_connector.socket_bridge import MT5SocketBridge
+from src.modules.mt5_connector.bridge_manager import MT5BridgeManager
+from src.modules.mt5_connector.shm_bridge import MT5SharedMemoryBridge
+from src.modules.mt5_connector.transport_health import TransportHealth
+from src.modules.mt5_connector.ttl_cache import TTLCache
+from src.modules.mt5_connector.single_flight import SingleFlight
+from src.modules.mt5_connector.bar_series import BarSeries
+from src.modules.mt5_connector.history_store import HistoryStore
+from src.modules.mt5_connector.transports import (
+    Transport, TransportError, ZMQTransport, RESTTransport, SocketTransport, FileTransport,
+    SharedMemoryTransport, is_transport_failure, probe_transport, probe_transports, select_fastest,
+    transport_failure
+)
+
+# Relative paths in the config are taken from the project directory, not the working directory
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Transports considered by the startup probe
+TRANSPORT_METHODS = ('shm', 'socket', 'zmq', 'api', 'bridge')
+
+# Bridge command -> REST endpoint; {ticket} is taken from the request data
+API_ROUTES = {
+    'ping': ('GET', '/api/v1/ping'),
+    'get_status': ('GET', '/api/v1/status'),
+    'get_account_info': ('GET', '/api/v1/account'),
+    'get_market_data': ('GET', '/api/v1/market/data'),
+    'get_symbol_info': ('GET', '/api/v1/market/symbol'),
+    'get_symbols': ('GET', '/api/v1/market/symbols'),
+    'place_order': ('POST', '/api/v1/trade/order'),
+    'get_positions': ('GET', '/api/v1/trade/positions'),
+    'get_position': ('GET', '/api/v1/trade/position/{ticket}'),
+    'close_position': ('DELETE', '/api/v1/trade/position/{ticket}'),
+    'close_positions': ('POST', '/api/v1/trade/positions/close'),
+    'get_orders': ('GET', '/api/v1/trade/orders'),
+    'cancel_order': ('DELETE', '/api/v1/trade/order/{ticket}'),
+    'cancel_orders': ('POST', '/api/v1/trade/orders/cancel'),
+    'get_history_deals': ('GET', '/api/v1/history/deals'),
+    'get_history_orders': ('GET', '/api/v1/history/orders')
+}
+
+# Read-only commands, safe to resend on another transport after a failure
+IDEMPOTENT_COMMANDS = frozenset(command for command, (method, _) in API_ROUTES.items() if method == 'GET')
 
 class MT5Manager:
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, data_config: Dict = None):
+        """``config`` is the ``mt5`` config section, ``data_config`` the ``data`` one"""
         self.logger = logging.getLogger(__name__)
         self.config = config or {}
+        self.data_config = data_config or {}
         self.is_initialized = False
         self.mt5_executable = self._get_mt5_executable_path()
         
-        # Communication priority: ZMQ > API > Bridge
+        # Every reachable transport is benchmarked and the fastest one carries requests
         self.communication_method = None
+        self.transport: Optional[Transport] = None
+        self.transports: Dict[str, Transport] = {}
+        self.transport_metrics: Dict[str, Dict[str, Any]] = {}
+        self.transport_methods = TRANSPORT_METHODS
+        self.last_probe = None
+        self.probe_timeout = self.config.get('transport_probe_timeout', 2.0)
+        self.reprobe_interval = self.config.get('transport_reprobe_interval', 300)
+        self._probe_lock = threading.Lock()
+        self._reprobe_lock = threading.Lock()
+        self._reprobe_thread = None
+        self.request_timeout = self.config.get('request_timeout', 30)
+        self.transport_health: Dict[str, TransportHealth] = {}
+        self._health_lock = threading.Lock()
         self.zmq_bridge = None
         self.api_client = None
         
+        # Short-lived copies of account and symbol reads, dropped when a trade changes them
+        self.cache = TTLCache(capacity=self.config.get('cache_size', 256), ttls=self.config.get('cache_ttls'))
+        
+        # Concurrent identical reads share one in-flight request
+        self.coalesce_requests = self.config.get('coalesce_requests', True)
+        self.single_flight = SingleFlight()
+        
+        # Downloaded bars are written through to disk so restarts and backtests read them locally
+        history_path = self.data_config.get('history_path')
+        self.history_store = HistoryStore(str(PROJECT_ROOT / history_path),
+                                          self.data_config.get('market_data_retention', 30)) \
+            if history_path else None
+        
         # Initialize based on configuration
         self._initialize_communication()
     
     def _initialize_communication(self):
-        """Initialize communication method based on availability"""
-        # Try ZMQ first (best performance)
-        if self._try_zmq():
-            self.communication_method = 'zmq'
-            return
-            
-        # Try REST API as fallback
-        if self._try_api():
-            self.communication_method = 'api'
-            return
-            
-        # If neither works, we can't communicate
-        self.logger.error("No communication method available")
+        """Use the configured transport, or the fastest one that answers"""
+        method = self.config.get('communication_method', 'auto')
+        if method in TRANSPORT_METHODS:
+            self.transport_methods = (method,)
+            self.probe_communication()
+            if self.communication_method:
+                return
+            self.logger.warning(f"Configured communication method '{method}' not available, probing all")
+        elif method != 'auto':
+            self.logger.warning(f"Unknown communication method '{method}', probing all")
+        
+        self.transport_methods = TRANSPORT_METHODS
+        self.probe_communication()
+        if not self.communication_method:
+            self.logger.error("No communication method available")
     
-    def _try_zmq(self) -> bool:
-        """Try to initialize ZMQ communication"""
-        try:
-            port = self.config.get('zmq_port', 5555)
-            host = self.config.get('zmq_host', 'localhost')
+    def _create_transport(self, method: str) -> Transport:
+        """Build the client for one transport from the configuration"""
+        if method == 'zmq':
+            client = MT5ZMQBridge(port=self.config.get('zmq_port', 5555),
+                                  host=self.config.get('zmq_host', 'localhost'),
+                                  preferred_codecs=self.config.get('zmq_codecs'))
+            return ZMQTransport(client, pipelined=self.config.get('zmq_pipelined', False))
+        if method == 'api':
+            self.api_client = MT5APIClient(base_url=self.config.get('api_base_url', 'http://localhost:8082'),
+                                           cache_ttls=self.config.get('cache_ttls'),
+                                           cache_size=self.config.get('cache_size', 256))
+            if self.config.get('api_key'):
+                self.api_client.set_api_key(self.config['api_key'])
+            return RESTTransport(self.api_client, self._map_command_to_api)
+        if method == 'socket':
+            return SocketTransport(MT5SocketBridge(self.config.get('socket_path') or None))
+        if method == 'bridge':
+            return FileTransport(MT5BridgeManager(self.config.get('bridge_path') or None,
+                                                  batch_mode=self.config.get('bridge_batch_mode', False),
+                                                  flush_interval=self.config.get('bridge_flush_interval', 0.01)))
+        if method == 'shm':
+            return SharedMemoryTransport(MT5SharedMemoryBridge(self.config.get('bridge_path') or None))
+        raise ValueError(f"Unknown communication method: {method}")
+    
+    def probe_communication(self) -> Dict[str, Dict[str, Any]]:
+        """Benchmark transports against the live peer and switch to the fastest
+        
+        Connected transports are re-measured in place; the rest of
+        ``transport_methods`` get a fresh connection attempt.
+        """
+        with self._probe_lock:
+            metrics = {}
+            live = []
+            for name, transport in self.transports.items():
+                metrics[name] = probe_transport(transport, self.probe_timeout, connect=False)
+                if metrics[name]['available']:
+                    live.append(transport)
+                else:
+                    transport.close()
             
-            self.zmq_bridge = MT5ZMQBridge(port=port, host=host)
-            self.zmq_bridge.connect_client()
+            candidates = []
+            for method in self.transport_methods:
+                if method in metrics:
+                    continue
+                try:
+                    candidates.append(self._create_transport(method))
+                except Exception as e:
+                    self.logger.debug(f"Transport {method} not available: {e}")
+                    metrics[method] = {'name': method, 'available': False, 'latency_ms': None,
+                                       'throughput_rps': None, 'error': str(e), 'probed_at': time.time()}
             
-            # Test connection
-            test_response = self.zmq_bridge.send_request('ping', timeout=50000)
-            if test_response.get('success', False):
-                self.logger.info("ZMQ communication established")
-                return True
-            else:
-                self.zmq_bridge.close()
-                self.zmq_bridge = None
-                return False
-                
-        except Exception as e:
-            self.logger.debug(f"ZMQ not available: {e}")
-            if self.zmq_bridge:
-                self.zmq_bridge.close()
-                self.zmq_bridge = None
-            return False
+            connected, probed = probe_transports(candidates, self.probe_timeout)
+            metrics.update(probed)
+            self._use_transports(live + connected, metrics)
+            return metrics
     
-    def _try_api(self) -> bool:
-        """Try to initialize REST API communication"""
-        try:
-            api_base_url = self.config.get('api_base_url', 'http://localhost:8082')
-            self.api_client = MT5APIClient(base_url=api_base_url)
-            
-            # Test connection
-            status = self.api_client.get_server_status()
-            if status.get('status') == 'connected':
-                self.logger.info("REST API communication established")
-                return True
-            else:
-                self.api_client = None
-                return False
-                
-        except Exception as e:
-            self.logger.debug(f"REST API not available: {e}")
-            self.api_client = None
-            return False
+    def _use_transports(self, transports: List[Transport], metrics: Dict[str, Dict[str, Any]]):
+        self.transports = {transport.name: transport for transport in transports}
+        self.transport_metrics = metrics
+        self.last_probe = time.time()
+        
+        fastest = select_fastest({name: metrics[name] for name in self.transports})
+        if fastest != self.communication_method:
+            if fastest:
+                summary = ', '.join(f"{m['name']}={m['latency_ms']}ms" for m in metrics.values() if m['available'])
+                self.logger.info(f"Using {fastest} communication ({summary})")
+            elif self.communication_method:
+                self.logger.error(f"{self.communication_method} communication lost and no other transport answered")
+        self.communication_method = fastest
+        self.transport = self.transports.get(fastest)
+        
+        zmq = self.transports.get('zmq')
+        self.zmq_bridge = zmq.client if zmq else None
+    
+    def _schedule_reprobe(self, force: bool = False):
+        """Re-run the transport benchmark in the background once it is due"""
+        if not force and (not self.reprobe_interval
+                          or time.time() - (self.last_probe or 0) < self.reprobe_interval):
+            return
+        with self._reprobe_lock:
+            if self._reprobe_thread and self._reprobe_thread.is_alive():
+                return
+            self._reprobe_thread = threading.Thread(target=self.probe_communication, name='mt5-reprobe',
+                                                    daemon=True)
+            self._reprobe_thread.start()
     
     def _get_mt5_executable_path(self) -> str:
         """Get MT5 executable path"""
@@ -182,39 +297,231 @@ class MT5Manager:
             self.logger.error(f"Connection verification failed: {e}")
             return False
     
-    def _send_request(self, command: str, data: Dict[str, Any] = None) -> Dict[str, Any]:
-        """Send request using the best available method"""
+    def _health(self, name: str) -> TransportHealth:
+        with self._health_lock:
+            if name not in self.transport_health:
+                self.transport_health[name] = TransportHealth(
+                    name, failure_threshold=self.config.get('transport_failure_threshold', 5),
+                    reset_timeout=self.config.get('transport_reset_timeout', 30.0))
+            return self.transport_health[name]
+    
+    def _route(self, exclude: str = None) -> List[Transport]:
+        """Selected transport first, then the other live ones by measured latency"""
+        primary, transports, metrics = self.transport, self.transports, self.transport_metrics
+        others = sorted((t for t in transports.values() if t is not primary),
+                        key=lambda t: metrics.get(t.name, {}).get('latency_ms') or float('inf'))
+        route = ([primary] if primary else []) + others
+        return [t for t in route if t.name != exclude]
+    
+    def _record_failure(self, health: TransportHealth, error: str):
+        if health.record_failure(error):
+            self.logger.error(f"{health.name} circuit opened after "
+                              f"{health.breaker.consecutive_failures} failures: {error}")
+            self._schedule_reprobe(force=True)
+    
+    def _send_request(self, command: str, data: Dict[str, Any] = None, timeout: float = None) -> Dict[str, Any]:
+        """Send request, joining an identical read that is already in flight
+        
+        Callers that join get their own shallow copy of the shared response.
+        """
+        if not self.coalesce_requests or command not in IDEMPOTENT_COMMANDS:
+            return self._dispatch_request(command, data, timeout)
+        
+        key = (command, json.dumps(data or {}, sort_keys=True, default=str))
+        response, shared = self.single_flight.do(key, lambda: self._dispatch_request(command, data, timeout))
+        return dict(response) if shared else response
+    
+    def _dispatch_request(self, command: str, data: Dict[str, Any] = None, timeout: float = None,
+                          exclude: str = None) -> Dict[str, Any]:
+        """Send request over the selected transport, failing over when it is unhealthy
+        
+        Transports whose circuit is open are skipped, so any command moves
+        to the next healthy transport before it is sent. Once a transport
+        has failed mid-request only idempotent commands are resent elsewhere.
+        """
         if not self.is_initialized:
             return {'error': 'MT5 not initialized', 'success': False}
         
+        timeout = self.request_timeout if timeout is None else timeout
+        self._schedule_reprobe()
+        route = self._route(exclude)
+        if not route:
+            return {'error': 'No communication method available', 'success': False}
+        
+        error = 'All transports unavailable (circuit open)'
+        failed = None
+        for transport in route:
+            health = self._health(transport.name)
+            if not health.allow_request():
+                continue
+            if failed:
+                failed.record_failover()
+                self.logger.warning(f"Retrying {command} over {transport.name} after {failed.name} failed: {error}")
+            
+            start = time.perf_counter()
+            try:
+                response = transport.send(command, data, timeout)
+            except TransportError as e:
+                error = str(e)
+                self._record_failure(health, error)
+                if command not in IDEMPOTENT_COMMANDS:
+                    break
+                failed = health
+                continue
+            health.record_success(time.perf_counter() - start)
+            return response
+        
+        self.logger.error(f"Error sending request {command}: {error}")
+        return {'error': error, 'success': False}
+    
+    def _send_requests(self, requests: List[Tuple[str, Dict[str, Any]]],
+                       timeout: float = None) -> List[Dict[str, Any]]:
+        """Send several requests, concurrently when the transport pipelines
+        
+        Idempotent requests the transport failed to complete are resent
+        individually over the remaining transports.
+        """
+        if not self.is_initialized:
+            return [{'error': 'MT5 not initialized', 'success': False} for _ in requests]
+        
+        timeout = self.request_timeout if timeout is None else timeout
+        self._schedule_reprobe()
+        transport = next((t for t in self._route() if self._health(t.name).allow_request()), None)
+        if not transport:
+            return [{'error': 'No communication method available', 'success': False} for _ in requests]
+        
+        health = self._health(transport.name)
+        start = time.perf_counter()
         try:
-            if self.communication_method == 'zmq' and self.zmq_bridge:
-                return self.zmq_bridge.send_request(command, data)
-            elif self.communication_method == 'api' and self.api_client:
-                # Map commands to API calls
-                return self._map_command_to_api(command, data)
-            else:
-                return {'error': 'No communication method available', 'success': False}
+            results = transport.send_many(requests, timeout)
         except Exception as e:
-            self.logger.error(f"Error sending request: {e}")
-            return {'error': str(e), 'success': False}
+            self.logger.error(f"Error sending requests: {e}")
+            results = [transport_failure(str(e)) for _ in requests]
+        
+        failed = [i for i, result in enumerate(results) if is_transport_failure(result)]
+        if len(failed) < len(results):
+            health.record_success(time.perf_counter() - start)
+        if failed:
+            self._record_failure(health, results[failed[0]].get('error') or 'Invalid response')
+        
+        for i in failed:
+            command, data = requests[i]
+            if command in IDEMPOTENT_COMMANDS:
+                health.record_failover()
+                results[i] = self._dispatch_request(command, data, timeout, exclude=transport.name)
+        return results
     
     def _map_command_to_api(self, command: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Map internal commands to REST API calls"""
-        # This would map our internal command structure to the REST API
-        # Implementation depends on the specific REST API being used
-        pass
+        """Map internal commands to REST API calls
+        
+        Connection failures and server errors raise TransportError so the
+        request can fail over; rejections come back as error dicts.
+        """
+        if command not in API_ROUTES:
+            return {'error': f"Command not supported over REST API: {command}", 'success': False,
+                    'command': command}
+        
+        method, endpoint = API_ROUTES[command]
+        data = {key: value for key, value in (data or {}).items() if value is not None}
+        if '{ticket}' in endpoint:
+            endpoint = endpoint.format(ticket=int(data.pop('ticket')))
+        for key in ('symbol', 'timeframe', 'type'):
+            if isinstance(data.get(key), str):
+                data[key] = data[key].upper()
+        
+        try:
+            if method == 'GET':
+                response = self.api_client.request(method, endpoint, params=data)
+            elif method == 'POST':
+                response = self.api_client.request(method, endpoint, json=data)
+            else:
+                response = self.api_client.request(method, endpoint)
+        except MT5APIError as e:
+            if e.status_code is None or e.status_code >= 500:
+                raise TransportError(str(e)) from e
+            return {'error': str(e), 'success': False, 'status_code': e.status_code}
+        
+        if not isinstance(response, dict):
+            response = {'result': response}
+        if command == 'ping':
+            response['success'] = response.get('status') == 'ok'
+        response.setdefault('success', True)
+        return response
+    
+    def get_system_info(self) -> Dict[str, Any]:
+        """MT5 process state and the measured performance of each transport"""
+        return {
+            'mt5_executable': self.mt5_executable,
+            'is_initialized': self.is_initialized,
+            'mt5_process_running': self._is_mt5_running(),
+            'communication_method': self.communication_method,
+            'transports': dict(self.transport_metrics),
+            'transport_health': {name: health.snapshot() for name, health in self.transport_health.items()},
+            'coalesced_requests': self.single_flight.get_stats(),
+            'history': self.history_store.get_stats() if self.history_store else None,
+            'last_probe': self.last_probe
+        }
     
     # Public methods (same interface regardless of communication method)
     def get_server_status(self) -> Dict[str, Any]:
         return self._send_request('get_status')
     
-    def get_account_info(self) -> Dict[str, Any]:
-        return self._send_request('get_account_info')
+    def _cached_request(self, namespace: str, key, command: str, data: Dict[str, Any] = None,
+                        refresh: bool = False) -> Dict[str, Any]:
+        """Read-through cache in front of ``_send_request``; failed responses are not cached"""
+        if refresh:
+            self.cache.invalidate(namespace, key)
+        return dict(self.cache.get_or_load(namespace, key, lambda: self._send_request(command, data),
+                                           cacheable=lambda response: response.get('success') is not False))
+    
+    def get_account_info(self, refresh: bool = False) -> Dict[str, Any]:
+        return self._cached_request('account', None, 'get_account_info', refresh=refresh)
+    
+    def get_account_balance(self) -> float:
+        return float(self.get_account_info().get('balance', 0))
+    
+    def get_account_equity(self) -> float:
+        return float(self.get_account_info().get('equity', 0))
+    
+    def get_symbol_info(self, symbol: str, refresh: bool = False) -> Dict[str, Any]:
+        return self._cached_request('symbol_info', symbol.upper(), 'get_symbol_info',
+                                    {'symbol': symbol.upper()}, refresh)
+    
+    def get_available_symbols(self, refresh: bool = False) -> List[str]:
+        return self._cached_request('symbols', None, 'get_symbols', refresh=refresh).get('symbols', [])
     
     def get_market_data(self, symbol: str, timeframe: str = "M1", count: int = 100) -> Dict[str, Any]:
         data = {'symbol': symbol, 'timeframe': timeframe, 'count': count}
-        return self._send_request('get_market_data', data)
+        response = self._send_request('get_market_data', data)
+        self._store_history(response, symbol, timeframe)
+        return response
+    
+    def get_market_data_many(self, symbols: List[str], timeframe: str = "M1",
+                             count: int = 100) -> Dict[str, Dict[str, Any]]:
+        """Get market data for several symbols, keyed by symbol"""
+        requests = [('get_market_data', {'symbol': symbol, 'timeframe': timeframe, 'count': count})
+                    for symbol in symbols]
+        results = dict(zip(symbols, self._send_requests(requests)))
+        for symbol, response in results.items():
+            self._store_history(response, symbol, timeframe)
+        return results
+    
+    def _store_history(self, response: Dict[str, Any], symbol: str, timeframe: str):
+        if not self.history_store or response.get('success') is False:
+            return
+        if 'bars' not in response and 'columns' not in response:
+            return
+        try:
+            self.history_store.write_response(response, symbol.upper(), timeframe.upper())
+        except Exception as e:
+            self.logger.error(f"Error storing history for {symbol} {timeframe}: {e}")
+    
+    def get_history(self, symbol: str, timeframe: str = "M1", start: float = None,
+                    end: float = None) -> BarSeries:
+        """Stored bars with ``start <= timestamp <= end`` from the local history store"""
+        if not self.history_store:
+            return BarSeries(symbol=symbol.upper(), timeframe=timeframe.upper())
+        return self.history_store.read(symbol, timeframe, start, end)
     
     def place_order(self, symbol: str, order_type: str, volume: float, price: float = None,
                    sl: float = None, tp: float = None, comment: str = "") -> Dict[str, Any]:
@@ -222,21 +529,48 @@ class MT5Manager:
             'symbol': symbol, 'type': order_type, 'volume': volume,
             'price': price, 'sl': sl, 'tp': tp, 'comment': comment
         }
-        return self._send_request('place_order', data)
+        try:
+            return self._send_request('place_order', data)
+        finally:
+            self.cache.invalidate('account')
     
     def get_positions(self) -> List[Dict[str, Any]]:
         response = self._send_request('get_positions')
         return response.get('positions', [])
     
     def close_position(self, ticket: int) -> Dict[str, Any]:
-        return self._send_request('close_position', {'ticket': ticket})
+        try:
+            return self._send_request('close_position', {'ticket': ticket})
+        finally:
+            self.cache.invalidate('account')
+    
+    def subscribe_market_data(self, symbols: List[str], callback, timeframes: List[str] = None) -> bool:
+        """Stream ticks (and closed bars for ``timeframes``) instead of polling
+        
+        Only available over ZMQ; ``callback(topic, message)`` is invoked for
+        every published update.
+        """
+        if not self.zmq_bridge:
+            self.logger.error("Market data streaming requires ZMQ communication")
+            return False
+        
+        self.zmq_bridge.subscribe(symbols, callback, ['TICK'] + list(timeframes or []),
+                                  pub_port=self.config.get('zmq_pub_port'))
+        return True
     
     def shutdown(self):
         """Shutdown gracefully"""
         try:
-            if self.zmq_bridge:
-                self.zmq_bridge.close()
             self.is_initialized = False
+            # Let a background re-probe finish so it does not race the close
+            if self._reprobe_thread:
+                self._reprobe_thread.join()
+            with self._probe_lock:
+                for transport in self.transports.values():
+                    transport.close()
+                self.transports = {}
+                self.transport = None
+                self.zmq_bridge = None
             self.logger.info("MT5 connection shut down")
         except Exception as e:
             self.logger.error(f"Error shutting down: {e}")
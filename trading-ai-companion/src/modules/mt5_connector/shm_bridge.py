@@ -0,0 +1,401 @@
+"""
+MT5 Shared Memory Bridge - mmap Ring Buffers for Same-host Communication
+"""
+
+import os
+import mmap
+import time
+import struct
+import logging
+import platform
+import itertools
+import threading
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+from src.modules.mt5_connector.message_codecs import (
+    CodecError, JSONCodec, StructCodec, detect_codec, get_codec
+)
+from src.modules.mt5_connector.transports import transport_failure
+
+MAGIC = b'MT5SHM01'
+VERSION = 1
+
+# magic, version, slots, slot_size, tick_slots, tick_slot_size (padded to 64 bytes)
+_FILE_HEADER = struct.Struct('<8sIIIII')
+_FILE_HEADER_SIZE = 64
+_UINT64 = struct.Struct('<Q')
+# Per-slot header: sequence number (0 = empty/being written), payload length
+_SLOT_HEADER = struct.Struct('<QI')
+
+# Callback signature for streamed ticks: (topic, message)
+TickCallback = Callable[[str, Dict[str, Any]], None]
+
+class ShmRing:
+    """Ring of fixed-size, sequence-numbered slots inside a shared buffer.
+    
+    Layout: a 64 byte header holding ``write_seq`` and ``read_seq`` followed
+    by ``slots`` slots of ``slot_size`` bytes. The producer writes the payload
+    and length first and publishes the slot by storing its sequence number
+    (``write_seq + 1``) last, so a consumer never sees a partial message.
+    """
+    HEADER_SIZE = 64
+    
+    def __init__(self, buffer, offset: int, slots: int, slot_size: int):
+        self.buffer = buffer
+        self.offset = offset
+        self.slots = slots
+        self.slot_size = slot_size
+        self.capacity = slot_size - _SLOT_HEADER.size
+    
+    @classmethod
+    def size(cls, slots: int, slot_size: int) -> int:
+        return cls.HEADER_SIZE + slots * slot_size
+    
+    @property
+    def write_seq(self) -> int:
+        return _UINT64.unpack_from(self.buffer, self.offset)[0]
+    
+    @property
+    def read_seq(self) -> int:
+        return _UINT64.unpack_from(self.buffer, self.offset + 8)[0]
+    
+    def _slot(self, seq: int) -> int:
+        return self.offset + self.HEADER_SIZE + (seq % self.slots) * self.slot_size
+    
+    def try_write(self, payload: bytes, overwrite: bool = False) -> bool:
+        """Append a message; returns False if the ring is full
+        
+        With ``overwrite`` the oldest slot is reused instead (broadcast rings).
+        """
+        length = len(payload)
+        if length > self.capacity:
+            raise ValueError(f"Message of {length} bytes exceeds slot capacity of {self.capacity}")
+        
+        seq = self.write_seq
+        if not overwrite and seq - self.read_seq >= self.slots:
+            return False
+        
+        pos = self._slot(seq)
+        _UINT64.pack_into(self.buffer, pos, 0)
+        start = pos + _SLOT_HEADER.size
+        self.buffer[start:start + length] = payload
+        _SLOT_HEADER.pack_into(self.buffer, pos, 0, length)
+        _UINT64.pack_into(self.buffer, pos, seq + 1)
+        _UINT64.pack_into(self.buffer, self.offset, seq + 1)
+        return True
+    
+    def try_read(self) -> Optional[bytes]:
+        """Consume the next message (single consumer), or None if empty"""
+        seq = self.read_seq
+        pos = self._slot(seq)
+        slot_seq, length = _SLOT_HEADER.unpack_from(self.buffer, pos)
+        if slot_seq != seq + 1:
+            return None
+        start = pos + _SLOT_HEADER.size
+        payload = bytes(self.buffer[start:start + length])
+        _UINT64.pack_into(self.buffer, self.offset + 8, seq + 1)
+        return payload
+    
+    def read_from(self, cursor: int) -> Tuple[Optional[bytes], int, int]:
+        """Read the message at ``cursor`` without consuming it (many readers)
+        
+        Returns ``(payload, next_cursor, dropped)``; ``dropped`` counts messages
+        overwritten before this reader got to them.
+        """
+        write_seq = self.write_seq
+        if cursor >= write_seq:
+            return None, cursor, 0
+        
+        dropped = 0
+        if write_seq - cursor > self.slots:
+            dropped = write_seq - self.slots - cursor
+            cursor = write_seq - self.slots
+        
+        pos = self._slot(cursor)
+        slot_seq, length = _SLOT_HEADER.unpack_from(self.buffer, pos)
+        start = pos + _SLOT_HEADER.size
+        payload = bytes(self.buffer[start:start + length])
+        
+        # The writer may have lapped us while copying
+        if slot_seq != cursor + 1 or _UINT64.unpack_from(self.buffer, pos)[0] != slot_seq:
+            return None, cursor + 1, dropped + 1
+        return payload, cursor + 1, dropped
+
+# Spinning only pays off when the peer runs on another core
+_SPIN = 1000 if (os.cpu_count() or 1) > 1 else 0
+_yield = getattr(os, 'sched_yield', lambda: time.sleep(0))
+
+def _wait_for(poll: Callable[[], Any], timeout: float, spin: int = _SPIN):
+    """Busy-poll briefly for microsecond wake-ups, then back off to short sleeps"""
+    deadline = time.monotonic() + timeout
+    for _ in range(spin):
+        result = poll()
+        if result is not None:
+            return result
+    # Yield the CPU for the first millisecond, then sleep between polls
+    yield_until = time.monotonic() + 0.001
+    while True:
+        result = poll()
+        if result is not None:
+            return result
+        now = time.monotonic()
+        if now >= deadline:
+            return None
+        if now < yield_until:
+            _yield()
+        else:
+            time.sleep(0.00005)
+
+class MT5SharedMemoryBridge:
+    """Request/response and tick transport over a memory-mapped file.
+    
+    The file (``<bridge_path>/mt5_shm.bin``) holds three rings: requests
+    (client to MT5), responses (MT5 to client) and ticks (MT5 broadcast).
+    The request and response rings have a single producer and consumer each;
+    concurrent callers in this process are serialized.
+    """
+    
+    def __init__(self, bridge_path: str = None, name: str = "mt5_shm.bin", slots: int = 64,
+                 slot_size: int = 65536, tick_slots: int = 4096, tick_slot_size: int = 256,
+                 codec: str = 'msgpack'):
+        self.logger = logging.getLogger(__name__)
+        self.bridge_path = bridge_path or self._get_default_bridge_path()
+        self.path = os.path.join(self.bridge_path, name)
+        self.slots = slots
+        self.slot_size = slot_size
+        self.tick_slots = tick_slots
+        self.tick_slot_size = tick_slot_size
+        
+        try:
+            self.codec = get_codec(codec)
+        except CodecError:
+            self.codec = JSONCodec()
+        self.tick_codec = StructCodec()
+        
+        self.buffer = None
+        self.requests = None
+        self.responses = None
+        self.ticks = None
+        self.is_server = False
+        self.is_connected = False
+        
+        self._request_ids = itertools.count(1)
+        self._request_lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        self._tick_cursor = 0
+        self.dropped_ticks = 0
+        
+        self._stop_event = threading.Event()
+        self._server_thread = None
+        self._subscriptions: List[Tuple[set, TickCallback]] = []
+        self._subscriptions_lock = threading.Lock()
+        self._stream_thread = None
+        self._stream_stop = threading.Event()
+    
+    def _get_default_bridge_path(self) -> str:
+        """Get default bridge path based on OS"""
+        system = platform.system()
+        
+        if system == "Windows":
+            return os.path.expanduser("~/AppData/Local/TradingAI/mt5_bridge")
+        elif system == "Darwin":  # macOS
+            return os.path.expanduser("~/Library/Application Support/TradingAI/mt5_bridge")
+        else:  # Linux
+            return os.path.expanduser("~/.tradingai/mt5_bridge")
+    
+    def _file_size(self) -> int:
+        return (_FILE_HEADER_SIZE + 2 * ShmRing.size(self.slots, self.slot_size)
+                + ShmRing.size(self.tick_slots, self.tick_slot_size))
+    
+    def _map(self):
+        with open(self.path, 'r+b') as f:
+            self.buffer = mmap.mmap(f.fileno(), self._file_size())
+        
+        offset = _FILE_HEADER_SIZE
+        self.requests = ShmRing(self.buffer, offset, self.slots, self.slot_size)
+        offset += ShmRing.size(self.slots, self.slot_size)
+        self.responses = ShmRing(self.buffer, offset, self.slots, self.slot_size)
+        offset += ShmRing.size(self.slots, self.slot_size)
+        self.ticks = ShmRing(self.buffer, offset, self.tick_slots, self.tick_slot_size)
+    
+    def create(self):
+        """Create and map the shared file (the MT5 side, or a stand-in peer)"""
+        try:
+            os.makedirs(self.bridge_path, exist_ok=True)
+            # Write the header last so clients only attach to a complete file
+            with open(self.path, 'wb') as f:
+                f.truncate(self._file_size())
+            self._map()
+            _FILE_HEADER.pack_into(self.buffer, 0, MAGIC, VERSION, self.slots, self.slot_size,
+                                   self.tick_slots, self.tick_slot_size)
+            self.is_server = True
+            self.is_connected = True
+            self.logger.info(f"Shared memory bridge created: {self.path}")
+        except Exception as e:
+            self.logger.error(f"Failed to create shared memory bridge: {e}")
+            raise
+    
+    def connect(self, timeout: float = 5.0):
+        """Map an existing shared file, waiting up to ``timeout`` for it to appear"""
+        try:
+            def read_header():
+                try:
+                    with open(self.path, 'rb') as f:
+                        header = f.read(_FILE_HEADER.size)
+                except OSError:
+                    return None
+                if len(header) < _FILE_HEADER.size or header[:8] != MAGIC:
+                    return None
+                return _FILE_HEADER.unpack(header)
+            
+            header = _wait_for(read_header, timeout, spin=0)
+            if header is None:
+                raise ConnectionError(f"Shared memory bridge not available at {self.path}")
+            
+            _, version, self.slots, self.slot_size, self.tick_slots, self.tick_slot_size = header
+            if version != VERSION:
+                raise ConnectionError(f"Unsupported shared memory bridge version {version}")
+            self._map()
+            
+            # Only deliver ticks published after connecting
+            self._tick_cursor = self.ticks.write_seq
+            self.is_connected = True
+            self.logger.info(f"Connected to shared memory bridge: {self.path}")
+        except Exception as e:
+            self.logger.error(f"Failed to connect to shared memory bridge: {e}")
+            raise
+    
+    def send_request(self, command: str, data: Dict[str, Any] = None, timeout: float = 30) -> Dict[str, Any]:
+        """Send request and wait for response"""
+        try:
+            if not self.is_connected:
+                raise ConnectionError("Shared memory bridge not connected")
+            
+            with self._request_lock:
+                request_id = next(self._request_ids)
+                payload = self.codec.encode({
+                    'id': request_id,
+                    'command': command,
+                    'data': data or {},
+                    'timestamp': time.time()
+                })
+                deadline = time.monotonic() + timeout
+                
+                if not _wait_for(lambda: self.requests.try_write(payload) or None, timeout):
+                    raise TimeoutError("Request ring full")
+                
+                while True:
+                    frame = _wait_for(self.responses.try_read, max(0.0, deadline - time.monotonic()))
+                    if frame is None:
+                        raise TimeoutError("Request timeout")
+                    response = detect_codec(frame).decode(frame)
+                    if response.get('id') == request_id:
+                        return response
+                    self.logger.debug(f"Discarding response for expired request {response.get('id')}")
+        
+        except Exception as e:
+            self.logger.error(f"Error sending request: {e}")
+            return transport_failure(str(e))
+    
+    def start_message_loop(self, handler_func: Callable[[Dict], Dict]):
+        """Serve requests from the request ring (MT5 side, or a stand-in peer)"""
+        if not self.is_server:
+            raise RuntimeError("Message loop requires a created bridge")
+        
+        def message_loop():
+            while not self._stop_event.is_set():
+                frame = _wait_for(self.requests.try_read, 0.1)
+                if frame is None:
+                    continue
+                request_id = None
+                try:
+                    codec = detect_codec(frame)
+                    request = codec.decode(frame)
+                    request_id = request.get('id')
+                    response = handler_func(request)
+                    response['id'] = request_id
+                    payload = codec.encode(response)
+                except Exception as e:
+                    self.logger.error(f"Shared memory handler error: {e}")
+                    payload = JSONCodec().encode({'error': str(e), 'success': False, 'id': request_id})
+                while not self.responses.try_write(payload):
+                    if self._stop_event.wait(0.0001):
+                        return
+        
+        self._stop_event.clear()
+        self._server_thread = threading.Thread(target=message_loop, daemon=True)
+        self._server_thread.start()
+    
+    def stop_message_loop(self, timeout: float = 1.0):
+        """Stop the request-serving loop"""
+        self._stop_event.set()
+        if self._server_thread:
+            self._server_thread.join(timeout=timeout)
+            self._server_thread = None
+    
+    def publish_tick(self, symbol: str, tick: Dict[str, Any]):
+        """Broadcast a tick; slow readers lose the oldest ticks rather than blocking MT5"""
+        payload = self.tick_codec.encode({'symbol': symbol, 'ticks': [tick]})
+        with self._tick_lock:
+            self.ticks.try_write(payload, overwrite=True)
+    
+    def poll_ticks(self, max_items: int = 1000) -> List[Dict[str, Any]]:
+        """Read ticks published since the last call"""
+        messages = []
+        with self._tick_lock:
+            while len(messages) < max_items:
+                payload, self._tick_cursor, dropped = self.ticks.read_from(self._tick_cursor)
+                self.dropped_ticks += dropped
+                if payload is None:
+                    if self._tick_cursor >= self.ticks.write_seq:
+                        break
+                    continue
+                messages.append(self.tick_codec.decode(payload))
+        return messages
+    
+    def subscribe(self, symbols: Sequence[str], callback: TickCallback):
+        """Deliver ticks for ``symbols`` to ``callback(topic, message)`` from a reader thread"""
+        with self._subscriptions_lock:
+            self._subscriptions.append(({s.upper() for s in symbols}, callback))
+        
+        if self._stream_thread is None:
+            self._stream_stop.clear()
+            self._stream_thread = threading.Thread(target=self._stream_loop, daemon=True)
+            self._stream_thread.start()
+    
+    def _stream_loop(self):
+        while not self._stream_stop.is_set():
+            messages = _wait_for(lambda: self.poll_ticks() or None, 0.1)
+            for message in messages or []:
+                symbol = str(message.get('symbol', '')).upper()
+                with self._subscriptions_lock:
+                    callbacks = [cb for symbols, cb in self._subscriptions if symbol in symbols]
+                for callback in callbacks:
+                    try:
+                        callback(f"{symbol}.TICK", message)
+                    except Exception as e:
+                        self.logger.error(f"Tick callback error: {e}")
+    
+    def stop_streaming(self):
+        """Stop delivering ticks to subscribers"""
+        self._stream_stop.set()
+        if self._stream_thread:
+            self._stream_thread.join(timeout=1)
+            self._stream_thread = None
+        with self._subscriptions_lock:
+            self._subscriptions.clear()
+    
+    def close(self):
+        """Unmap the shared file (the creating side also removes it)"""
+        try:
+            self.stop_message_loop()
+            self.stop_streaming()
+            self.requests = self.responses = self.ticks = None
+            if self.buffer is not None:
+                self.buffer.close()
+                self.buffer = None
+            if self.is_server and os.path.exists(self.path):
+                os.remove(self.path)
+            self.is_connected = False
+            self.logger.info("Shared memory bridge closed")
+        except Exception as e:
+            self.logger.error(f"Error closing shared memory bridge: {e}")
@@ -0,0 +1,60 @@
+"""
+MT5 Single Flight - Coalesce Concurrent Identical Requests
+"""
+
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+class SingleFlight:
+    """Run one call per key at a time and share its outcome.
+    
+    The first caller for a key executes the function; callers arriving
+    while it is in flight wait for that result (or exception) instead of
+    issuing their own. Once the call completes the key is released, so the
+    next caller starts a fresh request.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.shared = 0
+    
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for callers that joined an in-flight call"""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = self._calls[key] = Future()
+                self.executed += 1
+            else:
+                self.shared += 1
+        
+        if not leader:
+            return future.result(), True
+        return self._run(key, future, fn)
+    
+    def _run(self, key: Hashable, future: Future, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        try:
+            result = fn()
+        except BaseException as e:
+            self._release(key)
+            future.set_exception(e)
+            raise
+        self._release(key)
+        future.set_result(result)
+        return result, False
+    
+    def _release(self, key: Hashable):
+        with self._lock:
+            self._calls.pop(key, None)
+    
+    def get_in_flight_count(self) -> int:
+        with self._lock:
+            return len(self._calls)
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'executed': self.executed, 'shared': self.shared, 'in_flight': len(self._calls)}
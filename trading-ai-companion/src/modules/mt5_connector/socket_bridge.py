@@ -9,18 +9,47 @@ import logging
 import threading
 import platform
 import uuid
-from typing import Dict, Any, Optional
+import selectors
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 import socket
+from src.modules.mt5_connector.message_codecs import JSONCodec
+from src.modules.mt5_connector.socket_framing import HEADER, FrameReader, send_frames
+from src.modules.mt5_connector.transports import transport_failure
+
+class _ClientConnection:
+    """Per-client state for the concurrent server"""
+    
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.reader = FrameReader(sock)
+        self.send_lock = threading.Lock()
+        self.sequence = itertools.count()
+        # Responses to requests without an id are released in request order
+        self.next_to_send = 0
+        self.completed: Dict[int, Optional[bytes]] = {}
+        self.closed = False
 
 class MT5SocketBridge:
-    def __init__(self, socket_path: str = None):
+    def __init__(self, socket_path: str = None, backlog: int = 16):
         self.logger = logging.getLogger(__name__)
         self.socket_path = socket_path or self._get_default_socket_path()
+        self.backlog = backlog
         self.is_server = False
         self.socket = None
         self.client_socket = None
         self.is_connected = False
+        self.reader = None
+        self.codec = JSONCodec()
+        
+        # Concurrent server state
+        self._selector = None
+        self._executor = None
+        self._connections: Dict[int, _ClientConnection] = {}
+        self._connections_lock = threading.Lock()
+        self._stop_event = threading.Event()
         
     def _get_default_socket_path(self) -> str:
         """Get default socket path based on OS"""
@@ -37,6 +66,7 @@ class MT5SocketBridge:
     def start_server(self):
         """Start socket server for MT5 to connect to"""
         try:
+            self._stop_event.clear()
             system = platform.system()
             
             if system == "Windows":
@@ -57,7 +87,7 @@ class MT5SocketBridge:
                 
                 self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
                 self.socket.bind(self.socket_path)
-                self.socket.listen(1)
+                self.socket.listen(self.backlog)
                 self.is_server = True
                 self.logger.info(f"Unix socket server started: {self.socket_path}")
                 
@@ -86,6 +116,7 @@ class MT5SocketBridge:
                 # Connect to Unix socket
                 self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
                 self.socket.connect(self.socket_path)
+                self.reader = FrameReader(self.socket)
                 self.is_connected = True
                 self.logger.info("Connected to MT5 Unix socket")
                 
@@ -93,47 +124,55 @@ class MT5SocketBridge:
             self.logger.error(f"Failed to connect to socket: {e}")
             raise
     
+    def _read_pipe_frame(self, handle) -> bytes:
+        """Read one length-prefixed frame from a named pipe"""
+        import win32file
+        result, header = win32file.ReadFile(handle, HEADER.size)
+        length, = HEADER.unpack(header)
+        result, payload = win32file.ReadFile(handle, length)
+        return payload
+    
+    def _write_pipe_frames(self, handle, payloads: List[bytes]):
+        """Write length-prefixed frames to a named pipe in one call"""
+        import win32file
+        win32file.WriteFile(handle, b''.join(HEADER.pack(len(p)) + p for p in payloads))
+    
     def send_message(self, message: Dict[str, Any], timeout: int = 30) -> Dict[str, Any]:
-        """Send message and wait for response"""
+        """Send message and wait up to ``timeout`` seconds for response"""
+        return self.send_messages([message], timeout)[0]
+    
+    def send_messages(self, messages: List[Dict[str, Any]], timeout: int = 30) -> List[Dict[str, Any]]:
+        """Pipeline several messages in one write and read their responses in order"""
         try:
-            message_str = json.dumps(message)
+            payloads = [self.codec.encode(message) for message in messages]
             
             if platform.system() == "Windows":
-                import win32file
-                # Send message length first
-                message_bytes = message_str.encode('utf-8')
-                win32file.WriteFile(self.handle, f"{len(message_bytes)}\n".encode('utf-8'))
-                win32file.WriteFile(self.handle, message_bytes)
-                
-                # Read response length
-                result, length_data = win32file.ReadFile(self.handle, 1024)
-                length = int(length_data.decode('utf-8').strip())
-                
-                # Read response
-                result, response_data = win32file.ReadFile(self.handle, length)
-                response_str = response_data.decode('utf-8')
-                return json.loads(response_str)
-            else:
-                # Send message length first
-                message_bytes = message_str.encode('utf-8')
-                self.socket.send(f"{len(message_bytes)}\n".encode('utf-8'))
-                self.socket.send(message_bytes)
-                
-                # Read response length
-                length_line = self.socket.recv(1024).decode('utf-8').strip()
-                length = int(length_line)
-                
-                # Read response
-                response_data = self.socket.recv(length)
-                response_str = response_data.decode('utf-8')
-                return json.loads(response_str)
-                
+                self._write_pipe_frames(self.handle, payloads)
+                return [self.codec.decode(self._read_pipe_frame(self.handle)) for _ in payloads]
+            
+            self.socket.settimeout(timeout)
+            send_frames(self.socket, payloads)
+            return [self.codec.decode(self.reader.read_frame()) for _ in payloads]
+            
+        except socket.timeout:
+            # A late response would be read as the answer to the next request
+            self.logger.error(f"Socket request timed out after {timeout}s; closing connection")
+            self.socket.close()
+            self.is_connected = False
+            return [transport_failure('Request timeout') for _ in messages]
         except Exception as e:
             self.logger.error(f"Error sending message: {e}")
-            return {'error': str(e), 'success': False}
+            return [transport_failure(str(e)) for _ in messages]
     
-    def listen_for_connections(self, handler_func):
-        """Listen for incoming connections (server mode)"""
+    def listen_for_connections(self, handler_func, concurrent: bool = False, max_workers: int = 4):
+        """Listen for incoming connections (server mode)
+        
+        With ``concurrent`` many clients are served at once and ``handler_func``
+        runs on a pool of ``max_workers`` threads.
+        """
+        if concurrent and platform.system() != "Windows":
+            return self._serve_concurrent(handler_func, max_workers)
+        
         try:
             if platform.system() == "Windows":
                 import win32pipe
@@ -152,48 +191,159 @@ class MT5SocketBridge:
     def _handle_client_connection(self, handler_func):
         """Handle individual client connection"""
         try:
+            reader = None if platform.system() == "Windows" else FrameReader(self.client_socket)
             while True:
-                if platform.system() == "Windows":
-                    import win32file
-                    # Read message length
-                    result, length_data = win32file.ReadFile(self.pipe, 1024)
-                    length = int(length_data.decode('utf-8').strip())
-                    
-                    # Read message
-                    result, message_data = win32file.ReadFile(self.pipe, length)
-                    message_str = message_data.decode('utf-8')
+                if reader is None:
+                    frames = [self._read_pipe_frame(self.pipe)]
                 else:
-                    # Read message length
-                    length_line = self.client_socket.recv(1024).decode('utf-8').strip()
-                    if not length_line:
+                    # One read may carry several pipelined requests
+                    try:
+                        frames = reader.recv_frames()
+                    except ConnectionError:
                         break
-                    length = int(length_line)
-                    
-                    # Read message
-                    message_data = self.client_socket.recv(length)
-                    message_str = message_data.decode('utf-8')
                 
-                message = json.loads(message_str)
-                response = handler_func(message)
+                responses = [self.codec.encode(self._handle_message(frame, handler_func)) for frame in frames]
+                if not responses:
+                    continue
                 
-                # Send response
-                response_str = json.dumps(response)
-                if platform.system() == "Windows":
-                    import win32file
-                    response_bytes = response_str.encode('utf-8')
-                    win32file.WriteFile(self.pipe, f"{len(response_bytes)}\n".encode('utf-8'))
-                    win32file.WriteFile(self.pipe, response_bytes)
+                # Send responses
+                if reader is None:
+                    self._write_pipe_frames(self.pipe, responses)
                 else:
-                    response_bytes = response_str.encode('utf-8')
-                    self.client_socket.send(f"{len(response_bytes)}\n".encode('utf-8'))
-                    self.client_socket.send(response_bytes)
+                    send_frames(self.client_socket, responses)
                     
         except Exception as e:
             self.logger.error(f"Error handling client connection: {e}")
     
+    def _handle_message(self, frame: bytes, handler_func) -> Dict[str, Any]:
+        """Decode a request, run the handler and tag the response with the request id"""
+        message = self.codec.decode(frame)
+        response = handler_func(message)
+        if isinstance(message, dict) and message.get('id') is not None and isinstance(response, dict):
+            response['id'] = message['id']
+        return response
+    
+    def _serve_concurrent(self, handler_func, max_workers: int):
+        """Selector loop multiplexing all client connections
+        
+        ``close`` may run before this thread gets going; setup failures on
+        the closed socket then end the loop quietly.
+        """
+        self._selector = None
+        self._executor = None
+        try:
+            self._selector = selectors.DefaultSelector()
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mt5-socket")
+            self.socket.setblocking(False)
+            self._selector.register(self.socket, selectors.EVENT_READ)
+            
+            while not self._stop_event.is_set():
+                for key, _ in self._selector.select(timeout=0.1):
+                    if key.fileobj is self.socket:
+                        self._accept_connection()
+                    else:
+                        self._read_connection(key.data, handler_func)
+        except Exception as e:
+            if not self._stop_event.is_set():
+                self.logger.error(f"Error serving connections: {e}")
+        finally:
+            with self._connections_lock:
+                connections = list(self._connections.values())
+            for conn in connections:
+                self._close_connection(conn)
+            if self._executor:
+                self._executor.shutdown(wait=False)
+            if self._selector:
+                self._selector.close()
+    
+    def _accept_connection(self):
+        try:
+            client_socket, _ = self.socket.accept()
+        except BlockingIOError:
+            return
+        client_socket.setblocking(False)
+        conn = _ClientConnection(client_socket)
+        with self._connections_lock:
+            self._connections[client_socket.fileno()] = conn
+        self._selector.register(client_socket, selectors.EVENT_READ, conn)
+    
+    def _read_connection(self, conn: _ClientConnection, handler_func):
+        try:
+            frames = conn.reader.recv_frames()
+        except BlockingIOError:
+            return
+        except Exception:
+            self._close_connection(conn)
+            return
+        
+        for frame in frames:
+            self._executor.submit(self._handle_frame, conn, next(conn.sequence), frame, handler_func)
+    
+    def _handle_frame(self, conn: _ClientConnection, sequence: int, frame: bytes, handler_func):
+        """Run the handler on a worker and send the response"""
+        request_id = None
+        try:
+            message = self.codec.decode(frame)
+            request_id = message.get('id') if isinstance(message, dict) else None
+            response = self._handle_message(frame, handler_func)
+        except Exception as e:
+            self.logger.error(f"Socket handler error: {e}")
+            response = {'error': str(e), 'success': False, 'id': request_id}
+        payload = self.codec.encode(response)
+        
+        try:
+            with conn.send_lock:
+                if conn.closed:
+                    return
+                if request_id is not None:
+                    # Tagged responses go out as soon as they are ready
+                    send_frames(conn.sock, [payload])
+                    payload = None
+                conn.completed[sequence] = payload
+                
+                ready = []
+                while conn.next_to_send in conn.completed:
+                    pending = conn.completed.pop(conn.next_to_send)
+                    if pending is not None:
+                        ready.append(pending)
+                    conn.next_to_send += 1
+                if ready:
+                    send_frames(conn.sock, ready)
+        except OSError as e:
+            # Let the selector thread see EOF and clean up the connection
+            self.logger.debug(f"Client went away before its response was sent: {e}")
+            try:
+                conn.sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+    
+    def _close_connection(self, conn: _ClientConnection):
+        """Unregister and close a client (selector thread only)"""
+        with conn.send_lock:
+            if conn.closed:
+                return
+            conn.closed = True
+        with self._connections_lock:
+            self._connections.pop(conn.sock.fileno(), None)
+        try:
+            self._selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        conn.sock.close()
+    
+    def get_client_count(self) -> int:
+        """Number of clients connected to the concurrent server"""
+        with self._connections_lock:
+            return len(self._connections)
+    
+    def stop_server(self):
+        """Stop a concurrent server loop"""
+        self._stop_event.set()
+    
     def close(self):
         """Close socket connections"""
         try:
+            self.stop_server()
             if platform.system() == "Windows":
                 if hasattr(self, 'handle'):
                     import win32file
@@ -206,7 +356,9 @@ class MT5SocketBridge:
                     self.client_socket.close()
                 if self.socket:
                     self.socket.close()
-                if os.path.exists(self.socket_path) and not self.is_server:
+                # Only the listening side owns the socket file; clients must not
+                # remove it from under other connected consumers
+                if os.path.exists(self.socket_path) and self.is_server:
                     os.unlink(self.socket_path)
         except Exception as e:
             self.logger.error(f"Error closing socket: {e}")
@@ -0,0 +1,130 @@
+"""
+MT5 Socket Framing - Length-prefixed Binary Frames over Stream Sockets
+"""
+
+import select
+import socket
+import struct
+from collections import deque
+from typing import List, Sequence
+
+# Every frame is a 4-byte big-endian payload length followed by the payload
+HEADER = struct.Struct('!I')
+MAX_FRAME_SIZE = 64 * 1024 * 1024
+
+# Linux limits a single sendmsg() to IOV_MAX buffers
+_MAX_IOV = 512
+
+class FrameError(Exception):
+    """Raised when the peer sends a malformed frame."""
+    pass
+
+def send_frames(sock: socket.socket, payloads: Sequence[bytes]):
+    """Send one or more frames, gathering headers and payloads into few syscalls
+    
+    Works on non-blocking sockets too: a full send buffer waits for writability.
+    """
+    buffers = []
+    for payload in payloads:
+        buffers.append(HEADER.pack(len(payload)))
+        buffers.append(payload)
+    
+    if not hasattr(sock, 'sendmsg'):
+        buffers = [b''.join(buffers)]
+    
+    views = deque(memoryview(buffer) for buffer in buffers)
+    while views:
+        batch = [views[i] for i in range(min(len(views), _MAX_IOV))]
+        try:
+            sent = sock.sendmsg(batch) if hasattr(sock, 'sendmsg') else sock.send(batch[0])
+        except BlockingIOError:
+            select.select([], [sock], [])
+            continue
+        # Drop fully sent buffers and trim a partially sent one
+        while sent:
+            view = views[0]
+            if sent >= len(view):
+                sent -= len(view)
+                views.popleft()
+            else:
+                views[0] = view[sent:]
+                sent = 0
+        while views and not len(views[0]):
+            views.popleft()
+
+class FrameReader:
+    """Reassemble frames from a stream socket into a reusable buffer.
+    
+    ``recv_into`` fills a preallocated ``bytearray`` so a read allocates
+    nothing beyond the returned frames, and a single read may yield many
+    pipelined frames. The buffer grows only for frames larger than it.
+    """
+    
+    def __init__(self, sock: socket.socket, buffer_size: int = 65536):
+        self.sock = sock
+        self._buffer = bytearray(buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+        self._frames = deque()
+    
+    def _make_room(self, needed: int):
+        """Ensure ``needed`` bytes fit after the unread data"""
+        pending = self._end - self._start
+        if self._start and len(self._buffer) - self._end < needed:
+            self._view[:pending] = self._view[self._start:self._end]
+            self._start, self._end = 0, pending
+        if len(self._buffer) - self._end < needed:
+            size = len(self._buffer)
+            while size - pending < needed:
+                size *= 2
+            self._view.release()
+            self._buffer.extend(bytes(size - len(self._buffer)))
+            self._view = memoryview(self._buffer)
+    
+    def _parse(self):
+        """Move every complete frame in the buffer to the frame queue"""
+        while self._end - self._start >= HEADER.size:
+            length, = HEADER.unpack_from(self._buffer, self._start)
+            if length > MAX_FRAME_SIZE:
+                raise FrameError(f"Frame of {length} bytes exceeds limit of {MAX_FRAME_SIZE}")
+            frame_end = self._start + HEADER.size + length
+            if frame_end > self._end:
+                # Make sure the rest of this frame will fit
+                self._make_room(HEADER.size + length - (self._end - self._start))
+                return
+            self._frames.append(bytes(self._view[self._start + HEADER.size:frame_end]))
+            self._start = frame_end
+        
+        if self._start == self._end:
+            self._start = self._end = 0
+    
+    def _fill(self) -> int:
+        """One ``recv_into`` call; raises ConnectionError on EOF"""
+        if self._end == len(self._buffer):
+            self._make_room(HEADER.size)
+        received = self.sock.recv_into(self._view[self._end:])
+        if not received:
+            raise ConnectionError("Connection closed by peer")
+        self._end += received
+        return received
+    
+    def recv_frames(self) -> List[bytes]:
+        """Read once from the socket and return all frames now complete"""
+        if not self._frames:
+            self._fill()
+            self._parse()
+        frames = list(self._frames)
+        self._frames.clear()
+        return frames
+    
+    def read_frame(self) -> bytes:
+        """Block until one complete frame is available"""
+        while not self._frames:
+            self._fill()
+            self._parse()
+        return self._frames.popleft()
+    
+    def pending_frames(self) -> int:
+        """Frames already buffered that can be read without a syscall"""
+        return len(self._frames)
@@ -0,0 +1,124 @@
+"""
+MT5 Transport Health - Circuit Breakers and Latency Metrics per Transport
+"""
+
+import time
+import threading
+from collections import deque
+from typing import Dict, Any, Optional
+
+class CircuitBreaker:
+    """Stop sending to a transport after repeated failures.
+    
+    ``closed``: requests flow. After ``failure_threshold`` consecutive
+    failures the breaker opens and requests are refused for
+    ``reset_timeout`` seconds. It then goes ``half_open`` and lets a single
+    trial request through: success closes it, failure opens it again.
+    """
+    
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+    
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        """Whether a request may be sent now"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    return False
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+    
+    def record_failure(self) -> bool:
+        """Count a failure; returns True when this failure opened the breaker"""
+        with self._lock:
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED
+                                                and self.consecutive_failures >= self.failure_threshold):
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+class TransportHealth:
+    """Breaker plus request counts and recent latencies for one transport"""
+    
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 window: int = 256):
+        self.name = name
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.requests = 0
+        self.failures = 0
+        self.failovers = 0
+        self.last_error: Optional[str] = None
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+    
+    def allow_request(self) -> bool:
+        return self.breaker.allow_request()
+    
+    def record_success(self, latency: float):
+        """Record a completed request that took ``latency`` seconds"""
+        with self._lock:
+            self.requests += 1
+            self._latencies.append(latency * 1000)
+        self.breaker.record_success()
+    
+    def record_failure(self, error: str) -> bool:
+        """Record a failed request; returns True when the breaker opened"""
+        with self._lock:
+            self.requests += 1
+            self.failures += 1
+            self.last_error = error
+        return self.breaker.record_failure()
+    
+    def record_failover(self):
+        """A request this transport could not serve was sent elsewhere"""
+        with self._lock:
+            self.failovers += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Current state and latency percentiles over the recent window"""
+        with self._lock:
+            latencies = sorted(self._latencies)
+            stats = {
+                'state': self.breaker.state,
+                'requests': self.requests,
+                'failures': self.failures,
+                'failovers': self.failovers,
+                'consecutive_failures': self.breaker.consecutive_failures,
+                'last_error': self.last_error
+            }
+        
+        if latencies:
+            stats.update(
+                latency_avg_ms=round(sum(latencies) / len(latencies), 3),
+                latency_p50_ms=round(latencies[len(latencies) // 2], 3),
+                latency_p95_ms=round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+                latency_max_ms=round(latencies[-1], 3)
+            )
+        else:
+            stats.update(latency_avg_ms=None, latency_p50_ms=None, latency_p95_ms=None, latency_max_ms=None)
+        return stats
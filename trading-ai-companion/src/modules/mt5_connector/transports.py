@@ -0,0 +1,284 @@
+"""
+MT5 Transports - Uniform Adapters and Startup Benchmarking
+"""
+
+import time
+import logging
+import statistics
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Callable, List, Optional, Sequence, Tuple
+
+Request = Tuple[str, Dict[str, Any]]
+
+class TransportError(Exception):
+    """Raised when a request did not complete over a transport."""
+    pass
+
+# Key marking error dicts for requests that got no answer from the EA
+TRANSPORT_FAILURE = 'transport_failure'
+
+def transport_failure(error: str) -> Dict[str, Any]:
+    """Error dict for a request that did not complete (timeout, lost connection)"""
+    return {'error': error, 'success': False, TRANSPORT_FAILURE: True}
+
+def is_transport_failure(response: Any) -> bool:
+    """Whether a response reports a local failure rather than an EA answer
+    
+    The clients in this package tag timeouts and connection problems with
+    ``TRANSPORT_FAILURE``. Any other dict is the peer's reply, including
+    error replies such as an EA's "Endpoint not found".
+    """
+    return not isinstance(response, dict) or response.get(TRANSPORT_FAILURE) is True
+
+class Transport:
+    """One way of talking to the MT5 EA, behind a common request interface.
+    
+    Timeouts are in seconds. Clients that cannot be shared between threads
+    are serialized through ``lock``.
+    """
+    
+    name = 'transport'
+    thread_safe = False
+    
+    def __init__(self, client):
+        self.logger = logging.getLogger(__name__)
+        self.client = client
+        self.lock = threading.Lock()
+    
+    def connect(self, timeout: float) -> bool:
+        """Open the connection and check the peer answers"""
+        return self.ping(timeout)
+    
+    def send(self, command: str, data: Dict[str, Any] = None, timeout: float = 30) -> Dict[str, Any]:
+        """Send one command and return the response dict
+        
+        Raises TransportError when the request did not complete.
+        """
+        try:
+            if self.thread_safe:
+                response = self._send(command, data or {}, timeout)
+            else:
+                with self.lock:
+                    response = self._send(command, data or {}, timeout)
+        except TransportError:
+            raise
+        except Exception as e:
+            raise TransportError(str(e)) from e
+        
+        if is_transport_failure(response):
+            raise TransportError(response.get('error') if isinstance(response, dict) else 'Invalid response')
+        return response
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        raise NotImplementedError
+    
+    def send_many(self, requests: Sequence[Request], timeout: float = 30) -> List[Dict[str, Any]]:
+        """Send several commands; transports that pipeline override this
+        
+        A request that fails gets an error dict in its place, so the other
+        responses in the batch are kept.
+        """
+        deadline = time.monotonic() + timeout
+        results = []
+        for command, data in requests:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                results.append(transport_failure('Request timeout'))
+                continue
+            try:
+                results.append(self.send(command, data, remaining))
+            except TransportError as e:
+                results.append(transport_failure(str(e) or 'Request failed'))
+        return results
+    
+    def ping(self, timeout: float = 5) -> bool:
+        """Round trip a ping command"""
+        response = self.send('ping', {}, timeout)
+        return bool(response.get('success') or response.get('status') in ('ok', 'connected'))
+    
+    def close(self):
+        """Release the underlying client"""
+        pass
+
+class ZMQTransport(Transport):
+    name = 'zmq'
+    
+    def __init__(self, client, pipelined: bool = False):
+        super().__init__(client)
+        self.pipelined = pipelined
+        self.thread_safe = pipelined
+    
+    def connect(self, timeout: float) -> bool:
+        self.client.connect_client(pipelined=self.pipelined)
+        # The ping doubles as the codec handshake
+        with self.lock:
+            response = self.client.negotiate_codec(timeout=int(timeout * 1000))
+        return bool(response.get('success'))
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return self.client.send_request(command, data, timeout=int(timeout * 1000))
+    
+    def send_many(self, requests: Sequence[Request], timeout: float = 30) -> List[Dict[str, Any]]:
+        if not self.pipelined:
+            return super().send_many(requests, timeout)
+        
+        futures = [self.client.submit_request(command, data) for command, data in requests]
+        deadline = time.monotonic() + timeout
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except Exception as e:
+                results.append(transport_failure(str(e) or 'Request timeout'))
+        return results
+    
+    def close(self):
+        self.client.close()
+
+class RESTTransport(Transport):
+    """REST API; ``command_mapper(command, data)`` turns bridge commands into API calls"""
+    
+    name = 'api'
+    thread_safe = True
+    
+    def __init__(self, client, command_mapper: Callable[[str, Dict[str, Any]], Dict[str, Any]]):
+        super().__init__(client)
+        self.command_mapper = command_mapper
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return self.command_mapper(command, data)
+    
+    def ping(self, timeout: float = 5) -> bool:
+        return self.client.get_server_status().get('status') == 'connected'
+    
+    def close(self):
+        self.client.session.close()
+
+class SocketTransport(Transport):
+    name = 'socket'
+    
+    def connect(self, timeout: float) -> bool:
+        self.client.connect_client()
+        return self.ping(timeout)
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return self.client.send_message({'command': command, 'data': data}, timeout)
+    
+    def send_many(self, requests: Sequence[Request], timeout: float = 30) -> List[Dict[str, Any]]:
+        # One gathered write, responses read back in order
+        with self.lock:
+            return self.client.send_messages([{'command': command, 'data': data or {}}
+                                              for command, data in requests], timeout)
+    
+    def close(self):
+        self.client.close()
+
+class FileTransport(Transport):
+    name = 'bridge'
+    thread_safe = True
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return self.client.send_request(command, data, timeout)
+    
+    def send_many(self, requests: Sequence[Request], timeout: float = 30) -> List[Dict[str, Any]]:
+        return self.client.send_requests(list(requests), timeout)
+    
+    def close(self):
+        self.client.stop_bridge()
+
+class SharedMemoryTransport(Transport):
+    name = 'shm'
+    thread_safe = True
+    
+    def connect(self, timeout: float) -> bool:
+        self.client.connect(timeout=timeout)
+        return self.ping(timeout)
+    
+    def _send(self, command: str, data: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+        return self.client.send_request(command, data, timeout)
+    
+    def close(self):
+        self.client.close()
+
+def _unavailable(name: str, error: Optional[str] = None) -> Dict[str, Any]:
+    return {'name': name, 'available': False, 'latency_ms': None, 'throughput_rps': None,
+            'error': error, 'probed_at': time.time()}
+
+def probe_transport(transport: Transport, timeout: float = 2.0, samples: int = 5,
+                    burst: int = 20, connect: bool = True) -> Dict[str, Any]:
+    """Measure round-trip latency and pipelined throughput of one transport"""
+    result = _unavailable(transport.name)
+    try:
+        if connect and not transport.connect(timeout):
+            result['error'] = 'No response to ping'
+            return result
+        
+        latencies = []
+        for _ in range(samples):
+            start = time.perf_counter()
+            if not transport.ping(timeout):
+                result['error'] = 'Ping failed'
+                return result
+            latencies.append((time.perf_counter() - start) * 1000)
+        
+        start = time.perf_counter()
+        responses = transport.send_many([('ping', {})] * burst, timeout)
+        elapsed = time.perf_counter() - start
+        if not all(r.get('success') or r.get('status') in ('ok', 'connected') for r in responses):
+            result['error'] = 'Burst failed'
+            return result
+        
+        result.update(available=True, latency_ms=round(statistics.median(latencies), 3),
+                      throughput_rps=round(burst / elapsed, 1) if elapsed > 0 else None)
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+def probe_transports(transports: Sequence[Transport], timeout: float = 2.0, samples: int = 5,
+                     burst: int = 20) -> Tuple[List[Transport], Dict[str, Dict[str, Any]]]:
+    """Connect all transports in parallel, then benchmark the ones that answered
+    
+    Connecting is bounded by ``timeout`` overall, so one unreachable peer
+    cannot hold up startup; stragglers are closed when they eventually
+    return. Measurements run one transport at a time so they do not skew
+    each other. Returns the connected transports and metrics by name.
+    """
+    metrics = {}
+    executor = ThreadPoolExecutor(max_workers=max(1, len(transports)), thread_name_prefix='mt5-probe')
+    futures = {executor.submit(transport.connect, timeout): transport for transport in transports}
+    done, _ = wait(futures, timeout=timeout)
+    executor.shutdown(wait=False)
+    
+    connected = []
+    for future, transport in futures.items():
+        if future not in done:
+            future.add_done_callback(lambda _, transport=transport: transport.close())
+            metrics[transport.name] = _unavailable(transport.name, 'Connect timeout')
+            continue
+        
+        error = future.exception()
+        if error is None and future.result():
+            connected.append(transport)
+            continue
+        metrics[transport.name] = _unavailable(transport.name, str(error) if error else 'No response to ping')
+        try:
+            transport.close()
+        except Exception:
+            pass
+    
+    available = []
+    for transport in connected:
+        metrics[transport.name] = probe_transport(transport, timeout, samples, burst, connect=False)
+        if metrics[transport.name]['available']:
+            available.append(transport)
+        else:
+            transport.close()
+    return available, metrics
+
+def select_fastest(metrics: Dict[str, Dict[str, Any]]) -> Optional[str]:
+    """Name of the available transport with the lowest median latency"""
+    available = [m for m in metrics.values() if m.get('available')]
+    if not available:
+        return None
+    return min(available, key=lambda m: (m['latency_ms'], -(m['throughput_rps'] or 0)))['name']
@@ -0,0 +1,91 @@
+"""
+MT5 TTL Cache - Size-bounded Read-through Cache with per-Endpoint Expiry
+"""
+
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+# Seconds each kind of REST read may be served from memory
+DEFAULT_CACHE_TTLS = {
+    'account': 1.0,
+    'symbol_info': 300.0,
+    'symbols': 600.0
+}
+
+class TTLCache:
+    """Values grouped by namespace, each namespace with its own TTL.
+    
+    Entries expire ``ttl`` seconds after they were stored and the least
+    recently used entry is evicted once ``capacity`` is reached. A TTL of
+    0 disables caching for that namespace.
+    """
+    
+    def __init__(self, capacity: int = 256, ttls: Dict[str, float] = None, default_ttl: float = 0.0):
+        self.capacity = capacity
+        self.ttls = dict(DEFAULT_CACHE_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[Tuple[str, Hashable], Tuple[float, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def ttl(self, namespace: str) -> float:
+        return self.ttls.get(namespace, self.default_ttl)
+    
+    def get(self, namespace: str, key: Hashable = None) -> Optional[Any]:
+        """Cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get((namespace, key))
+            if entry is None or entry[0] <= time.monotonic():
+                if entry is not None:
+                    del self._entries[(namespace, key)]
+                self.misses += 1
+                return None
+            self._entries.move_to_end((namespace, key))
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, namespace: str, key: Hashable, value: Any):
+        ttl = self.ttl(namespace)
+        if ttl <= 0 or value is None:
+            return
+        with self._lock:
+            self._entries[(namespace, key)] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end((namespace, key))
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+    
+    def get_or_load(self, namespace: str, key: Hashable, loader: Callable[[], Any],
+                    cacheable: Callable[[Any], bool] = bool) -> Any:
+        """Return the cached value, calling ``loader`` on a miss
+        
+        The loaded value is stored only when ``cacheable(value)`` holds, so
+        empty or error results are fetched again next time.
+        """
+        value = self.get(namespace, key)
+        if value is not None:
+            return value
+        value = loader()
+        if cacheable(value):
+            self.set(namespace, key, value)
+        return value
+    
+    def invalidate(self, namespace: str, key: Hashable = None):
+        """Drop one entry, or the whole namespace when ``key`` is None"""
+        with self._lock:
+            if key is not None:
+                self._entries.pop((namespace, key), None)
+                return
+            for entry_key in [k for k in self._entries if k[0] == namespace]:
+                del self._entries[entry_key]
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+    
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {'size': len(self._entries), 'capacity': self.capacity,
+                    'hits': self.hits, 'misses': self.misses}
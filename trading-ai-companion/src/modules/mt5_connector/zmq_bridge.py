@@ -3,14 +3,25 @@ MT5 ZeroMQ Bridge - Professional High-Performance Communication
 """
 
 import zmq
-import json
+import time
+import asyncio
 import logging
+import itertools
 import threading
-from typing import Dict, Any, Callable
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Dict, Any, Callable, List, Sequence, Tuple, AsyncIterator
 from datetime import datetime
+from src.modules.mt5_connector.message_codecs import (
+    JSONCodec, StructCodec, available_codecs, detect_codec, get_codec, select_codec
+)
+from src.modules.mt5_connector.transports import transport_failure
+
+# Callback signature for streamed ticks/bars: (topic, message)
+StreamCallback = Callable[[str, Dict[str, Any]], None]
 
 class MT5ZMQBridge:
-    def __init__(self, port: int = 5555, host: str = "localhost"):
+    def __init__(self, port: int = 5555, host: str = "localhost", preferred_codecs: List[str] = None):
         self.logger = logging.getLogger(__name__)
         self.port = port
         self.host = host
@@ -18,10 +29,45 @@ class MT5ZMQBridge:
         self.socket = None
         self.is_server = False
         
-    def start_server(self):
-        """Start ZMQ server for MT5 to connect to"""
+        # Wire format; JSON until a binary codec is negotiated via ping
+        self.codec = JSONCodec()
+        self.preferred_codecs = preferred_codecs or ['msgpack', 'json']
+        
+        # Server loop control
+        self._stop_event = threading.Event()
+        self._loop_running = threading.Event()
+        
+        # Pipelined (DEALER) client state
+        self.pipelined = False
+        self._request_ids = itertools.count(1)
+        self._in_flight: 'OrderedDict[str, Future]' = OrderedDict()
+        self._in_flight_lock = threading.Lock()
+        self._outbox = None
+        self._outbox_pull = None
+        self._outbox_lock = threading.Lock()
+        self._io_thread = None
+        self._io_stop = threading.Event()
+        
+        # PUB/SUB streaming; the publisher defaults to the next port
+        self.pub_port = port + 1
+        self.pub_socket = None
+        self._pub_lock = threading.Lock()
+        self.stream_codec = StructCodec()
+        self._subscriptions: List[Tuple[set, StreamCallback]] = []
+        self._subscriptions_lock = threading.Lock()
+        self._pending_topics = []
+        self._stream_thread = None
+        self._stream_stop = threading.Event()
+        
+    def start_server(self, router: bool = False):
+        """Start ZMQ server for MT5 to connect to
+        
+        With ``router`` a ROUTER socket is used so pipelined DEALER clients
+        can keep many requests outstanding.
+        """
         try:
-            self.socket = self.context.socket(zmq.REP)  # Reply socket
+            self.socket = self.context.socket(zmq.ROUTER if router else zmq.REP)  # Reply socket
+            self.socket.setsockopt(zmq.LINGER, 0)
             self.socket.bind(f"tcp://{self.host}:{self.port}")
             self.is_server = True
             self.logger.info(f"ZMQ server started on tcp://{self.host}:{self.port}")
@@ -29,67 +75,392 @@ class MT5ZMQBridge:
             self.logger.error(f"Failed to start ZMQ server: {e}")
             raise
     
-    def connect_client(self):
-        """Connect as client to MT5 ZMQ server"""
+    def connect_client(self, pipelined: bool = False):
+        """Connect as client to MT5 ZMQ server
+        
+        With ``pipelined`` a DEALER socket is used: requests carry an id,
+        any number may be in flight and replies are matched out of order
+        by a background I/O thread.
+        """
         try:
-            self.socket = self.context.socket(zmq.REQ)  # Request socket
+            self.pipelined = pipelined
+            if pipelined:
+                self.socket = self.context.socket(zmq.DEALER)
+            else:
+                self.socket = self.context.socket(zmq.REQ)  # Request socket
+            self.socket.setsockopt(zmq.LINGER, 0)
             self.socket.connect(f"tcp://{self.host}:{self.port}")
+            
+            if pipelined:
+                self._start_io_thread()
             self.logger.info(f"Connected to MT5 ZMQ server at tcp://{self.host}:{self.port}")
         except Exception as e:
             self.logger.error(f"Failed to connect to ZMQ server: {e}")
             raise
     
+    def _start_io_thread(self):
+        """Start the thread that owns the DEALER socket
+        
+        ZMQ sockets are not thread-safe, so callers hand frames to the I/O
+        thread through an inproc PUSH/PULL pair guarded by a lock.
+        """
+        endpoint = f"inproc://mt5-zmq-outbox-{id(self)}"
+        self._outbox_pull = self.context.socket(zmq.PULL)
+        self._outbox_pull.setsockopt(zmq.LINGER, 0)
+        self._outbox_pull.bind(endpoint)
+        self._outbox = self.context.socket(zmq.PUSH)
+        self._outbox.setsockopt(zmq.LINGER, 0)
+        self._outbox.connect(endpoint)
+        
+        self._io_stop.clear()
+        self._io_thread = threading.Thread(target=self._io_loop, daemon=True)
+        self._io_thread.start()
+    
+    def _io_loop(self):
+        """Forward outgoing frames and dispatch replies to waiting futures"""
+        poller = zmq.Poller()
+        poller.register(self.socket, zmq.POLLIN)
+        poller.register(self._outbox_pull, zmq.POLLIN)
+        
+        while not self._io_stop.is_set():
+            try:
+                events = dict(poller.poll(100))
+                
+                if self._outbox_pull in events:
+                    while True:
+                        try:
+                            frame = self._outbox_pull.recv(zmq.NOBLOCK)
+                        except zmq.Again:
+                            break
+                        # Empty delimiter keeps DEALER compatible with REP servers
+                        self.socket.send_multipart([b'', frame])
+                
+                if self.socket in events:
+                    while True:
+                        try:
+                            parts = self.socket.recv_multipart(zmq.NOBLOCK)
+                        except zmq.Again:
+                            break
+                        self._dispatch_response(parts[-1])
+                        
+            except zmq.ContextTerminated:
+                break
+            except Exception as e:
+                self.logger.error(f"ZMQ I/O loop error: {e}")
+    
+    def _dispatch_response(self, payload: bytes):
+        """Resolve the future waiting for this reply"""
+        try:
+            response = detect_codec(payload).decode(payload)
+        except Exception as e:
+            self.logger.error(f"Undecodable ZMQ response: {e}")
+            return
+        
+        request_id = response.get('id')
+        with self._in_flight_lock:
+            if request_id is not None:
+                future = self._in_flight.pop(str(request_id), None)
+            elif self._in_flight:
+                # Peers that do not echo ids answer in order (REP semantics)
+                future = self._in_flight.popitem(last=False)[1]
+            else:
+                future = None
+        
+        if future is None:
+            self.logger.debug(f"Discarding response for unknown or expired request {request_id}")
+        elif not future.done():
+            future.set_result(response)
+    
+    def submit_request(self, command: str, data: Dict[str, Any] = None) -> Future:
+        """Send a request without waiting; the returned future resolves to the reply
+        
+        Only available on pipelined connections.
+        """
+        if not self.pipelined:
+            raise RuntimeError("submit_request requires a pipelined connection")
+        
+        request_id = str(next(self._request_ids))
+        request = {
+            'id': request_id,
+            'command': command,
+            'data': data or {},
+            'timestamp': time.time() if self.codec.binary else datetime.now().isoformat()
+        }
+        frame = self.codec.encode(request)
+        
+        future = Future()
+        future.request_id = request_id
+        with self._in_flight_lock:
+            self._in_flight[request_id] = future
+        with self._outbox_lock:
+            self._outbox.send(frame)
+        return future
+    
+    def get_in_flight_count(self) -> int:
+        """Number of pipelined requests awaiting a reply"""
+        with self._in_flight_lock:
+            return len(self._in_flight)
+    
     def send_request(self, command: str, data: Dict[str, Any] = None, timeout: int = 30000) -> Dict[str, Any]:
         """Send request and wait for response"""
         try:
+            if self.pipelined:
+                future = self.submit_request(command, data)
+                try:
+                    return future.result(timeout=timeout / 1000 if timeout else None)
+                except FutureTimeoutError:
+                    # Drop the waiter; the connection stays usable
+                    with self._in_flight_lock:
+                        self._in_flight.pop(future.request_id, None)
+                    raise TimeoutError("Request timeout")
+            
             request = {
                 'command': command,
                 'data': data or {},
-                'timestamp': datetime.now().isoformat()
+                'timestamp': time.time() if self.codec.binary else datetime.now().isoformat()
             }
             
             # Send request
-            message = json.dumps(request)
-            self.socket.send_string(message)
+            self.socket.send(self.codec.encode(request))
             
             # Set timeout
             if timeout:
                 poller = zmq.Poller()
                 poller.register(self.socket, zmq.POLLIN)
                 if poller.poll(timeout):
-                    response = self.socket.recv_string()
-                    return json.loads(response)
+                    return self.codec.decode(self.socket.recv())
                 else:
                     raise TimeoutError("Request timeout")
             else:
-                response = self.socket.recv_string()
-                return json.loads(response)
+                return self.codec.decode(self.socket.recv())
                 
         except Exception as e:
             self.logger.error(f"Error sending request: {e}")
-            return {'error': str(e), 'success': False}
+            return transport_failure(str(e))
+    
+    def negotiate_codec(self, timeout: int = 30000) -> Dict[str, Any]:
+        """Ping the server offering binary codecs and switch to the one it accepts
+        
+        The ping itself is always JSON so peers without codec support simply
+        answer and the bridge stays on JSON. The struct codec only carries
+        its fixed tick/bar layout, so it is kept to streaming and never
+        offered for request/response traffic.
+        """
+        offered = [name for name in self.preferred_codecs
+                   if name in available_codecs() and name != StructCodec.name]
+        self.codec = JSONCodec()
+        response = self.send_request('ping', {'codecs': offered}, timeout=timeout)
+        
+        codec_name = response.get('codec', JSONCodec.name)
+        if response.get('success', False) and codec_name in offered:
+            self.codec = get_codec(codec_name)
+        self.logger.info(f"ZMQ wire format: {self.codec.name}")
+        return response
     
     def start_message_loop(self, handler_func: Callable[[Dict], Dict]):
-        """Start message processing loop (server mode)"""
+        """Start message processing loop (server mode)
+        
+        Replies use the codec of each incoming request; ping requests that
+        offer codecs are answered with the selected one. Request ids are
+        echoed so pipelined clients can match replies.
+        """
+        is_router = self.socket.type == zmq.ROUTER
+        self._stop_event.clear()
+        self._loop_running.set()
         try:
-            while True:
+            while not self._stop_event.is_set():
                 # Wait for request
-                message = self.socket.recv_string()
-                request = json.loads(message)
+                if not self.socket.poll(100):
+                    continue
+                if is_router:
+                    # [identity, b'', payload]
+                    parts = self.socket.recv_multipart()
+                    envelope, message = parts[:-1], parts[-1]
+                else:
+                    message = self.socket.recv()
+                codec = detect_codec(message)
+                request = codec.decode(message)
                 
                 # Process request
-                response = handler_func(request)
+                response = dict(handler_func(request))
+                
+                if 'id' in request:
+                    response['id'] = request['id']
+                if request.get('command') == 'ping' and 'codecs' in (request.get('data') or {}):
+                    offered = [name for name in request['data']['codecs'] if name != StructCodec.name]
+                    response['codec'] = select_codec(offered)
                 
                 # Send response
-                response_message = json.dumps(response)
-                self.socket.send_string(response_message)
+                if is_router:
+                    self.socket.send_multipart(envelope + [codec.encode(response)])
+                else:
+                    self.socket.send(codec.encode(response))
                 
         except Exception as e:
             self.logger.error(f"Error in message loop: {e}")
+        finally:
+            self._loop_running.clear()
+    
+    @staticmethod
+    def make_topic(symbol: str, timeframe: str = 'TICK') -> str:
+        """Stream topic for a symbol: ``SYMBOL.TIMEFRAME`` or ``SYMBOL.TICK``"""
+        return f"{symbol.upper()}.{timeframe.upper()}"
+    
+    def start_publisher(self, pub_port: int = None):
+        """Bind a PUB socket for streaming ticks and closed bars (terminal side)"""
+        try:
+            self.pub_port = pub_port or self.pub_port
+            self.pub_socket = self.context.socket(zmq.PUB)
+            self.pub_socket.setsockopt(zmq.LINGER, 0)
+            self.pub_socket.bind(f"tcp://{self.host}:{self.pub_port}")
+            self.logger.info(f"ZMQ publisher started on tcp://{self.host}:{self.pub_port}")
+        except Exception as e:
+            self.logger.error(f"Failed to start ZMQ publisher: {e}")
+            raise
+    
+    def publish(self, topic: str, message: Dict[str, Any]):
+        """Publish one message on a topic"""
+        with self._pub_lock:
+            self.pub_socket.send_multipart([topic.encode('utf-8'), self.stream_codec.encode(message)])
+    
+    def publish_tick(self, symbol: str, tick: Dict[str, Any]):
+        """Publish a tick on ``SYMBOL.TICK``"""
+        self.publish(self.make_topic(symbol), {'symbol': symbol.upper(), 'ticks': [tick]})
+    
+    def publish_bar(self, symbol: str, timeframe: str, bar: Dict[str, Any]):
+        """Publish a closed bar on ``SYMBOL.TIMEFRAME``"""
+        self.publish(self.make_topic(symbol, timeframe),
+                     {'symbol': symbol.upper(), 'timeframe': timeframe.upper(), 'bars': [bar]})
+    
+    def subscribe(self, symbols: Sequence[str], callback: StreamCallback,
+                  timeframes: Sequence[str] = ('TICK',), pub_port: int = None):
+        """Subscribe to streamed ticks/bars
+        
+        ``callback(topic, message)`` runs on the streaming thread for every
+        message whose topic exactly matches one of the requested
+        ``SYMBOL.TIMEFRAME`` pairs.
+        """
+        topics = {self.make_topic(symbol, timeframe) for symbol in symbols for timeframe in timeframes}
+        with self._subscriptions_lock:
+            self._subscriptions.append((topics, callback))
+            self._pending_topics.extend(topics)
+        
+        if self._stream_thread is None:
+            self.pub_port = pub_port or self.pub_port
+            self._stream_stop.clear()
+            self._stream_thread = threading.Thread(target=self._stream_loop, daemon=True)
+            self._stream_thread.start()
+    
+    def unsubscribe(self, callback: StreamCallback):
+        """Remove a streaming callback"""
+        with self._subscriptions_lock:
+            self._subscriptions = [(t, cb) for t, cb in self._subscriptions if cb is not callback]
+    
+    async def stream(self, symbols: Sequence[str], timeframes: Sequence[str] = ('TICK',),
+                     max_queue: int = 10000) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+        """Async iterator over ``(topic, message)`` for the requested topics"""
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=max_queue)
+        
+        def enqueue(item):
+            if queue.full():
+                queue.get_nowait()  # drop the oldest rather than block the stream thread
+            queue.put_nowait(item)
+        
+        def callback(topic, message):
+            loop.call_soon_threadsafe(enqueue, (topic, message))
+        
+        self.subscribe(symbols, callback, timeframes)
+        try:
+            while True:
+                yield await queue.get()
+        finally:
+            self.unsubscribe(callback)
+    
+    def _stream_loop(self):
+        """Own the SUB socket: apply new subscriptions and dispatch messages"""
+        sub_socket = self.context.socket(zmq.SUB)
+        sub_socket.setsockopt(zmq.LINGER, 0)
+        sub_socket.connect(f"tcp://{self.host}:{self.pub_port}")
+        
+        try:
+            while not self._stream_stop.is_set():
+                with self._subscriptions_lock:
+                    pending, self._pending_topics = self._pending_topics, []
+                for topic in pending:
+                    sub_socket.setsockopt(zmq.SUBSCRIBE, topic.encode('utf-8'))
+                
+                if not sub_socket.poll(100):
+                    continue
+                
+                while True:
+                    try:
+                        topic_bytes, payload = sub_socket.recv_multipart(zmq.NOBLOCK)
+                    except zmq.Again:
+                        break
+                    self._dispatch_stream(topic_bytes.decode('utf-8'), payload)
+                    
+        except zmq.ContextTerminated:
+            pass
+        except Exception as e:
+            self.logger.error(f"ZMQ stream loop error: {e}")
+        finally:
+            sub_socket.close()
+    
+    def _dispatch_stream(self, topic: str, payload: bytes):
+        """Decode a streamed message and hand it to matching callbacks"""
+        with self._subscriptions_lock:
+            callbacks = [cb for topics, cb in self._subscriptions if topic in topics]
+        if not callbacks:
+            return  # prefix match only, e.g. M1 vs M15
+        
+        try:
+            message = detect_codec(payload).decode(payload)
+        except Exception as e:
+            self.logger.error(f"Undecodable stream message on {topic}: {e}")
+            return
+        
+        for callback in callbacks:
+            try:
+                callback(topic, message)
+            except Exception as e:
+                self.logger.error(f"Stream callback error on {topic}: {e}")
+    
+    def stop_streaming(self):
+        """Stop the subscription thread and drop all callbacks"""
+        if self._stream_thread:
+            self._stream_stop.set()
+            self._stream_thread.join(timeout=1)
+            self._stream_thread = None
+        with self._subscriptions_lock:
+            self._subscriptions = []
+            self._pending_topics = []
+    
+    def stop_message_loop(self, timeout: float = 1.0):
+        """Stop a running message loop and wait for it to exit"""
+        self._stop_event.set()
+        deadline = time.time() + timeout
+        while self._loop_running.is_set() and time.time() < deadline:
+            time.sleep(0.01)
     
     def close(self):
         """Close ZMQ connections"""
         try:
+            self.stop_message_loop()
+            self.stop_streaming()
+            if self._io_thread:
+                self._io_stop.set()
+                self._io_thread.join(timeout=1)
+                self._io_thread = None
+            with self._in_flight_lock:
+                pending = list(self._in_flight.values())
+                self._in_flight.clear()
+            for future in pending:
+                if not future.done():
+                    future.set_exception(ConnectionError("ZMQ bridge closed"))
+            for sock in (self._outbox, self._outbox_pull, self.pub_socket):
+                if sock:
+                    sock.close()
             if self.socket:
                 self.socket.close()
             if self.context:
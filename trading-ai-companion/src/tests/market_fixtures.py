@@ -0,0 +1,20 @@
+"""
+Synthetic Market Data for Indicator Tests
+"""
+
+import numpy as np
+
+def random_walk(count, seed=0):
+    """Close prices moving about a pip per bar from 1.1"""
+    return 1.1 + np.cumsum(np.random.default_rng(seed).normal(0, 1e-4, count), axis=-1)
+
+def random_bars(count, seed=0):
+    """High, low, close and volume of a random walk
+    
+    ``count`` may be a ``(symbols, bars)`` shape for batch tests.
+    """
+    rng = np.random.default_rng(seed)
+    close = 1.1 + np.cumsum(rng.normal(0, 1e-4, count), axis=-1)
+    spread = np.abs(rng.normal(0, 1e-4, count))
+    volume = rng.integers(1, 500, count).astype(np.float64)
+    return close + spread, close - spread, close, volume
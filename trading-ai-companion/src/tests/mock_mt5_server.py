@@ -32,6 +32,16 @@ mock_positions = [
     }
 ]
 
+mock_orders = [
+    {
+        'ticket': 223344,
+        'symbol': 'GBPUSD',
+        'type': 'BUY_LIMIT',
+        'volume': 0.1,
+        'price_open': 1.2500
+    }
+]
+
 @app.route('/api/v1/status')
 def get_status():
     return jsonify({
@@ -44,13 +54,21 @@ def get_status():
 def get_account():
     return jsonify(mock_account_info)
 
-@app.route('/api/v1/market/data')
-def get_market_data():
-    symbol = request.args.get('symbol', 'EURUSD')
-    timeframe = request.args.get('timeframe', 'M1')
-    count = int(request.args.get('count', 100))
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400, 'W1': 604800
+}
+
+def generate_bars(count, timeframe='M1', since=None):
+    """Generate random OHLCV bars aligned to the timeframe, ending at the current bar"""
+    step = TIMEFRAME_SECONDS.get(timeframe, 60)
+    current_bar = int(time.time() // step) * step
+    
+    if since is not None:
+        # Bars at or after `since`, capped to the newest `count`
+        first_bar = int(-(-float(since) // step)) * step
+        count = min(count, max(0, (current_bar - first_bar) // step + 1))
     
-    # Generate mock market data
     bars = []
     base_price = 1.0500
     for i in range(count):
@@ -60,13 +78,30 @@ def get_market_data():
         close_price = random.uniform(low_price, high_price)
         
         bars.append({
-            'timestamp': time.time() - (count - i) * 60,
+            'timestamp': current_bar - (count - 1 - i) * step,
             'open': round(open_price, 5),
             'high': round(high_price, 5),
             'low': round(low_price, 5),
             'close': round(close_price, 5),
             'volume': random.randint(100, 1000)
         })
+    return bars
+
+@app.route('/api/v1/market/data')
+def get_market_data():
+    symbol = request.args.get('symbol', 'EURUSD')
+    timeframe = request.args.get('timeframe', 'M1')
+    count = int(request.args.get('count', 100))
+    since = request.args.get('since', type=float)
+    bars = generate_bars(count, timeframe, since)
+    
+    if request.args.get('format') == 'columnar':
+        fields = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+        return jsonify({
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'columns': {field: [bar[field] for bar in bars] for field in fields}
+        })
     
     return jsonify({
         'symbol': symbol,
@@ -74,12 +109,81 @@ def get_market_data():
         'bars': bars
     })
 
+@app.route('/api/v1/market/data/batch')
+def get_market_data_batch():
+    symbols = request.args.get('symbols', 'EURUSD').split(',')
+    timeframes = request.args.get('timeframes', 'M1').split(',')
+    count = int(request.args.get('count', 100))
+    
+    series = []
+    for symbol in symbols:
+        for timeframe in timeframes:
+            series.append({
+                'symbol': symbol,
+                'timeframe': timeframe,
+                'bars': generate_bars(count, timeframe)
+            })
+    
+    return jsonify({
+        'success': True,
+        'series': series
+    })
+
 @app.route('/api/v1/trade/positions')
 def get_positions():
     return jsonify({
         'positions': mock_positions
     })
 
+@app.route('/api/v1/trade/position/<int:ticket>', methods=['DELETE'])
+def close_position(ticket):
+    return jsonify(close_ticket(ticket, mock_positions))
+
+@app.route('/api/v1/trade/positions/close', methods=['POST'])
+def close_positions():
+    tickets = requested_tickets()
+    if not tickets:
+        return jsonify(NO_TICKETS)
+    return jsonify({
+        'success': True,
+        'results': [close_ticket(ticket, mock_positions) for ticket in tickets]
+    })
+
+@app.route('/api/v1/trade/orders')
+def get_orders():
+    return jsonify({
+        'orders': mock_orders
+    })
+
+@app.route('/api/v1/trade/order/<int:ticket>', methods=['DELETE'])
+def cancel_order(ticket):
+    return jsonify(close_ticket(ticket, mock_orders))
+
+@app.route('/api/v1/trade/orders/cancel', methods=['POST'])
+def cancel_orders():
+    tickets = requested_tickets()
+    if not tickets:
+        return jsonify(NO_TICKETS)
+    return jsonify({
+        'success': True,
+        'results': [close_ticket(ticket, mock_orders) for ticket in tickets]
+    })
+
+NO_TICKETS = {'success': False, 'error': 'A non-empty tickets list is required'}
+
+def requested_tickets():
+    """Tickets listed in a bulk request body, empty when missing or malformed"""
+    tickets = (request.get_json(silent=True) or {}).get('tickets')
+    if not isinstance(tickets, list) or not all(isinstance(t, int) and t > 0 for t in tickets):
+        return []
+    return tickets
+
+def close_ticket(ticket, items):
+    """Mock close/cancel result for one ticket"""
+    if any(item['ticket'] == ticket for item in items):
+        return {'ticket': ticket, 'success': True}
+    return {'ticket': ticket, 'success': False, 'error': 'Ticket not found'}
+
 @app.route('/api/v1/ping')
 def ping():
     return jsonify({
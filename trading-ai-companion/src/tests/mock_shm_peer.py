@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Mock MT5 Shared Memory Peer for Testing
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.modules.mt5_connector.shm_bridge import MT5SharedMemoryBridge
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY']
+
+def handle_request(request):
+    """Answer bridge commands the way the MT5 EA would"""
+    command = request.get('command')
+    data = request.get('data', {})
+    if command == 'ping':
+        return {'success': True, 'message': 'pong'}
+    if command == 'get_account_info':
+        return {'success': True, 'login': 12345678, 'balance': 10000.0, 'equity': 10050.0,
+                'currency': 'USD', 'leverage': 100}
+    if command == 'get_symbol_info':
+        return {'success': True, 'symbol': data.get('symbol', 'EURUSD'), 'digits': 5, 'point': 0.00001}
+    return {'success': True, 'command': command, 'data': data}
+
+def start_peer(bridge_path: str, **ring_options) -> MT5SharedMemoryBridge:
+    """Create the shared file and serve requests from a background thread"""
+    peer = MT5SharedMemoryBridge(bridge_path, **ring_options)
+    peer.create()
+    peer.start_message_loop(handle_request)
+    return peer
+
+def run_peer(bridge_path: str, ticks_per_second: int = 50, ready=None, stop=None):
+    """Serve requests and publish random ticks until ``stop`` is set"""
+    peer = start_peer(bridge_path)
+    if ready is not None:
+        ready.set()
+    
+    prices = {symbol: 1.0500 + random.uniform(-0.05, 0.05) for symbol in SYMBOLS}
+    try:
+        while stop is None or not stop.is_set():
+            for symbol in SYMBOLS:
+                prices[symbol] += random.uniform(-0.0002, 0.0002)
+                bid = round(prices[symbol], 5)
+                peer.publish_tick(symbol, {'time': time.time(), 'bid': bid, 'ask': round(bid + 0.0001, 5),
+                                           'last': bid, 'volume': random.randint(1, 10)})
+            time.sleep(1.0 / ticks_per_second)
+    finally:
+        peer.close()
+
+if __name__ == '__main__':
+    bridge_path = sys.argv[1] if len(sys.argv) > 1 else None
+    print("🚀 Starting Mock MT5 Shared Memory Peer...")
+    print(f"   Mapping {MT5SharedMemoryBridge(bridge_path).path}")
+    print("   Press Ctrl+C to stop")
+    print()
+    
+    run_peer(bridge_path)
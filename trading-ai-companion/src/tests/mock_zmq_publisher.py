@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Mock MT5 ZMQ Tick/Bar Publisher for Testing
+"""
+
+import sys
+import time
+import random
+from pathlib import Path
+
+# Add project root to path
+sys.path.append(str(Path(__file__).parent.parent.parent))
+
+from src.modules.mt5_connector.zmq_bridge import MT5ZMQBridge
+
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY']
+
+def run_publisher(host: str = "localhost", pub_port: int = 5556, ticks_per_second: int = 50):
+    """Publish random ticks and a closed M1 bar per symbol every minute"""
+    bridge = MT5ZMQBridge(host=host)
+    bridge.start_publisher(pub_port)
+    
+    prices = {symbol: 1.0500 + random.uniform(-0.05, 0.05) for symbol in SYMBOLS}
+    bars = {}
+    
+    try:
+        while True:
+            now = time.time()
+            for symbol in SYMBOLS:
+                prices[symbol] += random.uniform(-0.0002, 0.0002)
+                bid = round(prices[symbol], 5)
+                bridge.publish_tick(symbol, {
+                    'time': now, 'bid': bid, 'ask': round(bid + 0.0001, 5),
+                    'last': bid, 'volume': random.randint(1, 10)
+                })
+                
+                # Aggregate ticks into M1 bars, publishing each bar once it closes
+                minute = int(now // 60) * 60
+                bar = bars.get(symbol)
+                if bar and bar['timestamp'] != minute:
+                    bridge.publish_bar(symbol, 'M1', bar)
+                    bar = None
+                if bar is None:
+                    bar = bars[symbol] = {'timestamp': minute, 'open': bid, 'high': bid,
+                                          'low': bid, 'close': bid, 'volume': 0}
+                bar['high'] = max(bar['high'], bid)
+                bar['low'] = min(bar['low'], bid)
+                bar['close'] = bid
+                bar['volume'] += 1
+            
+            time.sleep(1.0 / ticks_per_second)
+    finally:
+        bridge.close()
+
+if __name__ == '__main__':
+    print("🚀 Starting Mock MT5 ZMQ Publisher...")
+    print("   Publishing on tcp://localhost:5556")
+    print("   Press Ctrl+C to stop")
+    print()
+    
+    run_publisher()
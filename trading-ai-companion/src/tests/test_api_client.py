@@ -12,7 +12,7 @@ import json
 # Add src to path
 sys.path.append(str(Path(__file__).parent.parent))
 
-from modules.mt5_connector.api_client import MT5APIClient
+from modules.mt5_connector.api_client import MT5APIClient, MT5APIError
 
 class TestMT5APIClient(unittest.TestCase):
     def setUp(self):
@@ -139,5 +139,196 @@ class TestMT5APIClient(unittest.TestCase):
         mock_make_request.assert_called_once_with('GET', '/api/v1/trade/positions')
         print("✓ Positions retrieval working")
 
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_get_market_data_many_batch(self, mock_make_request):
+        """Test batched market data retrieval"""
+        mock_make_request.return_value = {
+            'success': True,
+            'series': [
+                {'symbol': 'EURUSD', 'timeframe': 'M1', 'bars': []},
+                {'symbol': 'GBPUSD', 'timeframe': 'M1', 'bars': []}
+            ]
+        }
+        
+        result = self.client.get_market_data_many(['eurusd', 'gbpusd'], 'm1', 50)
+        
+        self.assertEqual(set(result.keys()), {'EURUSD', 'GBPUSD'})
+        self.assertEqual(result['GBPUSD']['M1']['symbol'], 'GBPUSD')
+        self.assertTrue(self.client.batch_supported)
+        mock_make_request.assert_called_once_with(
+            'GET', '/api/v1/market/data/batch',
+            params={'symbols': 'EURUSD,GBPUSD', 'timeframes': 'M1', 'count': 50}
+        )
+        print("✓ Batched market data retrieval working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_get_market_data_many_fallback(self, mock_make_request):
+        """Test concurrent fallback when the batch route is missing"""
+        def fake_request(method, endpoint, **kwargs):
+            if endpoint == '/api/v1/market/data/batch':
+                raise MT5APIError("Not found", status_code=404)
+            params = kwargs['params']
+            return {'symbol': params['symbol'], 'timeframe': params['timeframe'], 'bars': []}
+        mock_make_request.side_effect = fake_request
+        
+        result = self.client.get_market_data_many(['EURUSD', 'GBPUSD'], ['M1', 'H1'], 10)
+        
+        self.assertFalse(self.client.batch_supported)
+        self.assertEqual(result['EURUSD']['H1']['timeframe'], 'H1')
+        self.assertEqual(result['GBPUSD']['M1']['symbol'], 'GBPUSD')
+        self.assertEqual(mock_make_request.call_count, 5)
+        
+        # Unsupported batch route is not probed again
+        mock_make_request.reset_mock()
+        self.client.get_market_data_many(['EURUSD'], 'M1', 10)
+        mock_make_request.assert_called_once_with(
+            'GET', '/api/v1/market/data',
+            params={'symbol': 'EURUSD', 'timeframe': 'M1', 'count': 10}
+        )
+        print("✓ Concurrent market data fallback working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_get_market_data_many_batch_error(self, mock_make_request):
+        """Test a batch error payload only falls back for that call"""
+        replies = [{'success': False, 'error': 'Unknown symbol XAUUSD'}]
+        def fake_request(method, endpoint, **kwargs):
+            if endpoint == '/api/v1/market/data/batch':
+                return replies.pop(0) if replies else {'series': []}
+            return {'symbol': kwargs['params']['symbol'], 'bars': []}
+        mock_make_request.side_effect = fake_request
+        
+        result = self.client.get_market_data_many(['EURUSD'], 'M1', 10)
+        
+        self.assertEqual(result['EURUSD']['M1']['symbol'], 'EURUSD')
+        self.assertIsNone(self.client.batch_supported)
+        self.assertEqual(self.client.get_market_data_many(['EURUSD'], 'M1', 10), {})
+        self.assertTrue(self.client.batch_supported)
+        
+        # The EA's answer for a missing route disables the batch route
+        self.client.batch_supported = None
+        mock_make_request.side_effect = None
+        mock_make_request.return_value = {'success': False, 'error': 'Endpoint not found'}
+        self.client.get_market_data_many(['EURUSD'], 'M1', 10)
+        self.assertFalse(self.client.batch_supported)
+        print("✓ Batch market data error handling working")
+
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_get_market_data_cached_incremental(self, mock_make_request):
+        """Test cached market data only downloads bars since the last one"""
+        def bar(ts, close):
+            return {'timestamp': ts, 'open': close, 'high': close, 'low': close, 'close': close, 'volume': 1}
+        
+        mock_make_request.return_value = {'bars': [bar(60 * i, 1.0 + i) for i in range(5)]}
+        first = self.client.get_market_data_cached('EURUSD', 'M1', 5)
+        self.assertEqual(first['fetched'], 5)
+        
+        # Forming bar re-sent with a new close plus one new bar
+        mock_make_request.return_value = {'bars': [bar(240, 9.0), bar(300, 10.0)]}
+        second = self.client.get_market_data_cached('EURUSD', 'M1', 5)
+        
+        mock_make_request.assert_called_with(
+            'GET', '/api/v1/market/data',
+            params={'symbol': 'EURUSD', 'timeframe': 'M1', 'count': 5, 'since': 240}
+        )
+        self.assertEqual(second['fetched'], 2)
+        self.assertEqual([b['timestamp'] for b in second['bars']], [60, 120, 180, 240, 300])
+        self.assertEqual(second['bars'][-2]['close'], 9.0)
+        print("✓ Incremental cached market data working")
+
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_close_all_positions_bulk(self, mock_make_request):
+        """Test bulk close endpoint usage"""
+        def fake_request(method, endpoint, **kwargs):
+            if endpoint == '/api/v1/trade/positions':
+                return {'positions': [{'ticket': 1}, {'ticket': 2}]}
+            return {'results': [{'ticket': 1, 'success': True}, {'ticket': 2, 'success': False, 'error': 'Requote'}]}
+        mock_make_request.side_effect = fake_request
+        
+        result = self.client.close_all_positions()
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(result['failed_tickets'], [2])
+        self.assertIn('latency_ms', result)
+        mock_make_request.assert_called_with('POST', '/api/v1/trade/positions/close', json={'tickets': [1, 2]})
+        print("✓ Bulk position close working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_cancel_all_orders_fallback(self, mock_make_request):
+        """Test concurrent per-ticket fallback when bulk endpoint is missing"""
+        def fake_request(method, endpoint, **kwargs):
+            if endpoint == '/api/v1/trade/orders':
+                return {'orders': [{'ticket': t} for t in range(1, 6)]}
+            if endpoint == '/api/v1/trade/orders/cancel':
+                raise MT5APIError("Not found", status_code=404)
+            return {'success': True}
+        mock_make_request.side_effect = fake_request
+        
+        result = self.client.cancel_all_orders()
+        
+        self.assertTrue(result['success'])
+        self.assertFalse(self.client.bulk_trade_supported)
+        self.assertEqual([r['ticket'] for r in result['cancelled_orders']], [1, 2, 3, 4, 5])
+        mock_make_request.assert_any_call('DELETE', '/api/v1/trade/order/3')
+        print("✓ Concurrent order cancel fallback working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_close_all_positions_unexpected_reply(self, mock_make_request):
+        """Test an unexpected bulk reply is an error, not a per-ticket resend"""
+        def fake_request(method, endpoint, **kwargs):
+            if endpoint == '/api/v1/trade/positions':
+                return {'positions': [{'ticket': 1}, {'ticket': 2}]}
+            return {'success': False, 'error': 'Trade context busy'}
+        mock_make_request.side_effect = fake_request
+        
+        result = self.client.close_all_positions()
+        
+        self.assertFalse(result['success'])
+        self.assertIn('Trade context busy', result['error'])
+        self.assertIsNone(self.client.bulk_trade_supported)
+        self.assertEqual([c.args[0] for c in mock_make_request.call_args_list], ['GET', 'POST'])
+        
+        # The EA's answer for a missing route still falls back
+        mock_make_request.side_effect = lambda method, endpoint, **kwargs: (
+            {'positions': [{'ticket': 1}]} if endpoint == '/api/v1/trade/positions'
+            else {'success': False, 'error': 'Endpoint not found'} if endpoint.endswith('/close')
+            else {'success': True})
+        self.assertTrue(self.client.close_all_positions()['success'])
+        self.assertFalse(self.client.bulk_trade_supported)
+        mock_make_request.assert_called_with('DELETE', '/api/v1/trade/position/1')
+        print("✓ Unexpected bulk reply handling working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_account_info_cached(self, mock_make_request):
+        """Test balance and equity reads share one cached account request"""
+        mock_make_request.return_value = {'balance': 10000.0, 'equity': 10050.0}
+        
+        self.assertEqual(self.client.get_account_balance(), 10000.0)
+        self.assertEqual(self.client.get_account_equity(), 10050.0)
+        self.client.get_account_info()['balance'] = 0
+        self.assertEqual(self.client.get_account_balance(), 10000.0)
+        mock_make_request.assert_called_once_with('GET', '/api/v1/account')
+        
+        # Trades drop the cached account
+        self.client.place_order('EURUSD', 'BUY', 0.1)
+        self.client.get_account_info()
+        self.assertEqual(mock_make_request.call_args_list.count((('GET', '/api/v1/account'),)), 2)
+        self.client.get_account_info(refresh=True)
+        self.assertEqual(mock_make_request.call_args_list.count((('GET', '/api/v1/account'),)), 3)
+        print("✓ Cached account info working")
+    
+    @patch('modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_symbol_reads_cached(self, mock_make_request):
+        """Test symbol info is cached per symbol and failures are not cached"""
+        mock_make_request.side_effect = [MT5APIError("Connection failed"), {'symbol': 'EURUSD', 'digits': 5},
+                                         {'symbols': ['EURUSD', 'GBPUSD']}]
+        
+        self.assertEqual(self.client.get_symbol_info('eurusd'), {})
+        self.assertEqual(self.client.get_symbol_info('eurusd')['digits'], 5)
+        self.assertEqual(self.client.get_symbol_info('EURUSD')['digits'], 5)
+        self.assertEqual(self.client.get_available_symbols(), ['EURUSD', 'GBPUSD'])
+        self.assertEqual(self.client.get_available_symbols(), ['EURUSD', 'GBPUSD'])
+        self.assertEqual(mock_make_request.call_count, 3)
+        print("✓ Cached symbol reads working")
+
 if __name__ == '__main__':
     unittest.main()
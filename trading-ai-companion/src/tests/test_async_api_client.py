@@ -0,0 +1,143 @@
+"""
+Test Async MT5 API Client
+"""
+
+import sys
+import asyncio
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.async_api_client import AsyncMT5APIClient
+
+class TestAsyncMT5APIClient(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        """Set up test fixtures before each test method."""
+        self.client = AsyncMT5APIClient(base_url="http://localhost:8082")
+    
+    async def asyncTearDown(self):
+        await self.client.close()
+    
+    @patch('src.modules.mt5_connector.async_api_client.AsyncMT5APIClient._make_request',
+           new_callable=AsyncMock)
+    async def test_get_account_info(self, mock_make_request):
+        """Test account info retrieval"""
+        mock_make_request.return_value = {'balance': 10000.0, 'equity': 10050.0}
+        
+        result = await self.client.get_account_info()
+        
+        self.assertEqual(result['equity'], 10050.0)
+        mock_make_request.assert_awaited_once_with('GET', '/api/v1/account')
+        print("✓ Async account info retrieval working")
+    
+    @patch('src.modules.mt5_connector.async_api_client.AsyncMT5APIClient._make_request',
+           new_callable=AsyncMock)
+    async def test_place_order_error(self, mock_make_request):
+        """Test order placement failure returns error dict"""
+        mock_make_request.side_effect = Exception("Connection failed")
+        
+        result = await self.client.place_order('EURUSD', 'BUY', 0.1)
+        
+        self.assertFalse(result['success'])
+        self.assertIn('Connection failed', result['error'])
+        print("✓ Async order error handling working")
+    
+    @patch('src.modules.mt5_connector.async_api_client.AsyncMT5APIClient._make_request',
+           new_callable=AsyncMock)
+    async def test_account_info_cached(self, mock_make_request):
+        """Test account reads are served from the cache until a trade"""
+        mock_make_request.return_value = {'balance': 10000.0, 'equity': 10050.0}
+        
+        self.assertEqual(await self.client.get_account_balance(), 10000.0)
+        self.assertEqual(await self.client.get_account_equity(), 10050.0)
+        self.assertEqual(mock_make_request.await_count, 1)
+        
+        await self.client.close_position(123)
+        await self.client.get_account_info()
+        self.assertEqual(mock_make_request.await_count, 3)
+        print("✓ Async cached account info working")
+    
+    async def test_max_in_flight_bound(self):
+        """Test concurrent requests never exceed max_in_flight"""
+        state = {'active': 0, 'peak': 0}
+        
+        async def market_data(request):
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+            await asyncio.sleep(0.02)
+            state['active'] -= 1
+            return web.json_response({'symbol': request.query['symbol'], 'bars': []})
+        
+        app = web.Application()
+        app.router.add_get('/api/v1/market/data', market_data)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            client = AsyncMT5APIClient(base_url=str(server.make_url('')), max_in_flight=3)
+            client.batch_supported = False
+            symbols = [f"SYM{i}" for i in range(12)]
+            
+            result = await client.get_market_data_many(symbols, 'M1', 10)
+            await client.close()
+        finally:
+            await server.close()
+        
+        self.assertEqual(len(result), 12)
+        self.assertEqual(result['SYM5']['M1']['symbol'], 'SYM5')
+        self.assertLessEqual(state['peak'], 3)
+        self.assertGreater(state['peak'], 1)
+        print(f"✓ Async in-flight bound working - peak concurrency: {state['peak']}")
+
+    async def test_retries_only_idempotent_methods(self):
+        """Test 5xx replies retry GETs but never resend an order POST"""
+        calls = {'GET': 0, 'POST': 0}
+        
+        async def bad_gateway(request):
+            calls[request.method] += 1
+            return web.json_response({'error': 'bad gateway'}, status=502)
+        
+        app = web.Application()
+        app.router.add_get('/api/v1/account', bad_gateway)
+        app.router.add_post('/api/v1/trade/order', bad_gateway)
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            client = AsyncMT5APIClient(base_url=str(server.make_url('')), max_retries=2, backoff_factor=0)
+            order = await client.place_order('EURUSD', 'BUY', 0.1)
+            account = await client.get_account_info()
+            await client.close()
+        finally:
+            await server.close()
+        
+        self.assertFalse(order['success'])
+        self.assertEqual(account, {})
+        self.assertEqual(calls, {'GET': 3, 'POST': 1})
+        print("✓ Async idempotent-only retries working")
+    
+    @patch('src.modules.mt5_connector.async_api_client.AsyncMT5APIClient._make_request',
+           new_callable=AsyncMock)
+    async def test_close_all_positions_reports_failures(self, mock_make_request):
+        """Test bulk close lists the tickets that failed"""
+        async def respond(method, endpoint, **kwargs):
+            if method == 'GET':
+                return {'positions': [{'ticket': 1}, {'ticket': 2}]}
+            if endpoint.endswith('/2'):
+                raise Exception("Position locked")
+            return {'success': True}
+        mock_make_request.side_effect = respond
+        
+        result = await self.client.close_all_positions()
+        
+        self.assertFalse(result['success'])
+        self.assertEqual(result['failed_tickets'], [2])
+        self.assertEqual(len(result['closed_positions']), 2)
+        print("✓ Async bulk close failure reporting working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+"""
+Test Async MT5 Socket Client
+"""
+
+import os
+import sys
+import time
+import asyncio
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.socket_bridge import MT5SocketBridge
+from src.modules.mt5_connector.async_socket_client import AsyncMT5SocketClient
+from src.modules.mt5_connector.transports import transport_failure
+
+def slow_handler(message):
+    """Echo the request data after the requested delay"""
+    data = message.get('data', {})
+    time.sleep(data.get('delay', 0))
+    return {'success': True, 'command': message.get('command'), 'data': data}
+
+class TestAsyncMT5SocketClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, 'bridge.sock')
+        self.server = MT5SocketBridge(self.socket_path)
+        self.server.start_server()
+        self.server_thread = threading.Thread(target=self.server.listen_for_connections,
+                                              args=(slow_handler,), kwargs={'concurrent': True, 'max_workers': 8},
+                                              daemon=True)
+        self.server_thread.start()
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.server.close()
+        self.server_thread.join(timeout=2)
+        self.tmpdir.cleanup()
+    
+    async def test_responses_resolve_out_of_order(self):
+        """Test a fast request is not held up behind a slow one"""
+        async with AsyncMT5SocketClient(self.socket_path) as client:
+            finished = []
+            
+            async def call(name, delay):
+                response = await client.send_request('echo', {'name': name, 'delay': delay})
+                finished.append(response['data']['name'])
+            
+            await asyncio.gather(call('slow', 0.3), call('fast', 0))
+        self.assertEqual(finished, ['fast', 'slow'])
+        print("✓ Out-of-order async socket responses working")
+    
+    async def test_many_outstanding_requests(self):
+        """Test many pipelined requests on one connection"""
+        async with AsyncMT5SocketClient(self.socket_path) as client:
+            responses = await client.send_requests([('get_symbol_info', {'n': i}) for i in range(200)])
+            self.assertEqual(client.get_in_flight_count(), 0)
+        self.assertEqual([r['data']['n'] for r in responses], list(range(200)))
+        print("✓ Pipelined async socket requests working")
+    
+    async def test_per_request_timeout(self):
+        """Test timeouts apply per request and leave the connection usable"""
+        async with AsyncMT5SocketClient(self.socket_path, timeout=5) as client:
+            slow, fast = await asyncio.gather(
+                client.send_request('echo', {'delay': 0.5}, timeout=0.05),
+                client.send_request('echo', {'delay': 0})
+            )
+            self.assertEqual(slow, transport_failure('Request timeout'))
+            self.assertTrue(fast['success'])
+            
+            # The late response is discarded and later requests still match
+            await asyncio.sleep(0.6)
+            response = await client.send_request('ping')
+        self.assertEqual(response['command'], 'ping')
+        print("✓ Per-request async socket timeouts working")
+    
+    async def test_sequential_server_echoes_ids(self):
+        """Test the client also works against the single-client server mode"""
+        self.server.close()
+        self.server_thread.join(timeout=2)
+        path = os.path.join(self.tmpdir.name, 'sequential.sock')
+        server = MT5SocketBridge(path)
+        server.start_server()
+        threading.Thread(target=server.listen_for_connections, args=(slow_handler,), daemon=True).start()
+        try:
+            async with AsyncMT5SocketClient(path) as client:
+                responses = await client.send_requests([('echo', {'n': i}) for i in range(10)])
+        finally:
+            server.close()
+        self.assertEqual([r['data']['n'] for r in responses], list(range(10)))
+        print("✓ Async client against sequential server working")
+    
+    async def test_connection_lost(self):
+        """Test outstanding requests fail when the server goes away"""
+        client = AsyncMT5SocketClient(self.socket_path)
+        await client.connect()
+        pending = asyncio.ensure_future(client.send_request('echo', {'delay': 0.3}))
+        await asyncio.sleep(0.05)
+        self.server.close()
+        self.server_thread.join(timeout=2)
+        
+        response = await pending
+        await client.close()
+        self.assertFalse(response['success'])
+        print("✓ Async socket connection loss handling working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Test Bar Series
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.bar_series import BarSeries
+from src.modules.mt5_connector.api_client import MT5APIClient
+from modules.data_processor.technical_indicators import TechnicalIndicators
+
+class TestBarSeries(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.bars = [
+            {'timestamp': 60.0 * i, 'open': 1.0 + i, 'high': 2.0 + i,
+             'low': 0.5 + i, 'close': 1.5 + i, 'volume': 100 + i}
+            for i in range(30)
+        ]
+    
+    def test_from_bars(self):
+        """Test conversion from list-of-dicts bars"""
+        series = BarSeries.from_bars(self.bars, 'EURUSD', 'M1')
+        
+        self.assertEqual(len(series), 30)
+        self.assertEqual(series.close[3], 4.5)
+        self.assertEqual(series.volume[-1], 129)
+        self.assertEqual(series.to_bars()[5], self.bars[5])
+        print("✓ BarSeries from bars working")
+    
+    def test_from_columns(self):
+        """Test columnar conversion matches bar conversion"""
+        columns = {field: [bar[field] for bar in self.bars] for field in BarSeries.FIELDS}
+        
+        from_columns = BarSeries.from_response({'symbol': 'EURUSD', 'columns': columns})
+        from_bars = BarSeries.from_bars(self.bars)
+        
+        np.testing.assert_array_equal(from_columns.data, from_bars.data)
+        self.assertEqual(from_columns.symbol, 'EURUSD')
+        print("✓ BarSeries from columns working")
+    
+    def test_zero_copy_views(self):
+        """Test field accessors are contiguous read-only views"""
+        series = BarSeries.from_bars(self.bars)
+        close = series.close
+        
+        self.assertTrue(np.shares_memory(close, series.data))
+        self.assertTrue(close.flags.c_contiguous)
+        self.assertFalse(close.flags.writeable)
+        self.assertTrue(np.shares_memory(series[10:].high, series.data))
+        print("✓ BarSeries zero-copy views working")
+    
+    def test_integer_index(self):
+        """Test Python and NumPy integers select a single bar"""
+        series = BarSeries.from_bars(self.bars)
+        
+        for index in (3, np.int64(3), np.int32(-27)):
+            self.assertEqual(series[index].to_bars(), [self.bars[3]])
+        self.assertEqual(series[np.int64(-1)].to_bars(), [self.bars[-1]])
+        self.assertEqual(series[np.argmax(series.high)].to_bars(), [self.bars[-1]])
+        print("✓ BarSeries integer indexing working")
+    
+    def test_indicators_on_views(self):
+        """Test indicators accept BarSeries views directly"""
+        series = BarSeries.from_bars(self.bars)
+        indicators = TechnicalIndicators()
+        
+        self.assertEqual(indicators.calculate_rsi(series.close), 100)
+        self.assertIn('macd', indicators.calculate_macd(series.close))
+        print("✓ Indicators on BarSeries views working")
+    
+    @patch('src.modules.mt5_connector.api_client.MT5APIClient._make_request')
+    def test_client_get_bar_series(self, mock_make_request):
+        """Test client requests the columnar format"""
+        mock_make_request.return_value = {
+            'symbol': 'EURUSD', 'timeframe': 'M1',
+            'columns': {'timestamp': [0, 60], 'open': [1, 2], 'high': [1, 2],
+                        'low': [1, 2], 'close': [1.1, 2.1], 'volume': [5, 6]}
+        }
+        client = MT5APIClient()
+        
+        series = client.get_bar_series('eurusd', 'm1', 2)
+        
+        self.assertEqual(series.close.tolist(), [1.1, 2.1])
+        self.assertEqual(mock_make_request.call_args.kwargs['params']['format'], 'columnar')
+        print("✓ Client BarSeries retrieval working")
+
+if __name__ == '__main__':
+    unittest.main()
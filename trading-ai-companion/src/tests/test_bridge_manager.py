@@ -0,0 +1,215 @@
+"""
+Test MT5 File Bridge Manager
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.bridge_manager import MT5BridgeManager
+from src.modules.mt5_connector.file_watcher import create_file_watcher, PollingWatcher
+from src.modules.mt5_connector.transports import transport_failure
+
+def respond_to_requests(bridge_path: str, seen: list = None):
+    """Answer request files and journals like the MT5 EA would"""
+    def on_file(name: str):
+        if seen is not None:
+            seen.append(name)
+        if name.startswith('request_'):
+            with open(os.path.join(bridge_path, name), 'r') as f:
+                request = json.load(f)
+            with open(os.path.join(bridge_path, f"response_{request['id']}.json"), 'w') as f:
+                json.dump({'success': True, 'echo': request['command']}, f)
+        elif name.startswith('requests_'):
+            batch_id = name[len('requests_'):-len('.jsonl')]
+            with open(os.path.join(bridge_path, name), 'r') as f:
+                requests = [json.loads(line) for line in f]
+            temp_file = os.path.join(bridge_path, f".responses_{batch_id}.tmp")
+            with open(temp_file, 'w') as f:
+                for request in requests:
+                    f.write(json.dumps({'id': request['id'], 'success': True, 'echo': request['data']}) + '\n')
+            os.replace(temp_file, os.path.join(bridge_path, f"responses_{batch_id}.jsonl"))
+    
+    watcher = create_file_watcher(bridge_path, on_file, poll_interval=0.005)
+    watcher.start()
+    return watcher
+
+class TestFileWatcher(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.tmpdir.cleanup()
+    
+    def _assert_reports_new_file(self, watcher_factory):
+        seen = []
+        reported = threading.Event()
+        
+        def on_file(name):
+            seen.append(name)
+            reported.set()
+        
+        watcher = watcher_factory(on_file)
+        watcher.start()
+        try:
+            with open(os.path.join(self.path, 'response_1.json'), 'w') as f:
+                f.write('{}')
+            self.assertTrue(reported.wait(2))
+            self.assertIn('response_1.json', seen)
+        finally:
+            watcher.stop()
+    
+    def test_default_watcher_reports_files(self):
+        """Test the preferred watcher reports completed files"""
+        self._assert_reports_new_file(lambda cb: create_file_watcher(self.path, cb))
+        print("✓ Default file watcher working")
+    
+    def test_polling_fallback_reports_files(self):
+        """Test the polling fallback reports new files"""
+        watcher = create_file_watcher(self.path, lambda name: None, use_inotify=False)
+        self.assertIsInstance(watcher, PollingWatcher)
+        
+        self._assert_reports_new_file(lambda cb: PollingWatcher(self.path, cb, poll_interval=0.01))
+        print("✓ Polling fallback watcher working")
+
+class TestMT5BridgeManager(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = self.tmpdir.name
+        self.responder = respond_to_requests(self.path)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.responder.stop()
+        self.tmpdir.cleanup()
+    
+    def test_send_request_wakes_on_response(self):
+        """Test responses are picked up without the 100 ms poll delay"""
+        bridge = MT5BridgeManager(self.path)
+        try:
+            start = time.perf_counter()
+            response = bridge.send_request('ping', timeout=5)
+            elapsed = time.perf_counter() - start
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual(response, {'success': True, 'echo': 'ping'})
+        self.assertEqual(os.listdir(self.path), [])
+        if bridge.watcher.name == 'inotify':
+            self.assertLess(elapsed, 0.1)
+        print("✓ Event-driven response pickup working")
+    
+    def test_send_request_with_polling_watcher(self):
+        """Test the bridge still works with the polling fallback"""
+        bridge = MT5BridgeManager(self.path, use_inotify=False, poll_interval=0.01)
+        try:
+            response = bridge.send_request('get_account_info', timeout=5)
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertTrue(response['success'])
+        self.assertEqual(bridge.get_bridge_status()['watcher'], 'polling')
+        print("✓ Polling bridge fallback working")
+    
+    def test_send_request_timeout(self):
+        """Test an unanswered request times out and is cleaned up"""
+        self.responder.stop()
+        bridge = MT5BridgeManager(self.path)
+        try:
+            response = bridge.send_request('ping', timeout=0.2)
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual(response, transport_failure('Request timeout'))
+        self.assertEqual(os.listdir(self.path), [])
+        print("✓ Bridge request timeout working")
+    
+    def test_concurrent_requests_multiplexed(self):
+        """Test many requests in flight at once resolve by id, out of order"""
+        self.responder.stop()
+        bridge = MT5BridgeManager(self.path)
+        try:
+            bridge.start_bridge()
+            threads_before = threading.active_count()
+            futures = [bridge.submit_request('get_symbol_info', {'n': i}, timeout=5) for i in range(20)]
+            self.assertEqual(bridge.get_in_flight_count(), 20)
+            self.assertEqual(threading.active_count(), threads_before)
+            
+            # Answer newest first
+            for future in reversed(futures):
+                with open(os.path.join(self.path, f"request_{future.request_id}.json")) as f:
+                    request = json.load(f)
+                with open(os.path.join(self.path, f"response_{future.request_id}.json"), 'w') as f:
+                    json.dump({'success': True, 'n': request['data']['n']}, f)
+            
+            results = [future.result(timeout=5) for future in futures]
+            status = bridge.get_bridge_status()
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual([r['n'] for r in results], list(range(20)))
+        self.assertEqual(status['pending_requests'], 0)
+        self.assertEqual(status['cached_responses'], 0)
+        self.assertEqual(os.listdir(self.path), [])
+        print("✓ Multiplexed bridge requests working")
+    
+    def test_submitted_request_times_out(self):
+        """Test the worker fails futures that outlive their timeout"""
+        self.responder.stop()
+        bridge = MT5BridgeManager(self.path)
+        try:
+            future = bridge.submit_request('ping', timeout=0.1)
+            with self.assertRaises(TimeoutError):
+                future.result(timeout=2)
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual(bridge.get_in_flight_count(), 0)
+        print("✓ Bridge future timeout working")
+    
+    def test_batch_mode_journals(self):
+        """Test batch mode sends bulk queries through single journal files"""
+        self.responder.stop()
+        seen = []
+        self.responder = respond_to_requests(self.path, seen)
+        bridge = MT5BridgeManager(self.path, batch_mode=True, flush_interval=0.01)
+        try:
+            results = bridge.send_requests([('get_symbol_info', {'n': i}) for i in range(50)], timeout=5)
+            status = bridge.get_bridge_status()
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual([r['echo']['n'] for r in results], list(range(50)))
+        request_files = [name for name in seen if name.startswith('request')]
+        self.assertEqual(len(request_files), 1)
+        self.assertTrue(request_files[0].endswith('.jsonl'))
+        self.assertEqual(status['pending_batches'], 0)
+        self.assertEqual(os.listdir(self.path), [])
+        print("✓ Batched bridge journals working")
+    
+    def test_batch_mode_flushes_on_interval(self):
+        """Test single requests in batch mode are flushed by the worker"""
+        bridge = MT5BridgeManager(self.path, batch_mode=True, flush_interval=0.02)
+        try:
+            futures = [bridge.submit_request('ping', {'n': i}, timeout=5) for i in range(3)]
+            results = [future.result(timeout=5) for future in futures]
+        finally:
+            bridge.stop_bridge()
+        
+        self.assertEqual([r['echo']['n'] for r in results], [0, 1, 2])
+        print("✓ Batch flush interval working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Test MT5 History Store
+"""
+
+import os
+import sys
+import time
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.bar_series import BarSeries
+from src.modules.mt5_connector.history_store import HistoryStore, DAY_SECONDS
+from src.modules.mt5_connector.mt5_manager import MT5Manager
+from src.core.app import TradingAIApp
+
+def make_series(start, count, step=60, symbol='EURUSD', timeframe='M1', offset=0.0):
+    timestamps = start + step * np.arange(count, dtype=np.float64)
+    close = 1.1 + offset + np.arange(count) * 1e-5
+    return BarSeries.from_columns({
+        'timestamp': timestamps, 'open': close, 'high': close + 1e-4,
+        'low': close - 1e-4, 'close': close, 'volume': np.full(count, 100.0)
+    }, symbol, timeframe)
+
+class TestHistoryStore(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store = HistoryStore(self.tmpdir.name, retention_days=0)
+        # Three full days of M1 bars, ending before today
+        self.start = (int(time.time()) // DAY_SECONDS - 5) * DAY_SECONDS
+        self.series = make_series(self.start, 3 * 1440)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.tmpdir.cleanup()
+    
+    def test_partitioned_by_day(self):
+        """Test bars are written to one file per symbol/timeframe/day"""
+        self.assertEqual(self.store.write(self.series), 3 * 1440)
+        files = sorted(os.listdir(os.path.join(self.tmpdir.name, 'EURUSD', 'M1')))
+        self.assertEqual(len(files), 3)
+        self.assertTrue(all(name.endswith('.npy') for name in files))
+        self.assertEqual(self.store.get_stats()['files'], 3)
+        print("✓ History day partitioning working")
+    
+    def test_range_query(self):
+        """Test range reads return exactly the bars inside the bounds"""
+        self.store.write(self.series)
+        start, end = self.start + 1000 * 60, self.start + 2000 * 60
+        result = self.store.read('eurusd', 'm1', start, end)
+        
+        self.assertEqual(len(result), 1001)
+        self.assertEqual((result.timestamp[0], result.timestamp[-1]), (start, end))
+        np.testing.assert_array_equal(result.data, self.series.data[:, 1000:2001])
+        self.assertEqual(len(self.store.read('EURUSD', 'M1')), 3 * 1440)
+        self.assertEqual(len(self.store.read('GBPUSD', 'M1')), 0)
+        print("✓ History range queries working")
+    
+    def test_memory_mapped_reads(self):
+        """Test completed days are served as zero-copy memory-mapped views"""
+        self.store.write(self.series)
+        days = list(self.store.iter_days('EURUSD', 'M1'))
+        self.assertEqual(len(days), 3)
+        self.assertTrue(all(isinstance(day.data.base, np.memmap) or isinstance(day.data, np.memmap)
+                            for day in days))
+        
+        single_day = self.store.read('EURUSD', 'M1', self.start + 60, self.start + 120)
+        self.assertIsInstance(single_day.data, np.memmap)
+        self.assertFalse(single_day.close.flags.writeable)
+        print("✓ History memory-mapped reads working")
+    
+    def test_overwrite_merges_by_timestamp(self):
+        """Test re-written bars replace stored ones and new bars are merged in order"""
+        self.store.write(self.series[:100])
+        update = make_series(self.start + 90 * 60, 20, offset=1.0)
+        self.store.write(update)
+        
+        result = self.store.read('EURUSD', 'M1')
+        self.assertEqual(len(result), 110)
+        self.assertTrue(np.all(np.diff(result.timestamp) > 0))
+        self.assertEqual(result.close[89], self.series.close[89])
+        np.testing.assert_array_equal(result.close[90:], update.close)
+        self.assertEqual(self.store.last_timestamp('EURUSD', 'M1'), update.timestamp[-1])
+        np.testing.assert_array_equal(self.store.read_latest('EURUSD', 'M1', 5).close, update.close[-5:])
+        print("✓ History merge working")
+    
+    def test_retention(self):
+        """Test partitions older than the retention window are deleted"""
+        self.store.write(self.series)
+        store = HistoryStore(self.tmpdir.name, retention_days=2)
+        removed = store.enforce_retention(now=self.start + 3 * DAY_SECONDS + 1)
+        
+        self.assertEqual(removed, 1)
+        self.assertEqual(store.read('EURUSD', 'M1').timestamp[0], self.start + DAY_SECONDS)
+        print("✓ History retention working")
+    
+    def test_requires_symbol_and_timeframe(self):
+        """Test unlabeled bars are rejected"""
+        with self.assertRaises(ValueError):
+            self.store.write(make_series(self.start, 10, symbol=''))
+        print("✓ History validation working")
+
+class TestMT5ManagerHistory(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        with patch.object(MT5Manager, '_initialize_communication'):
+            self.manager = MT5Manager({'auto_launch': False}, {'history_path': self.tmpdir.name})
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.tmpdir.cleanup()
+    
+    def test_market_data_written_through(self):
+        """Test downloaded bars are persisted and served from the store"""
+        bars = make_series((int(time.time()) // DAY_SECONDS - 1) * DAY_SECONDS, 50).to_bars()
+        response = {'symbol': 'EURUSD', 'timeframe': 'M1', 'bars': bars}
+        with patch.object(self.manager, '_send_request', return_value=response):
+            self.assertEqual(self.manager.get_market_data('eurusd', 'm1', 50), response)
+        
+        history = self.manager.get_history('EURUSD', 'M1', start=bars[10]['timestamp'])
+        self.assertEqual(len(history), 40)
+        self.assertEqual(history.to_bars()[0], bars[10])
+        print("✓ Market data write-through working")
+    
+    def test_failed_response_not_stored(self):
+        """Test error responses leave the store untouched"""
+        with patch.object(self.manager, '_send_request', return_value={'error': 'timeout', 'success': False}):
+            self.manager.get_market_data('EURUSD')
+        self.assertEqual(len(self.manager.get_history('EURUSD')), 0)
+        print("✓ Failed market data not stored")
+    
+    def test_history_configured_from_data_section(self):
+        """Test the app builds the store from the data section of the shipped config"""
+        project_root = Path(__file__).resolve().parents[2]
+        app = TradingAIApp(str(project_root / 'config' / 'config.yaml'))
+        data_config = app.config['data']
+        self.assertNotIn('history_path', app.config['mt5'])
+        
+        with patch.object(MT5Manager, '_initialize_communication'), \
+             patch.object(MT5Manager, 'initialize', return_value=True), \
+             patch('src.modules.mt5_connector.mt5_manager.HistoryStore') as store:
+            self.assertTrue(app.initialize_mt5())
+        
+        # Relative to the project, wherever the app is started from
+        store.assert_called_once_with(str(project_root / data_config['history_path']),
+                                      data_config['market_data_retention'])
+        self.assertIs(app.mt5_manager.history_store, store.return_value)
+        print("✓ History store configured from data section")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,188 @@
+"""
+Test Extended Indicator Catalog
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.data_processor import indicator_engine
+from src.modules.data_processor.technical_indicators import TALIB_AVAILABLE, TechnicalIndicators
+from src.tests.market_fixtures import random_bars
+
+def reference_adx(high, low, close, period):
+    """ta-lib's PLUS_DI/MINUS_DI/ADX algorithm written as a plain loop"""
+    n = len(close)
+    plus_di, minus_di, adx = (np.full(n, np.nan) for _ in range(3))
+    plus_dm = minus_dm = ranges = 0.0
+    dx_values = []
+    for today in range(1, n):
+        up, down = high[today] - high[today - 1], low[today - 1] - low[today]
+        up = up if up > 0 and up > down else 0.0
+        down = down if down > 0 and down > up else 0.0
+        true_range = max(high[today] - low[today], abs(high[today] - close[today - 1]),
+                         abs(low[today] - close[today - 1]))
+        if today < period:
+            # Seed with plain sums of the first period - 1 moves
+            plus_dm, minus_dm, ranges = plus_dm + up, minus_dm + down, ranges + true_range
+            continue
+        plus_dm = plus_dm - plus_dm / period + up
+        minus_dm = minus_dm - minus_dm / period + down
+        ranges = ranges - ranges / period + true_range
+        plus_di[today] = 100 * plus_dm / ranges if ranges else 0.0
+        minus_di[today] = 100 * minus_dm / ranges if ranges else 0.0
+        total = plus_di[today] + minus_di[today]
+        dx = 100 * abs(plus_di[today] - minus_di[today]) / total if total else 0.0
+        if len(dx_values) < period:
+            dx_values.append(dx)
+            if len(dx_values) == period:
+                adx[today] = sum(dx_values) / period
+        else:
+            adx[today] = (adx[today - 1] * (period - 1) + dx) / period
+    return {'plus_di': plus_di, 'minus_di': minus_di, 'adx': adx}
+
+class TestIndicatorCatalog(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.indicators = TechnicalIndicators()
+        self.high, self.low, self.close, self.volume = random_bars(600, seed=11)
+    
+    def test_stochastic(self):
+        """Test %K/%D against a direct window computation"""
+        result = indicator_engine.stochastic(self.high, self.low, self.close, 5, 3, 3)
+        fast_k = np.full(len(self.close), np.nan)
+        for i in range(4, len(self.close)):
+            lowest, highest = self.low[i - 4:i + 1].min(), self.high[i - 4:i + 1].max()
+            fast_k[i] = 100 * (self.close[i] - lowest) / (highest - lowest)
+        k = np.array([fast_k[i - 2:i + 1].mean() if i >= 6 else np.nan for i in range(len(fast_k))])
+        np.testing.assert_allclose(result['k'], k)
+        self.assertEqual(int(np.isnan(result['d']).sum()), 8)
+        self.assertTrue(np.nanmin(result['k']) >= 0 and np.nanmax(result['k']) <= 100)
+        print("✓ Stochastic working")
+    
+    def test_cci(self):
+        """Test CCI against a direct window computation"""
+        result = indicator_engine.cci(self.high, self.low, self.close, 14)
+        typical = (self.high + self.low + self.close) / 3
+        for i in (13, 200, 599):
+            window = typical[i - 13:i + 1]
+            deviation = np.abs(window - window.mean()).mean()
+            self.assertAlmostEqual(result[i], (typical[i] - window.mean()) / (0.015 * deviation), places=8)
+        self.assertTrue(np.isnan(result[12]))
+        self.assertEqual(indicator_engine.cci([1.0] * 20, [1.0] * 20, [1.0] * 20, 14)[-1], 0.0)
+        print("✓ CCI working")
+    
+    def test_adx(self):
+        """Test ADX and the DI lines match ta-lib's algorithm from the first value"""
+        result = indicator_engine.adx(self.high, self.low, self.close, 14)
+        for period in (5, 14):
+            expected = reference_adx(self.high, self.low, self.close, period)
+            for name, values in indicator_engine.adx(self.high, self.low, self.close, period).items():
+                np.testing.assert_allclose(values, expected[name], rtol=1e-10, atol=1e-12)
+        self.assertTrue(np.isnan(result['plus_di'][13]) and not np.isnan(result['plus_di'][14]))
+        self.assertTrue(np.isnan(result['adx'][26]) and not np.isnan(result['adx'][27]))
+        for values in result.values():
+            valid = values[~np.isnan(values)]
+            self.assertTrue(np.all((valid >= 0) & (valid <= 100)))
+        
+        # A steady uptrend has no downward movement
+        trend = indicator_engine.adx(np.arange(40) + 2.0, np.arange(40) + 1.0, np.arange(40) + 1.5, 14)
+        self.assertEqual(trend['minus_di'][-1], 0.0)
+        self.assertAlmostEqual(trend['adx'][-1], 100.0)
+        print("✓ ADX working")
+    
+    def test_vwap_sessions(self):
+        """Test VWAP restarts at each session boundary"""
+        high = np.array([11.0, 12.0, 13.0, 21.0, 22.0])
+        low = high - 2
+        close = high - 1
+        volume = np.array([1.0, 3.0, 2.0, 5.0, 5.0])
+        timestamps = np.array([0, 3600, 7200, 86400, 90000])
+        result = indicator_engine.vwap(high, low, close, volume, timestamps)
+        np.testing.assert_allclose(result, [10.0, 10.75, 67.0 / 6, 20.0, 20.5])
+        self.assertAlmostEqual(indicator_engine.vwap(high, low, close, volume)[-1],
+                               float(np.dot(close, volume) / volume.sum()))
+        print("✓ VWAP working")
+    
+    def test_ichimoku_alignment(self):
+        """Test the senkou spans are projected forward and chikou backward"""
+        result = indicator_engine.ichimoku(self.high, self.low, self.close)
+        tenkan = (self.high[:9].max() + self.low[:9].min()) / 2
+        self.assertAlmostEqual(result['tenkan'][8], tenkan)
+        self.assertAlmostEqual(result['senkou_a'][25 + 26], (result['tenkan'][25] + result['kijun'][25]) / 2)
+        self.assertAlmostEqual(result['senkou_b'][51 + 26], (self.high[:52].max() + self.low[:52].min()) / 2)
+        self.assertTrue(np.isnan(result['senkou_b'][51 + 25]))
+        np.testing.assert_array_equal(result['chikou'][:-26], self.close[26:])
+        self.assertTrue(np.all(np.isnan(result['chikou'][-26:])))
+        print("✓ Ichimoku working")
+    
+    def test_keltner_and_obv(self):
+        """Test Keltner Channels and On Balance Volume"""
+        bands = indicator_engine.keltner_channels(self.high, self.low, self.close, 20, 10, 2)
+        width = 2 * indicator_engine.atr(self.high, self.low, self.close, 10)
+        np.testing.assert_allclose(bands['upper'] - bands['middle'], width)
+        np.testing.assert_allclose(bands['middle'] - bands['lower'], width)
+        
+        obv = indicator_engine.obv([1.0, 2.0, 2.0, 1.5, 3.0], [10.0, 5.0, 7.0, 4.0, 2.0])
+        np.testing.assert_array_equal(obv, [10.0, 15.0, 15.0, 11.0, 13.0])
+        print("✓ Keltner Channels and OBV working")
+    
+    def test_rows_match_single_series(self):
+        """Test every catalog indicator computes symbol rows like single series"""
+        other = random_bars(600, seed=12)
+        rows = [np.stack([a, b]) for a, b in zip((self.high, self.low, self.close, self.volume), other)]
+        cases = [
+            lambda h, l, c, v: indicator_engine.adx(h, l, c)['adx'],
+            lambda h, l, c, v: indicator_engine.stochastic(h, l, c)['d'],
+            lambda h, l, c, v: indicator_engine.cci(h, l, c),
+            lambda h, l, c, v: indicator_engine.vwap(h, l, c, v, np.arange(600) * 900),
+            lambda h, l, c, v: indicator_engine.ichimoku(h, l, c)['senkou_b'],
+            lambda h, l, c, v: indicator_engine.keltner_channels(h, l, c)['upper'],
+            lambda h, l, c, v: indicator_engine.obv(c, v)
+        ]
+        for case in cases:
+            np.testing.assert_allclose(case(*rows)[1], case(*other), rtol=1e-12)
+        print("✓ Catalog batch rows working")
+    
+    def test_numpy_backend_dispatch(self):
+        """Test TechnicalIndicators serves the catalog from the NumPy engine"""
+        self.indicators.backend = 'numpy'
+        np.testing.assert_array_equal(self.indicators.calculate_atr_series(self.high, self.low, self.close),
+                                      indicator_engine.atr(self.high, self.low, self.close))
+        np.testing.assert_array_equal(self.indicators.calculate_obv_series(self.close, self.volume),
+                                      indicator_engine.obv(self.close, self.volume))
+        self.assertEqual(set(self.indicators.calculate_adx_series(self.high, self.low, self.close)),
+                         {'adx', 'plus_di', 'minus_di'})
+        self.assertEqual(set(self.indicators.calculate_ichimoku_series(self.high, self.low, self.close)),
+                         {'tenkan', 'kijun', 'senkou_a', 'senkou_b', 'chikou'})
+        print("✓ NumPy catalog dispatch working")
+    
+    @unittest.skipUnless(TALIB_AVAILABLE, "ta-lib not installed")
+    def test_talib_matches_numpy(self):
+        """Test the ta-lib and NumPy backends agree"""
+        bars = (self.high, self.low, self.close)
+        talib_indicators = TechnicalIndicators()
+        numpy_indicators = TechnicalIndicators()
+        numpy_indicators.backend = 'numpy'
+        pairs = [
+            (lambda ind: ind.calculate_atr_series(*bars), 1e-9),
+            (lambda ind: ind.calculate_stochastic_series(*bars)['d'], 1e-9),
+            (lambda ind: ind.calculate_cci_series(*bars), 1e-6),
+            (lambda ind: ind.calculate_obv_series(self.close, self.volume), 1e-12)
+        ]
+        for compute, rtol in pairs:
+            np.testing.assert_allclose(compute(talib_indicators)[300:], compute(numpy_indicators)[300:], rtol=rtol)
+        
+        # ADX is seeded exactly like ta-lib, so the whole series agrees
+        talib_adx = talib_indicators.calculate_adx_series(*bars)
+        for name, values in numpy_indicators.calculate_adx_series(*bars).items():
+            np.testing.assert_allclose(talib_adx[name], values, rtol=1e-9, atol=1e-9)
+        print("✓ ta-lib/NumPy parity working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,175 @@
+"""
+Test Vectorized Indicator Engine
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.data_processor.indicator_engine import (
+    SCAN_COLUMNS, IndicatorEngine, atr, ema, linear_recurrence, rolling_std, sma, wilder_average
+)
+from src.modules.data_processor.technical_indicators import TechnicalIndicators
+from src.modules.mt5_connector.bar_series import BarSeries
+from src.tests.market_fixtures import random_bars, random_walk
+
+def reference_rsi(prices, period):
+    """Textbook Wilder RSI written as a plain loop"""
+    deltas = np.diff(prices)
+    gains, losses = np.maximum(deltas, 0), np.maximum(-deltas, 0)
+    avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+    result = [np.nan] * period
+    for i in range(period, len(prices)):
+        if i > period:
+            avg_gain = (avg_gain * (period - 1) + gains[i - 1]) / period
+            avg_loss = (avg_loss * (period - 1) + losses[i - 1]) / period
+        result.append(100.0 if avg_loss == 0 else 100 - 100 / (1 + avg_gain / avg_loss))
+    return np.array(result)
+
+class TestIndicatorEngine(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.prices = random_walk(5000)
+        self.series = pd.Series(self.prices)
+    
+    def test_linear_recurrence(self):
+        """Test the blocked recurrence matches a sequential loop"""
+        inputs = np.random.default_rng(1).normal(size=1000)
+        for decay in (0.0, 0.5, 0.9, 0.999):
+            expected, y = [], 3.0
+            for value in inputs:
+                y = decay * y + value
+                expected.append(y)
+            np.testing.assert_allclose(linear_recurrence(inputs, decay, initial=3.0), expected, rtol=1e-10, atol=1e-12)
+        print("✓ Linear recurrence working")
+    
+    def test_ema_matches_pandas(self):
+        """Test EMAs match pandas ewm with and without adjust"""
+        for span in (1, 2, 9, 12, 26, 200):
+            np.testing.assert_allclose(ema(self.prices, span), self.series.ewm(span=span).mean(), rtol=1e-12)
+            np.testing.assert_allclose(ema(self.prices, span, adjust=False),
+                                       self.series.ewm(span=span, adjust=False).mean(), rtol=1e-12)
+        np.testing.assert_allclose(ema(self.prices[:3], 12), self.series[:3].ewm(span=12).mean(), rtol=1e-12)
+        print("✓ EMA parity with pandas working")
+    
+    def test_rolling_matches_pandas(self):
+        """Test rolling mean and standard deviation match pandas"""
+        for period in (1, 2, 20):
+            np.testing.assert_allclose(sma(self.prices, period), self.series.rolling(period).mean(), rtol=1e-12)
+        np.testing.assert_allclose(rolling_std(self.prices, 20), self.series.rolling(20).std(), rtol=1e-7)
+        self.assertTrue(np.isnan(sma(self.prices[:5], 20)).all())
+        print("✓ Rolling window parity with pandas working")
+    
+    def test_rsi_wilder(self):
+        """Test RSI uses Wilder smoothing and is aligned with the prices"""
+        rsi = IndicatorEngine(self.prices).rsi(14)
+        self.assertEqual(len(rsi), len(self.prices))
+        np.testing.assert_allclose(rsi, reference_rsi(self.prices, 14), rtol=1e-10)
+        self.assertTrue(np.isnan(wilder_average(np.ones(5), 14)).all())
+        print("✓ Wilder RSI working")
+    
+    def test_shared_intermediates(self):
+        """Test indicators reuse memoized EMAs and rolling means"""
+        engine = IndicatorEngine(self.prices)
+        macd = engine.macd()
+        self.assertIs(engine.ema(12), engine.ema(12))
+        np.testing.assert_allclose(macd['macd'], engine.ema(12) - engine.ema(26))
+        
+        bands = engine.bollinger_bands(20, 2)
+        self.assertTrue(np.shares_memory(bands['middle'], engine.bollinger_bands(20, 2)['middle']))
+        np.testing.assert_array_equal(bands['middle'], engine.sma(20))
+        self.assertFalse(bands['upper'].flags.writeable)
+        print("✓ Shared intermediate results working")
+
+class TestBatchIndicators(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.high, self.low, self.close, _ = random_bars((30, 400), seed=4)
+    
+    def test_rows_match_single_series(self):
+        """Test 2D series equal the 1D computation of every row"""
+        batch = IndicatorEngine(self.close, self.high, self.low)
+        for row in (0, 13, 29):
+            single = IndicatorEngine(self.close[row], self.high[row], self.low[row])
+            np.testing.assert_allclose(batch.rsi()[row], single.rsi(), rtol=1e-12)
+            np.testing.assert_allclose(batch.macd()['signal'][row], single.macd()['signal'], rtol=1e-12)
+            np.testing.assert_allclose(batch.bollinger_bands()['upper'][row], single.bollinger_bands()['upper'], rtol=1e-12)
+            np.testing.assert_allclose(batch.atr()[row], atr(self.high[row], self.low[row], self.close[row]), rtol=1e-12)
+        print("✓ 2D batch series working")
+    
+    def test_scan_matrix(self):
+        """Test the scan returns the latest value of every indicator per symbol"""
+        matrix = TechnicalIndicators().scan_market(self.close, self.high, self.low)
+        self.assertEqual(matrix.shape, (30, len(SCAN_COLUMNS)))
+        
+        engine = IndicatorEngine(self.close[5], self.high[5], self.low[5])
+        expected = [engine.rsi()[-1], *(engine.macd()[k][-1] for k in ('macd', 'signal', 'histogram')),
+                    *(engine.bollinger_bands()[k][-1] for k in ('upper', 'middle', 'lower')), engine.atr()[-1]]
+        np.testing.assert_allclose(matrix[5], expected, rtol=1e-12)
+        
+        self.assertTrue(np.isnan(IndicatorEngine(self.close).scan()[:, SCAN_COLUMNS.index('atr')]).all())
+        self.assertEqual(IndicatorEngine(self.close[0]).scan().shape, (1, len(SCAN_COLUMNS)))
+        print("✓ Market scan matrix working")
+    
+    def test_scan_timeframes(self):
+        """Test stacked BarSeries blocks are scanned per timeframe"""
+        series = [BarSeries.from_columns({'timestamp': np.arange(400 - i), 'high': self.high[i, i:],
+                                          'low': self.low[i, i:], 'close': self.close[i, i:]}, f'SYM{i}')
+                  for i in range(3)]
+        block = BarSeries.stack(series)
+        self.assertEqual(block.shape, (6, 3, 398))
+        np.testing.assert_array_equal(block[4, 0], self.close[0, -398:])
+        with self.assertRaises(ValueError):
+            BarSeries.stack(series, count=399)
+        
+        results = TechnicalIndicators().scan_timeframes({'M1': block, 'H1': BarSeries.stack(series, 100)})
+        self.assertEqual(set(results), {'M1', 'H1'})
+        self.assertEqual(results['H1'].shape, (3, len(SCAN_COLUMNS)))
+        print("✓ Multi-timeframe scan working")
+
+class TestTechnicalIndicatorsEngine(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.indicators = TechnicalIndicators()
+        self.prices = random_walk(500, seed=2)
+        self.series = pd.Series(self.prices)
+    
+    def test_last_values_match_series(self):
+        """Test the scalar methods return the last value of the full series"""
+        macd = self.indicators.calculate_macd(self.prices)
+        macd_line = self.series.ewm(span=12).mean() - self.series.ewm(span=26).mean()
+        self.assertAlmostEqual(macd['macd'], macd_line.iloc[-1], places=12)
+        self.assertAlmostEqual(macd['signal'], macd_line.ewm(span=9).mean().iloc[-1], places=12)
+        
+        bands = self.indicators.calculate_bollinger_bands(list(self.prices))
+        self.assertAlmostEqual(bands['middle'], self.series.rolling(20).mean().iloc[-1], places=12)
+        self.assertAlmostEqual(bands['upper'], self.indicators.calculate_bollinger_bands_series(self.prices)['upper'][-1], places=12)
+        
+        self.assertAlmostEqual(self.indicators.calculate_rsi(self.prices),
+                               self.indicators.calculate_rsi_series(self.prices)[-1], places=10)
+        self.assertEqual(self.indicators.calculate_rsi(self.prices, wilder=True),
+                         self.indicators.calculate_rsi_series(self.prices, wilder=True)[-1])
+        self.assertAlmostEqual(self.indicators.calculate_rsi(self.prices, wilder=True), reference_rsi(self.prices, 14)[-1],
+                               places=10)
+        self.assertEqual(self.indicators.calculate_rsi([1.0]), 50.0)
+        print("✓ Scalar indicators match full series")
+    
+    def test_rsi_simple_mean_default(self):
+        """Test calculate_rsi averages the last period changes by default"""
+        deltas = np.diff(self.prices)[-14:]
+        gain, loss = deltas[deltas > 0].sum() / 14, -deltas[deltas < 0].sum() / 14
+        self.assertAlmostEqual(self.indicators.calculate_rsi(self.prices), 100 - 100 / (1 + gain / loss), places=10)
+        
+        # Short inputs average the changes there are
+        self.assertEqual(self.indicators.calculate_rsi([1.0, 2.0, 3.0]), 100.0)
+        self.assertAlmostEqual(self.indicators.calculate_rsi([1.0, 3.0, 2.0]), 200 / 3)
+        print("✓ Simple-mean RSI default working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""
+Test Indicator Kernel Backends
+"""
+
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.data_processor import indicator_kernels
+from src.modules.data_processor.indicator_kernels import (
+    NUMBA_AVAILABLE, get_backend, linear_recurrence, parabolic_sar, set_backend
+)
+from src.modules.data_processor.indicator_engine import IndicatorEngine, atr, ema
+from src.tests.market_fixtures import random_bars
+
+class TestKernelBackends(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.default_backend = get_backend()
+        self.high, self.low, self.close, _ = random_bars(20000, seed=5)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        set_backend(self.default_backend)
+    
+    def test_backend_selection(self):
+        """Test the backend defaults to numba only when it is installed"""
+        self.assertEqual(set_backend('auto'), 'numba' if NUMBA_AVAILABLE else 'numpy')
+        self.assertEqual(set_backend('numpy'), 'numpy')
+        with self.assertRaises(ValueError):
+            set_backend('cuda')
+        if not NUMBA_AVAILABLE:
+            with self.assertRaises(ValueError):
+                set_backend('numba')
+        print(f"✓ Kernel backend selection working - default {self.default_backend}")
+    
+    def test_numpy_recurrence_matches_loop(self):
+        """Test the vectorized fallback matches the sequential loop kernel"""
+        set_backend('numpy')
+        inputs = np.random.default_rng(6).normal(size=(3, 2000))
+        initial = np.array([0.0, 1.5, -2.0])
+        for decay in (0.3, 0.9, 1 - 1 / 14, 0.999):
+            expected = np.empty_like(inputs)
+            indicator_kernels._linear_recurrence_loop(inputs, decay, initial, expected)
+            np.testing.assert_allclose(linear_recurrence(inputs, decay, initial), expected, rtol=1e-10, atol=1e-12)
+        print("✓ NumPy recurrence parity working")
+    
+    def test_parabolic_sar(self):
+        """Test SAR values on a steady uptrend and that SAR never sits inside a bar"""
+        set_backend('numpy')
+        high = np.arange(5) + 1.5
+        low = np.arange(5) + 0.5
+        np.testing.assert_allclose(parabolic_sar(high, low), [np.nan, 0.5, 0.5, 0.68, 0.9856])
+        
+        sar = parabolic_sar(self.high, self.low)
+        self.assertTrue(np.isnan(sar[0]))
+        self.assertTrue(np.all((sar[1:] <= self.low[1:]) | (sar[1:] >= self.high[1:])))
+        rows = parabolic_sar(np.stack([self.high, high.repeat(4000)]), np.stack([self.low, low.repeat(4000)]))
+        np.testing.assert_array_equal(rows[0], sar)
+        print("✓ Parabolic SAR working")
+    
+    @unittest.skipUnless(NUMBA_AVAILABLE, "numba not installed")
+    def test_numba_matches_numpy(self):
+        """Test both backends give the same indicators"""
+        results = {}
+        for backend in ('numpy', 'numba'):
+            set_backend(backend)
+            engine = IndicatorEngine(self.close, self.high, self.low)
+            results[backend] = [ema(self.close, 12), ema(self.close, 12, adjust=False), engine.rsi(),
+                                engine.macd()['signal'], atr(self.high, self.low, self.close),
+                                engine.parabolic_sar()]
+        for numpy_result, numba_result in zip(results['numpy'], results['numba']):
+            np.testing.assert_allclose(numba_result, numpy_result, rtol=1e-10, atol=1e-12)
+        print("✓ Numba/NumPy kernel parity working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+"""
+Test MT5 Shared Memory Bridge
+"""
+
+import sys
+import mmap
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.shm_bridge import MT5SharedMemoryBridge, ShmRing
+from src.modules.mt5_connector.transports import transport_failure
+from src.tests.mock_shm_peer import start_peer
+
+class TestShmRing(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.buffer = mmap.mmap(-1, ShmRing.size(4, 64))
+        self.ring = ShmRing(self.buffer, 0, 4, 64)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.buffer.close()
+    
+    def test_fifo_and_backpressure(self):
+        """Test messages are read in order and a full ring refuses writes"""
+        for i in range(4):
+            self.assertTrue(self.ring.try_write(f"msg{i}".encode()))
+        self.assertFalse(self.ring.try_write(b"overflow"))
+        
+        self.assertEqual(self.ring.try_read(), b"msg0")
+        self.assertTrue(self.ring.try_write(b"msg4"))
+        self.assertEqual([self.ring.try_read() for _ in range(4)], [b"msg1", b"msg2", b"msg3", b"msg4"])
+        self.assertIsNone(self.ring.try_read())
+        
+        with self.assertRaises(ValueError):
+            self.ring.try_write(b"x" * 64)
+        print("✓ Ring FIFO and backpressure working")
+    
+    def test_broadcast_overrun(self):
+        """Test overwriting readers skip ahead and count dropped messages"""
+        for i in range(6):
+            self.ring.try_write(f"tick{i}".encode(), overwrite=True)
+        
+        payload, cursor, dropped = self.ring.read_from(0)
+        self.assertEqual((payload, cursor, dropped), (b"tick2", 3, 2))
+        payload, cursor, dropped = self.ring.read_from(cursor)
+        self.assertEqual(payload, b"tick3")
+        print("✓ Ring broadcast overrun working")
+
+class TestMT5SharedMemoryBridge(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.peer = start_peer(self.tmpdir.name, slot_size=4096, tick_slots=8)
+        self.client = MT5SharedMemoryBridge(self.tmpdir.name)
+        self.client.connect(timeout=1)
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.client.close()
+        self.peer.close()
+        self.tmpdir.cleanup()
+    
+    def test_geometry_read_from_header(self):
+        """Test the client adopts the ring geometry chosen by the creator"""
+        self.assertEqual(self.client.slot_size, 4096)
+        self.assertEqual(self.client.tick_slots, 8)
+        print("✓ Shared file geometry negotiation working")
+    
+    def test_request_round_trip(self):
+        """Test request/response through the shared rings"""
+        response = self.client.send_request('get_symbol_info', {'symbol': 'GBPUSD'}, timeout=2)
+        self.assertTrue(response['success'])
+        self.assertEqual(response['symbol'], 'GBPUSD')
+        
+        # More requests than slots exercise ring wrap-around
+        for i in range(200):
+            self.assertEqual(self.client.send_request('echo', {'n': i}, timeout=2)['data'], {'n': i})
+        print("✓ Shared memory request round trip working")
+    
+    def test_oversized_request(self):
+        """Test messages larger than a slot are rejected with an error dict"""
+        response = self.client.send_request('echo', {'blob': 'x' * 8192}, timeout=1)
+        self.assertFalse(response['success'])
+        self.assertIn('exceeds slot capacity', response['error'])
+        print("✓ Oversized request rejection working")
+    
+    def test_request_timeout(self):
+        """Test a request without a serving peer times out"""
+        self.peer.stop_message_loop()
+        response = self.client.send_request('ping', timeout=0.05)
+        self.assertEqual(response, transport_failure('Request timeout'))
+        print("✓ Shared memory request timeout working")
+    
+    def test_tick_streaming(self):
+        """Test ticks reach pollers and subscribers, with overruns counted"""
+        for i in range(3):
+            self.peer.publish_tick('EURUSD', {'time': i, 'bid': 1.1 + i, 'ask': 1.2, 'last': 0.0, 'volume': 1})
+        ticks = self.client.poll_ticks()
+        self.assertEqual([m['ticks'][0]['time'] for m in ticks], [0.0, 1.0, 2.0])
+        self.assertEqual(ticks[0]['symbol'], 'EURUSD')
+        
+        # Publish more than the ring holds before reading
+        for i in range(12):
+            self.peer.publish_tick('EURUSD', {'time': i, 'bid': 1.0, 'ask': 1.0, 'last': 0.0, 'volume': 1})
+        self.assertEqual(len(self.client.poll_ticks()), 8)
+        self.assertEqual(self.client.dropped_ticks, 4)
+        
+        received = []
+        delivered = threading.Event()
+        
+        def on_tick(topic, message):
+            received.append(topic)
+            delivered.set()
+        
+        self.client.subscribe(['gbpusd'], on_tick)
+        self.peer.publish_tick('EURUSD', {'time': 1, 'bid': 1.0, 'ask': 1.0, 'last': 0.0, 'volume': 1})
+        self.peer.publish_tick('GBPUSD', {'time': 2, 'bid': 1.3, 'ask': 1.3, 'last': 0.0, 'volume': 1})
+        self.assertTrue(delivered.wait(2))
+        self.assertEqual(received, ['GBPUSD.TICK'])
+        print("✓ Shared memory tick streaming working")
+    
+    def test_connect_missing_file(self):
+        """Test connecting without a peer fails fast"""
+        with tempfile.TemporaryDirectory() as empty:
+            with self.assertRaises(ConnectionError):
+                MT5SharedMemoryBridge(empty).connect(timeout=0.05)
+        print("✓ Missing shared file detection working")
+
+if __name__ == '__main__':
+    unittest.main()
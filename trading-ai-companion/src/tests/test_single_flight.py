@@ -0,0 +1,124 @@
+"""
+Test MT5 Request Coalescing
+"""
+
+import sys
+import time
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.mt5_manager import MT5Manager
+from src.modules.mt5_connector.single_flight import SingleFlight
+
+def run_concurrently(func, count):
+    """Call ``func`` from ``count`` threads at once and collect the results"""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+    
+    def worker(i):
+        barrier.wait()
+        results[i] = func()
+    
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+class TestSingleFlight(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.flight = SingleFlight()
+        self.calls = 0
+    
+    def slow_call(self):
+        self.calls += 1
+        time.sleep(0.1)
+        return {'value': self.calls}
+    
+    def test_concurrent_calls_share_result(self):
+        """Test concurrent callers with the same key run the function once"""
+        results = run_concurrently(lambda: self.flight.do('positions', self.slow_call), 8)
+        
+        self.assertEqual(self.calls, 1)
+        self.assertEqual([r[0] for r in results], [{'value': 1}] * 8)
+        self.assertEqual(sorted(r[1] for r in results), [False] + [True] * 7)
+        self.assertEqual(self.flight.get_stats(), {'executed': 1, 'shared': 7, 'in_flight': 0})
+        
+        # A later call starts a fresh request
+        self.assertEqual(self.flight.do('positions', self.slow_call), ({'value': 2}, False))
+        print("✓ Single flight sharing working")
+    
+    def test_exceptions_shared(self):
+        """Test every waiting caller sees the leader's exception"""
+        def failing_call():
+            time.sleep(0.1)
+            raise ConnectionError("bridge down")
+        
+        def call():
+            try:
+                return self.flight.do('account', failing_call)
+            except ConnectionError as e:
+                return str(e)
+        
+        self.assertEqual(run_concurrently(call, 4), ['bridge down'] * 4)
+        self.assertEqual(self.flight.get_in_flight_count(), 0)
+        print("✓ Single flight exception sharing working")
+
+class TestMT5ManagerCoalescing(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        with patch.object(MT5Manager, '_initialize_communication'):
+            self.manager = MT5Manager({'auto_launch': False})
+        self.manager.is_initialized = True
+        self.sent = []
+    
+    def dispatch(self, command, data=None, timeout=None):
+        self.sent.append((command, data))
+        time.sleep(0.1)
+        return {'success': True, 'positions': [{'ticket': 1}], 'command': command}
+    
+    def test_identical_reads_coalesced(self):
+        """Test concurrent identical reads send one request and each caller gets its own copy"""
+        with patch.object(self.manager, '_dispatch_request', side_effect=self.dispatch):
+            results = run_concurrently(lambda: self.manager._send_request('get_positions'), 6)
+        
+        self.assertEqual(self.sent, [('get_positions', None)])
+        self.assertTrue(all(r['positions'] == [{'ticket': 1}] for r in results))
+        self.assertEqual(len({id(r) for r in results}), 6)
+        print("✓ Identical read coalescing working")
+    
+    def test_different_arguments_not_coalesced(self):
+        """Test reads with different data are sent separately, independent of key order"""
+        payloads = [{'symbol': 'EURUSD', 'count': 10}, {'count': 10, 'symbol': 'EURUSD'},
+                    {'symbol': 'GBPUSD', 'count': 10}]
+        with patch.object(self.manager, '_dispatch_request', side_effect=self.dispatch):
+            calls = iter(payloads)
+            lock = threading.Lock()
+            
+            def call():
+                with lock:
+                    data = next(calls)
+                return self.manager._send_request('get_market_data', data)
+            
+            run_concurrently(call, 3)
+        
+        self.assertEqual(sorted(d['symbol'] for _, d in self.sent), ['EURUSD', 'GBPUSD'])
+        print("✓ Coalescing keyed by command and data")
+    
+    def test_orders_never_coalesced(self):
+        """Test identical trade commands are all sent"""
+        with patch.object(self.manager, '_dispatch_request', side_effect=self.dispatch):
+            run_concurrently(lambda: self.manager.place_order('EURUSD', 'BUY', 0.1), 3)
+        
+        self.assertEqual([command for command, _ in self.sent], ['place_order'] * 3)
+        print("✓ Trade commands not coalesced")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,233 @@
+"""
+Test MT5 Socket Bridge Framing
+"""
+
+import os
+import sys
+import socket
+import time
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.socket_bridge import MT5SocketBridge
+from src.modules.mt5_connector.socket_framing import HEADER, FrameError, FrameReader, send_frames
+from src.modules.mt5_connector.message_codecs import JSONCodec
+from src.modules.mt5_connector.transports import transport_failure
+
+def echo_handler(message):
+    """Echo the request back like a minimal MT5 EA"""
+    return {'success': True, 'echo': message}
+
+def slow_handler(message):
+    """Echo after the requested delay"""
+    time.sleep(message.get('delay', 0))
+    return {'success': True, 'echo': message}
+
+class TestSocketFraming(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.left, self.right = socket.socketpair()
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.left.close()
+        self.right.close()
+    
+    def test_partial_reads(self):
+        """Test frames split across many reads are reassembled"""
+        payload = b'{"command":"ping"}'
+        data = HEADER.pack(len(payload)) + payload
+        reader = FrameReader(self.right)
+        
+        def trickle():
+            for i in range(len(data)):
+                self.left.send(data[i:i + 1])
+        
+        writer = threading.Thread(target=trickle)
+        writer.start()
+        self.assertEqual(reader.read_frame(), payload)
+        writer.join()
+        print("✓ Partial frame reads working")
+    
+    def test_coalesced_frames(self):
+        """Test several frames arriving in one read are all returned"""
+        payloads = [f'{{"n":{i}}}'.encode() for i in range(50)]
+        send_frames(self.left, payloads)
+        
+        reader = FrameReader(self.right)
+        received = []
+        while len(received) < len(payloads):
+            received.extend(reader.recv_frames())
+        self.assertEqual(received, payloads)
+        print("✓ Coalesced frame reads working")
+    
+    def test_frame_larger_than_buffer(self):
+        """Test the reader grows its buffer for large frames"""
+        payload = os.urandom(300000)
+        reader = FrameReader(self.right, buffer_size=1024)
+        
+        writer = threading.Thread(target=send_frames, args=(self.left, [b'small', payload, b'tail']))
+        writer.start()
+        self.assertEqual([reader.read_frame() for _ in range(3)], [b'small', payload, b'tail'])
+        writer.join()
+        print("✓ Large frame reads working")
+    
+    def test_oversized_and_closed(self):
+        """Test malformed lengths and EOF are reported"""
+        reader = FrameReader(self.right)
+        self.left.sendall(HEADER.pack(0xFFFFFFFF))
+        with self.assertRaises(FrameError):
+            reader.read_frame()
+        
+        self.left.close()
+        with self.assertRaises(ConnectionError):
+            FrameReader(self.right).read_frame()
+        print("✓ Frame error handling working")
+
+class TestMT5SocketBridge(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, 'bridge.sock')
+        self.server = MT5SocketBridge(self.socket_path)
+        self.server.start_server()
+        threading.Thread(target=self.server.listen_for_connections, args=(echo_handler,), daemon=True).start()
+        
+        self.client = MT5SocketBridge(self.socket_path)
+        self.client.connect_client()
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.client.close()
+        self.server.close()
+        self.tmpdir.cleanup()
+    
+    def test_send_message(self):
+        """Test a request/response round trip"""
+        response = self.client.send_message({'command': 'get_account_info'})
+        self.assertEqual(response, {'success': True, 'echo': {'command': 'get_account_info'}})
+        print("✓ Socket round trip working")
+    
+    def test_pipelined_messages(self):
+        """Test many messages sent in one write come back in order"""
+        messages = [{'command': 'get_symbol_info', 'data': {'n': i}} for i in range(100)]
+        responses = self.client.send_messages(messages)
+        self.assertEqual([r['echo']['data']['n'] for r in responses], list(range(100)))
+        print("✓ Pipelined socket messages working")
+    
+    def test_large_message(self):
+        """Test messages bigger than one recv buffer"""
+        blob = 'x' * 200000
+        response = self.client.send_message({'command': 'echo', 'data': blob})
+        self.assertEqual(response['echo']['data'], blob)
+        print("✓ Large socket message working")
+
+class TestConcurrentSocketServer(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, 'bridge.sock')
+        self.server = MT5SocketBridge(self.socket_path)
+        self.server.start_server()
+        self.server_thread = threading.Thread(target=self.server.listen_for_connections,
+                                              args=(slow_handler,), kwargs={'concurrent': True, 'max_workers': 4},
+                                              daemon=True)
+        self.server_thread.start()
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.server.close()
+        self.server_thread.join(timeout=2)
+        self.tmpdir.cleanup()
+    
+    def _client(self):
+        client = MT5SocketBridge(self.socket_path)
+        client.connect_client()
+        self.addCleanup(client.close)
+        return client
+    
+    def test_clients_served_concurrently(self):
+        """Test a slow client does not block others"""
+        clients = [self._client() for _ in range(4)]
+        results = [None] * len(clients)
+        
+        def call(i):
+            results[i] = clients[i].send_message({'command': 'get_positions', 'delay': 0.3})
+        
+        start = time.perf_counter()
+        threads = [threading.Thread(target=call, args=(i,)) for i in range(len(clients))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertLess(elapsed, 0.9)
+        self.assertEqual(self.server.get_client_count(), 4)
+        print("✓ Concurrent socket clients working")
+    
+    def test_pipelined_order_preserved(self):
+        """Test untagged pipelined responses keep request order despite parallel handlers"""
+        client = self._client()
+        messages = [{'command': 'echo', 'n': i, 'delay': 0.05 if i % 2 == 0 else 0} for i in range(8)]
+        responses = client.send_messages(messages)
+        self.assertEqual([r['echo']['n'] for r in responses], list(range(8)))
+        print("✓ Pipelined response ordering working")
+    
+    def test_tagged_responses_not_blocked(self):
+        """Test responses to requests with ids are sent as soon as they are ready"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(self.socket_path)
+        self.addCleanup(sock.close)
+        codec = JSONCodec()
+        send_frames(sock, [codec.encode({'id': 'slow', 'delay': 0.3}), codec.encode({'id': 'fast', 'delay': 0})])
+        
+        reader = FrameReader(sock)
+        first = codec.decode(reader.read_frame())
+        second = codec.decode(reader.read_frame())
+        self.assertEqual((first['id'], second['id']), ('fast', 'slow'))
+        print("✓ Tagged out-of-order responses working")
+    
+    def test_send_message_timeout(self):
+        """Test the blocking client honours its timeout argument"""
+        client = self._client()
+        start = time.perf_counter()
+        response = client.send_message({'command': 'echo', 'delay': 0.5}, timeout=0.1)
+        self.assertEqual(response, transport_failure('Request timeout'))
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertFalse(client.is_connected)
+        print("✓ Blocking socket client timeout working")
+    
+    def test_disconnect_cleanup(self):
+        """Test disconnected clients are dropped"""
+        client = self._client()
+        client.send_message({'command': 'ping'})
+        self.assertEqual(self.server.get_client_count(), 1)
+        client.socket.close()
+        
+        deadline = time.monotonic() + 2
+        while self.server.get_client_count() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.server.get_client_count(), 0)
+        print("✓ Client disconnect cleanup working")
+    
+    def test_closed_before_serving(self):
+        """Test a server closed before its loop starts exits quietly"""
+        path = os.path.join(self.tmpdir.name, 'closed.sock')
+        server = MT5SocketBridge(path)
+        server.start_server()
+        server.close()
+        
+        with self.assertNoLogs('src.modules.mt5_connector.socket_bridge', level='ERROR'):
+            server.listen_for_connections(slow_handler, concurrent=True)
+        self.assertTrue(server._stop_event.is_set())
+        print("✓ Close before serve working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Test Streaming Indicators
+"""
+
+import sys
+import json
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.data_processor.indicator_engine import IndicatorEngine, atr, ema
+from src.modules.data_processor.streaming_indicators import (
+    RollingStats, StreamingATR, StreamingBollingerBands, StreamingEMA, StreamingMACD, StreamingRSI
+)
+from src.tests.market_fixtures import random_bars
+
+def assert_parity(streamed, batch, rtol=1e-10):
+    np.testing.assert_allclose(np.array(streamed, dtype=np.float64), batch, rtol=rtol, atol=1e-12)
+
+class TestStreamingIndicators(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.high, self.low, self.close, _ = random_bars(3000, seed=3)
+        self.engine = IndicatorEngine(self.close)
+    
+    def test_ema_parity(self):
+        """Test streamed EMAs equal the batch series"""
+        for adjust in (True, False):
+            indicator = StreamingEMA(12, adjust=adjust)
+            assert_parity([indicator.update(price) for price in self.close], ema(self.close, 12, adjust=adjust))
+        print("✓ Streaming EMA parity working")
+    
+    def test_rsi_parity(self):
+        """Test streamed Wilder RSI equals the batch series, NaN warm-up included"""
+        indicator = StreamingRSI(14)
+        assert_parity([indicator.update(price) for price in self.close], self.engine.rsi(14))
+        print("✓ Streaming RSI parity working")
+    
+    def test_macd_parity(self):
+        """Test streamed MACD lines equal the batch series"""
+        indicator = StreamingMACD()
+        streamed = [indicator.update(price) for price in self.close]
+        for name, batch in self.engine.macd().items():
+            assert_parity([values[name] for values in streamed], batch)
+        print("✓ Streaming MACD parity working")
+    
+    def test_bollinger_parity(self):
+        """Test Welford rolling statistics reproduce the batch bands over a long stream"""
+        indicator = StreamingBollingerBands(20, 2)
+        streamed = [indicator.update(price) for price in self.close]
+        for name, batch in self.engine.bollinger_bands(20, 2).items():
+            assert_parity([values[name] for values in streamed], batch, rtol=1e-9)
+        print("✓ Streaming Bollinger Bands parity working")
+    
+    def test_atr_parity(self):
+        """Test streamed ATR equals the batch series"""
+        indicator = StreamingATR(14)
+        streamed = [indicator.update(h, l, c) for h, l, c in zip(self.high, self.low, self.close)]
+        assert_parity(streamed, atr(self.high, self.low, self.close, 14))
+        print("✓ Streaming ATR parity working")
+    
+    def test_peek_does_not_commit(self):
+        """Test evaluating the forming bar leaves the state untouched"""
+        indicators = [StreamingRSI(), StreamingMACD(), StreamingBollingerBands(), RollingStats(5)]
+        for indicator in indicators:
+            for price in self.close[:100]:
+                indicator.update(price)
+            before = indicator.snapshot()
+            peeked = indicator.peek(self.close[100])
+            self.assertEqual(indicator.snapshot(), before)
+            self.assertEqual(peeked, indicator.update(self.close[100]))
+        print("✓ Streaming peek working")
+    
+    def test_snapshot_restore(self):
+        """Test a restored indicator continues exactly where the original left off"""
+        for factory in (StreamingRSI, StreamingMACD, StreamingBollingerBands, StreamingATR):
+            original = factory()
+            bars = list(zip(self.high, self.low, self.close))
+            update = (lambda ind, bar: ind.update(*bar)) if factory is StreamingATR else (lambda ind, bar: ind.update(bar[2]))
+            for bar in bars[:500]:
+                update(original, bar)
+            
+            restored = factory.restore(json.loads(json.dumps(original.snapshot())))
+            for bar in bars[500:600]:
+                self.assertEqual(update(restored, bar), update(original, bar))
+        print("✓ Streaming snapshot/restore working")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,337 @@
+"""
+Test MT5 Transport Probing and Selection
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from werkzeug.serving import make_server
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.mt5_manager import MT5Manager
+from src.modules.mt5_connector.socket_bridge import MT5SocketBridge
+from src.modules.mt5_connector.transport_health import CircuitBreaker
+from src.modules.mt5_connector.transports import (
+    RESTTransport, Transport, TransportError, is_transport_failure, probe_transports, select_fastest,
+    transport_failure
+)
+from src.tests.mock_shm_peer import handle_request, start_peer
+from src.tests.mock_mt5_server import app as rest_app
+from src.tests.test_bridge_manager import respond_to_requests
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+class SlowTransport(Transport):
+    """Transport whose peer never answers in time"""
+    name = 'slow'
+    
+    def connect(self, timeout):
+        time.sleep(1)
+        return True
+
+class FlakyTransport(Transport):
+    """Transport that cannot deliver the 'fail' command"""
+    name = 'flaky'
+    
+    def _send(self, command, data, timeout):
+        if command == 'fail':
+            raise ConnectionError("Peer reset")
+        return {'success': True, 'command': command, 'timeout': timeout}
+
+class TestSendMany(unittest.TestCase):
+    def test_failed_item_keeps_batch(self):
+        """Test one failed request does not discard the rest of the batch"""
+        results = FlakyTransport(None).send_many([('ping', {}), ('fail', {}), ('ping', {})], timeout=5)
+        self.assertEqual([r['success'] for r in results], [True, False, True])
+        self.assertEqual(results[1]['error'], 'Peer reset')
+        self.assertTrue(0 < results[2]['timeout'] <= 5)
+        print("✓ Per-item send_many errors working")
+    
+    def test_manager_batch_timeout_in_seconds(self):
+        """Test batched manager requests pass the timeout through in seconds"""
+        manager = MT5Manager({'auto_launch': False, 'communication_method': 'api', 'request_timeout': 7,
+                              'api_base_url': f'http://127.0.0.1:{free_port()}', 'transport_probe_timeout': 0.1})
+        manager.is_initialized = True
+        manager.transport = FlakyTransport(None)
+        manager.transports = {'flaky': manager.transport}
+        try:
+            results = manager._send_requests([('ping', {}), ('fail', {})])
+        finally:
+            manager.shutdown()
+        self.assertTrue(5 < results[0]['timeout'] <= 7)
+        self.assertFalse(results[1]['success'])
+        print("✓ Batch timeout units working")
+    
+    def test_ea_errors_are_not_failures(self):
+        """Test an error reply from a healthy peer is returned, not raised as a transport failure"""
+        not_found = {'success': False, 'error': 'Endpoint not found'}
+        transport = RESTTransport(None, lambda command, data: dict(not_found))
+        self.assertEqual(transport.send('get_orders'), not_found)
+        self.assertEqual(transport.send_many([('get_orders', {}), ('get_symbol_info', {})]), [not_found] * 2)
+        self.assertFalse(is_transport_failure(not_found))
+        
+        transport.command_mapper = lambda command, data: transport_failure('Request timeout')
+        with self.assertRaises(TransportError):
+            transport.send('get_orders')
+        print("✓ EA error replies passed through")
+
+class TestProbeTransports(unittest.TestCase):
+    def test_connect_bounded_by_timeout(self):
+        """Test an unresponsive transport cannot hold up the probe"""
+        start = time.perf_counter()
+        available, metrics = probe_transports([SlowTransport(None)], timeout=0.1)
+        self.assertLess(time.perf_counter() - start, 0.5)
+        self.assertEqual(available, [])
+        self.assertEqual(metrics['slow']['error'], 'Connect timeout')
+        print("✓ Probe connect timeout working")
+    
+    def test_select_fastest(self):
+        """Test the lowest latency available transport wins"""
+        metrics = {
+            'zmq': {'name': 'zmq', 'available': True, 'latency_ms': 0.4, 'throughput_rps': 9000},
+            'shm': {'name': 'shm', 'available': True, 'latency_ms': 0.05, 'throughput_rps': 30000},
+            'socket': {'name': 'socket', 'available': False, 'latency_ms': None, 'throughput_rps': None}
+        }
+        self.assertEqual(select_fastest(metrics), 'shm')
+        self.assertIsNone(select_fastest({}))
+        print("✓ Fastest transport selection working")
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_open_half_open_close(self):
+        """Test the breaker opens, admits one trial after the reset timeout and closes on success"""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+        self.assertFalse(breaker.record_failure())
+        self.assertTrue(breaker.record_failure())
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+        self.assertFalse(breaker.allow_request())
+        
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        self.assertFalse(breaker.allow_request())
+        self.assertTrue(breaker.record_failure())
+        self.assertFalse(breaker.allow_request())
+        
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow_request())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertTrue(breaker.allow_request())
+        print("✓ Circuit breaker transitions working")
+
+class TestRESTCommandMapping(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.server = make_server('127.0.0.1', 0, rest_app, threaded=True)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.manager = MT5Manager({
+            'auto_launch': False,
+            'communication_method': 'api',
+            'api_base_url': f'http://127.0.0.1:{self.server.server_port}',
+            'transport_probe_timeout': 2
+        })
+        self.manager.is_initialized = True
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        self.manager.shutdown()
+        self.server.shutdown()
+    
+    def test_commands_served_over_rest(self):
+        """Test bridge commands are translated into REST calls"""
+        self.assertEqual(self.manager.communication_method, 'api')
+        self.assertEqual(self.manager.get_account_info()['balance'], 10000.0)
+        self.assertEqual(self.manager.get_positions()[0]['ticket'], 123456)
+        self.assertTrue(self.manager.close_position(123456)['success'])
+        self.assertIn('ticket', self.manager.place_order('eurusd', 'buy', 0.1))
+        
+        data = self.manager.get_market_data('eurusd', 'm5', 10)
+        self.assertEqual((data['symbol'], data['timeframe'], len(data['bars'])), ('EURUSD', 'M5', 10))
+        print("✓ REST command mapping working")
+    
+    def test_rejections_are_not_failures(self):
+        """Test client errors come back as responses without tripping the breaker"""
+        response = self.manager._send_request('get_symbol_info', {'symbol': 'EURUSD'})
+        self.assertEqual((response['success'], response['status_code']), (False, 404))
+        
+        response = self.manager._send_request('not_a_command')
+        self.assertIn('not supported', response['error'])
+        self.assertEqual(self.manager.transport_health['api'].snapshot()['failures'], 0)
+        print("✓ REST rejection handling working")
+    
+    def test_bulk_close_requires_tickets(self):
+        """Test bulk close/cancel reject requests without an explicit ticket list"""
+        client = rest_app.test_client()
+        for endpoint in ('/api/v1/trade/positions/close', '/api/v1/trade/orders/cancel'):
+            for body in ({}, {'tickets': []}, {'tickets': 'all'}):
+                reply = client.post(endpoint, json=body).get_json()
+                self.assertFalse(reply['success'])
+                self.assertNotIn('results', reply)
+            self.assertFalse(client.post(endpoint, data='not json').get_json()['success'])
+        
+        reply = client.post('/api/v1/trade/positions/close', json={'tickets': [123456]}).get_json()
+        self.assertEqual(reply['results'], [{'ticket': 123456, 'success': True}])
+        print("✓ Bulk close ticket validation working")
+
+class TestMT5ManagerTransports(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.bridge_path = self.tmpdir.name
+        self.shm_peer = start_peer(self.bridge_path, slot_size=4096, tick_slots=8)
+        self.responder = respond_to_requests(self.bridge_path)
+        
+        self.socket_path = os.path.join(self.bridge_path, 'bridge.sock')
+        self.socket_server = MT5SocketBridge(self.socket_path)
+        self.socket_server.start_server()
+        threading.Thread(target=self.socket_server.listen_for_connections, args=(handle_request,),
+                         kwargs={'concurrent': True}, daemon=True).start()
+        
+        self.config = {
+            'auto_launch': False,
+            'communication_method': 'auto',
+            'bridge_path': self.bridge_path,
+            'socket_path': self.socket_path,
+            'zmq_port': free_port(),
+            'api_base_url': f'http://127.0.0.1:{free_port()}',
+            'transport_probe_timeout': 0.5,
+            'request_timeout': 0.3
+        }
+        self.managers = []
+    
+    def tearDown(self):
+        """Clean up after each test method."""
+        for manager in self.managers:
+            manager.shutdown()
+        self.socket_server.close()
+        self.responder.stop()
+        self.shm_peer.close()
+        self.tmpdir.cleanup()
+    
+    def _manager(self, **overrides):
+        manager = MT5Manager(dict(self.config, **overrides))
+        manager.is_initialized = True
+        self.managers.append(manager)
+        return manager
+    
+    def test_auto_selects_fastest(self):
+        """Test every transport is measured and the fastest one carries requests"""
+        manager = self._manager()
+        metrics = manager.transport_metrics
+        
+        self.assertEqual(set(metrics), {'shm', 'socket', 'zmq', 'api', 'bridge'})
+        self.assertEqual({name for name, m in metrics.items() if m['available']}, {'shm', 'socket', 'bridge'})
+        self.assertEqual(manager.communication_method, select_fastest(metrics))
+        for name in ('shm', 'socket', 'bridge'):
+            self.assertGreater(metrics[name]['latency_ms'], 0)
+            self.assertGreater(metrics[name]['throughput_rps'], 0)
+        
+        response = manager.get_account_info()
+        self.assertEqual(response['login'], 12345678)
+        print(f"✓ Auto transport selection working - {manager.communication_method}")
+    
+    def test_configured_method_honoured(self):
+        """Test an explicit communication method is used even when another is faster"""
+        manager = self._manager(communication_method='bridge')
+        self.assertEqual(manager.communication_method, 'bridge')
+        self.assertEqual(set(manager.transport_metrics), {'bridge'})
+        self.assertEqual(manager.get_account_info()['echo'], 'get_account_info')
+        print("✓ Configured communication method working")
+    
+    def test_configured_method_fallback(self):
+        """Test an unreachable configured method falls back to probing"""
+        manager = self._manager(communication_method='zmq')
+        self.assertIn(manager.communication_method, ('shm', 'socket', 'bridge'))
+        self.assertFalse(manager.transport_metrics['zmq']['available'])
+        print("✓ Configured communication method fallback working")
+    
+    def _kill(self, method):
+        """Make the peer behind one transport stop answering"""
+        {'shm': self.shm_peer.stop_message_loop, 'socket': self.socket_server.close,
+         'bridge': self.responder.stop}[method]()
+    
+    def test_idempotent_failover(self):
+        """Test read commands are retried on the next transport when the selected one dies"""
+        manager = self._manager(transport_reprobe_interval=0)
+        first = manager.communication_method
+        self._kill(first)
+        
+        response = manager.get_account_info()
+        self.assertTrue(response['success'])
+        health = manager.get_system_info()['transport_health']
+        self.assertEqual((health[first]['failures'], health[first]['failovers']), (1, 1))
+        self.assertEqual(sum(h['requests'] - h['failures'] for h in health.values()), 1)
+        self.assertIsNotNone(max(h['latency_p50_ms'] or 0 for h in health.values()))
+        print(f"✓ Idempotent failover working - {first} failed over")
+    
+    def test_orders_not_resent(self):
+        """Test a non-idempotent command that may have been delivered is not retried"""
+        manager = self._manager(transport_reprobe_interval=0)
+        first = manager.communication_method
+        self._kill(first)
+        
+        response = manager.place_order('EURUSD', 'BUY', 0.1)
+        self.assertFalse(response['success'])
+        health = manager.get_system_info()['transport_health']
+        self.assertEqual(list(health), [first])
+        self.assertEqual(health[first]['failovers'], 0)
+        print("✓ Non-idempotent commands not resent")
+    
+    def test_open_circuit_routes_around(self):
+        """Test every command skips a transport whose circuit is open"""
+        manager = self._manager(transport_reprobe_interval=0, transport_failure_threshold=1,
+                                transport_reset_timeout=60)
+        first = manager.communication_method
+        self._kill(first)
+        
+        manager.get_positions()
+        self.assertEqual(manager.transport_health[first].breaker.state, CircuitBreaker.OPEN)
+        response = manager.place_order('EURUSD', 'BUY', 0.1)
+        self.assertTrue(response['success'])
+        self.assertEqual(manager.transport_health[first].snapshot()['requests'], 1)
+        print("✓ Open circuit routing working")
+    
+    def test_batch_failover(self):
+        """Test idempotent requests in a failed batch are resent elsewhere"""
+        manager = self._manager(transport_reprobe_interval=0)
+        self._kill(manager.communication_method)
+        
+        results = manager.get_market_data_many(['EURUSD', 'GBPUSD'])
+        self.assertTrue(all(r['success'] for r in results.values()))
+        print("✓ Batch failover working")
+    
+    def test_reprobe_switches_transport(self):
+        """Test a re-probe drops a dead transport and picks the next fastest"""
+        manager = self._manager(communication_method='auto', transport_reprobe_interval=0.01)
+        first = manager.communication_method
+        self._kill(first)
+        
+        time.sleep(0.02)
+        manager.get_account_info()
+        manager._reprobe_thread.join(timeout=10)
+        
+        self.assertNotEqual(manager.communication_method, first)
+        self.assertFalse(manager.transport_metrics[first]['available'])
+        self.assertNotIn(first, manager.transports)
+        print(f"✓ Transport re-probe working - {first} -> {manager.communication_method}")
+    
+    def test_system_info_exposes_metrics(self):
+        """Test measured transport numbers are reported in the system info"""
+        manager = self._manager(communication_method='socket')
+        info = manager.get_system_info()
+        self.assertEqual(info['communication_method'], 'socket')
+        self.assertTrue(info['transports']['socket']['available'])
+        self.assertIsNotNone(info['last_probe'])
+        print("✓ Transport metrics reporting working")
+
+if __name__ == '__main__':
+    unittest.main()
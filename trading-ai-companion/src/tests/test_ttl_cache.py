@@ -0,0 +1,91 @@
+"""
+Test MT5 TTL Cache
+"""
+
+import sys
+import time
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.mt5_manager import MT5Manager
+from src.modules.mt5_connector.ttl_cache import TTLCache
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.cache = TTLCache(capacity=3, ttls={'account': 0.05, 'symbols': 0})
+    
+    def test_expiry(self):
+        """Test entries expire after their namespace TTL"""
+        self.cache.set('account', None, {'balance': 1})
+        self.assertEqual(self.cache.get('account'), {'balance': 1})
+        time.sleep(0.06)
+        self.assertIsNone(self.cache.get('account'))
+        
+        # A TTL of zero disables caching
+        self.cache.set('symbols', None, ['EURUSD'])
+        self.assertIsNone(self.cache.get('symbols'))
+        print("✓ TTL expiry working")
+    
+    def test_size_bound(self):
+        """Test the least recently used entry is evicted"""
+        for symbol in ('EURUSD', 'GBPUSD', 'USDJPY'):
+            self.cache.set('symbol_info', symbol, {'symbol': symbol})
+        self.cache.get('symbol_info', 'EURUSD')
+        self.cache.set('symbol_info', 'AUDUSD', {'symbol': 'AUDUSD'})
+        
+        self.assertIsNone(self.cache.get('symbol_info', 'GBPUSD'))
+        self.assertIsNotNone(self.cache.get('symbol_info', 'EURUSD'))
+        self.assertEqual(self.cache.get_stats()['size'], 3)
+        print("✓ Cache size bound working")
+    
+    def test_invalidate_namespace(self):
+        """Test a whole namespace can be dropped"""
+        self.cache.set('symbol_info', 'EURUSD', {'digits': 5})
+        self.cache.set('symbol_info', 'USDJPY', {'digits': 3})
+        self.cache.set('account', None, {'balance': 1})
+        self.cache.invalidate('symbol_info')
+        
+        self.assertIsNone(self.cache.get('symbol_info', 'EURUSD'))
+        self.assertIsNotNone(self.cache.get('account'))
+        print("✓ Cache invalidation working")
+
+class TestMT5ManagerCache(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        with patch.object(MT5Manager, '_initialize_communication'):
+            self.manager = MT5Manager({'auto_launch': False})
+        self.manager.is_initialized = True
+    
+    def test_account_reads_hit_memory(self):
+        """Test repeated balance/equity reads send one request until a trade"""
+        responses = {'get_account_info': {'success': True, 'balance': 100.0, 'equity': 101.0},
+                     'place_order': {'success': True, 'ticket': 1}}
+        with patch.object(self.manager, '_send_request', side_effect=lambda c, d=None: responses[c]) as send:
+            for _ in range(10):
+                self.assertEqual(self.manager.get_account_balance(), 100.0)
+                self.assertEqual(self.manager.get_account_equity(), 101.0)
+            self.assertEqual(send.call_count, 1)
+            
+            self.manager.place_order('EURUSD', 'BUY', 0.1)
+            self.manager.get_account_info()
+            self.assertEqual([call.args[0] for call in send.call_args_list],
+                             ['get_account_info', 'place_order', 'get_account_info'])
+        print("✓ Manager account cache working")
+    
+    def test_errors_not_cached(self):
+        """Test failed reads are retried on the next call"""
+        with patch.object(self.manager, '_send_request',
+                          return_value={'error': 'Request timeout', 'success': False}) as send:
+            self.manager.get_symbol_info('eurusd')
+            self.manager.get_symbol_info('EURUSD')
+            self.assertEqual(send.call_count, 2)
+            send.assert_called_with('get_symbol_info', {'symbol': 'EURUSD'})
+        print("✓ Manager error responses not cached")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,257 @@
+"""
+Test MT5 ZMQ Bridge
+"""
+
+import sys
+import time
+import socket
+import asyncio
+import threading
+import unittest
+from pathlib import Path
+
+import zmq
+
+# Add src to path
+sys.path.append(str(Path(__file__).parent.parent))
+
+from src.modules.mt5_connector.zmq_bridge import MT5ZMQBridge
+from src.modules.mt5_connector.message_codecs import (
+    JSONCodec, StructCodec, available_codecs, detect_codec, get_codec
+)
+
+def free_port() -> int:
+    """Find a free local TCP port"""
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+# A bar as the terminal reports it, with fields outside the struct layout
+MT5_BAR = {'time': '2024-01-02 10:00:00', 'open': 1.1, 'high': 1.2, 'low': 1.0, 'close': 1.15,
+           'tick_volume': 120, 'spread': 2, 'real_volume': 0}
+
+def echo_handler(request):
+    """Stand-in terminal handler: echo the request data back"""
+    if request.get('command') == 'get_rates':
+        return {'success': True, 'symbol': 'EURUSD', 'bars': [dict(MT5_BAR)]}
+    return {'success': True, 'command': request.get('command'), 'data': request.get('data')}
+
+class TestMessageCodecs(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures before each test method."""
+        self.message = {
+            'success': True,
+            'symbol': 'EURUSD',
+            'timeframe': 'M1',
+            'bars': [
+                {'timestamp': 60.0 * i, 'open': 1.1, 'high': 1.2, 'low': 1.0, 'close': 1.15, 'volume': 100.0}
+                for i in range(50)
+            ]
+        }
+    
+    def test_round_trip_all_codecs(self):
+        """Test every available codec round-trips bar payloads"""
+        for name in available_codecs():
+            codec = get_codec(name)
+            decoded = codec.decode(codec.encode(self.message))
+            self.assertEqual(decoded, self.message, name)
+            self.assertEqual(type(detect_codec(codec.encode(self.message))), type(codec))
+        print(f"✓ Codec round trips working: {available_codecs()}")
+    
+    def test_struct_codec_is_compact(self):
+        """Test struct encoding of bars is smaller than JSON"""
+        struct_size = len(StructCodec().encode(self.message))
+        json_size = len(JSONCodec().encode(self.message))
+        
+        self.assertLess(struct_size, json_size)
+        print(f"✓ Struct codec compact: {struct_size} vs {json_size} bytes")
+    
+    def test_struct_codec_ticks(self):
+        """Test tick records and plain messages through the struct codec"""
+        codec = StructCodec()
+        message = {'topic': 'EURUSD.TICK', 'ticks': [{'time': 1.0, 'bid': 1.1, 'ask': 1.2, 'last': 0.0, 'volume': 3.0}]}
+        
+        self.assertEqual(codec.decode(codec.encode(message)), message)
+        self.assertEqual(codec.decode(codec.encode({'success': False})), {'success': False})
+        print("✓ Struct codec tick payloads working")
+
+class TestMT5ZMQBridge(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in REP server on a free port"""
+        self.port = free_port()
+        self.server = MT5ZMQBridge(port=self.port, host='127.0.0.1')
+        self.server.start_server()
+        self.server_thread = threading.Thread(
+            target=self.server.start_message_loop, args=(echo_handler,), daemon=True)
+        self.server_thread.start()
+        
+        self.client = MT5ZMQBridge(port=self.port, host='127.0.0.1')
+        self.client.connect_client()
+    
+    def tearDown(self):
+        self.client.close()
+        self.server.close()
+    
+    def test_codec_negotiation(self):
+        """Test ping handshake switches the client to a binary codec"""
+        response = self.client.negotiate_codec(timeout=2000)
+        
+        self.assertTrue(response['success'])
+        expected = next(n for n in self.client.preferred_codecs if n in available_codecs())
+        self.assertEqual(self.client.codec.name, expected)
+        
+        reply = self.client.send_request('get_positions', {'symbol': 'EURUSD'}, timeout=2000)
+        self.assertEqual(reply['data'], {'symbol': 'EURUSD'})
+        print(f"✓ Codec negotiation working - using {self.client.codec.name}")
+    
+    def test_json_fallback(self):
+        """Test client stays on JSON when only JSON is preferred"""
+        self.client.preferred_codecs = ['json']
+        self.client.negotiate_codec(timeout=2000)
+        
+        self.assertEqual(self.client.codec.name, 'json')
+        print("✓ JSON fallback working")
+    
+    def test_market_data_through_negotiated_codec(self):
+        """Test MT5 bar dicts survive the negotiated codec unchanged"""
+        self.client.preferred_codecs = ['struct', 'msgpack', 'json']
+        self.client.negotiate_codec(timeout=2000)
+        
+        self.assertNotEqual(self.client.codec.name, StructCodec.name)
+        reply = self.client.send_request('get_rates', {'symbol': 'EURUSD'}, timeout=2000)
+        self.assertTrue(reply['success'])
+        self.assertEqual(reply['bars'], [MT5_BAR])
+        print(f"✓ Market data through {self.client.codec.name} working")
+
+class TestPipelinedZMQBridge(unittest.TestCase):
+    def setUp(self):
+        """Create a pipelined client on a free port"""
+        self.port = free_port()
+        self.client = MT5ZMQBridge(port=self.port, host='127.0.0.1')
+        self.client.connect_client(pipelined=True)
+        self.server = None
+    
+    def tearDown(self):
+        self.client.close()
+        if self.server:
+            self.server.close()
+    
+    def test_concurrent_requests_router_server(self):
+        """Test many threads share one DEALER connection"""
+        self.server = MT5ZMQBridge(port=self.port, host='127.0.0.1')
+        self.server.start_server(router=True)
+        threading.Thread(target=self.server.start_message_loop, args=(echo_handler,), daemon=True).start()
+        
+        results = {}
+        
+        def worker(n):
+            results[n] = self.client.send_request('get_market_data', {'n': n}, timeout=5000)
+        
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(20)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        
+        self.assertEqual({n: r['data']['n'] for n, r in results.items()}, {n: n for n in range(20)})
+        self.assertEqual(self.client.get_in_flight_count(), 0)
+        print("✓ Pipelined concurrent requests working")
+    
+    def test_out_of_order_replies(self):
+        """Test replies are correlated by id when answered out of order"""
+        context = zmq.Context.instance()
+        router = context.socket(zmq.ROUTER)
+        router.setsockopt(zmq.LINGER, 0)
+        router.bind(f"tcp://127.0.0.1:{self.port}")
+        codec = JSONCodec()
+        
+        futures = [self.client.submit_request('get_market_data', {'n': n}) for n in range(3)]
+        received = []
+        for _ in range(3):
+            self.assertTrue(router.poll(2000))
+            received.append(router.recv_multipart())
+        for identity, empty, payload in reversed(received):
+            request = codec.decode(payload)
+            router.send_multipart([identity, empty, codec.encode({'id': request['id'], 'n': request['data']['n']})])
+        
+        self.assertEqual([f.result(timeout=2)['n'] for f in futures], [0, 1, 2])
+        router.close()
+        print("✓ Out-of-order reply correlation working")
+    
+    def test_timeout_keeps_connection_usable(self):
+        """Test a timed-out request does not break the socket"""
+        response = self.client.send_request('ping', timeout=100)
+        self.assertFalse(response['success'])
+        self.assertEqual(self.client.get_in_flight_count(), 0)
+        
+        self.server = MT5ZMQBridge(port=self.port, host='127.0.0.1')
+        self.server.start_server(router=True)
+        threading.Thread(target=self.server.start_message_loop, args=(echo_handler,), daemon=True).start()
+        
+        response = self.client.send_request('get_positions', {'x': 1}, timeout=5000)
+        self.assertEqual(response['data'], {'x': 1})
+        print("✓ Timeout recovery working")
+
+class TestZMQStreaming(unittest.TestCase):
+    def setUp(self):
+        """Start a stand-in publisher on a free port"""
+        self.pub_port = free_port()
+        self.publisher = MT5ZMQBridge(host='127.0.0.1')
+        self.publisher.start_publisher(self.pub_port)
+        self.subscriber = MT5ZMQBridge(host='127.0.0.1')
+    
+    def tearDown(self):
+        self.subscriber.close()
+        self.publisher.close()
+    
+    def publish_until(self, condition, timeout: float = 3.0):
+        """Keep publishing until the subscriber sees data (SUB joins late)"""
+        deadline = time.time() + timeout
+        while not condition() and time.time() < deadline:
+            self.publisher.publish_tick('EURUSD', {'time': time.time(), 'bid': 1.1, 'ask': 1.2, 'last': 1.1, 'volume': 1})
+            self.publisher.publish_tick('GBPUSD', {'time': time.time(), 'bid': 1.3, 'ask': 1.4, 'last': 1.3, 'volume': 1})
+            self.publisher.publish_bar('EURUSD', 'M15', {'timestamp': 0, 'open': 1, 'high': 1, 'low': 1, 'close': 1, 'volume': 1})
+            self.publisher.publish_bar('EURUSD', 'M1', {'timestamp': 60, 'open': 1, 'high': 2, 'low': 1, 'close': 2, 'volume': 5})
+            time.sleep(0.02)
+    
+    def test_subscribe_callback(self):
+        """Test callbacks only receive exactly matching topics"""
+        received = []
+        self.subscriber.subscribe(['EURUSD'], lambda topic, msg: received.append((topic, msg)),
+                                  timeframes=['TICK', 'M1'], pub_port=self.pub_port)
+        
+        self.publish_until(lambda: {t for t, _ in received} >= {'EURUSD.TICK', 'EURUSD.M1'})
+        
+        topics = {t for t, _ in received}
+        self.assertEqual(topics, {'EURUSD.TICK', 'EURUSD.M1'})
+        bar_message = next(m for t, m in received if t == 'EURUSD.M1')
+        self.assertEqual(bar_message['bars'][0]['close'], 2.0)
+        print("✓ Tick/bar subscription working")
+    
+    def test_async_stream(self):
+        """Test the async iterator interface"""
+        self.subscriber.pub_port = self.pub_port
+        
+        async def consume():
+            items = []
+            async for topic, message in self.subscriber.stream(['GBPUSD']):
+                items.append((topic, message))
+                if len(items) == 3:
+                    break
+            return items
+        
+        publisher_thread = threading.Thread(target=self.publish_until, args=(lambda: done.is_set(),), daemon=True)
+        done = threading.Event()
+        publisher_thread.start()
+        try:
+            items = asyncio.run(asyncio.wait_for(consume(), timeout=5))
+        finally:
+            done.set()
+            publisher_thread.join()
+        
+        self.assertEqual({t for t, _ in items}, {'GBPUSD.TICK'})
+        self.assertEqual(items[0][1]['ticks'][0]['bid'], 1.3)
+        print("✓ Async tick stream working")
+
+if __name__ == '__main__':
+    unittest.main()